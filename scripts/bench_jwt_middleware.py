@@ -0,0 +1,108 @@
+"""script to compare per-request latency of the JWT middleware implementations"""
+
+import asyncio
+import statistics
+import sys
+import time
+from typing import Callable, List
+from unittest.mock import patch
+
+import httpx
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.responses import PlainTextResponse, Response
+from starlette.types import ASGIApp
+
+from src.core.logger import logger
+from src.middleware.jwt_bearer import (  # type: ignore[attr-defined]
+    JWTBearer,
+    JWTMiddleware,
+    token_cache,
+)
+
+REQUESTS = 5000
+WARMUP = 200
+TOKEN = "bench.jwt.token"
+PAYLOAD = {"UserInfo": {"id": "bench"}}
+
+
+class LegacyJWTMiddleware(BaseHTTPMiddleware):
+    """BaseHTTPMiddleware version of JWTMiddleware, kept for comparison"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        super().__init__(app)
+        self.jwt_bearer = JWTBearer(auto_error=True)
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        try:
+            await self.jwt_bearer(request)
+        except HTTPException as exc:
+            return JSONResponse(
+                status_code=exc.status_code, content={"detail": exc.detail}
+            )
+        if "authorization" not in request.headers:
+            headers = dict(request.scope["headers"])
+            headers[b"authorization"] = f"Bearer {request.state.token}".encode()
+            request.scope["headers"] = list(headers.items())
+        return await call_next(request)
+
+
+def build_app(middleware: Callable[[ASGIApp], ASGIApp]) -> FastAPI:
+    """function to build a minimal app behind the given middleware"""
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> PlainTextResponse:
+        return PlainTextResponse("pong")
+
+    app.add_middleware(middleware)
+    return app
+
+
+async def measure(app: FastAPI) -> List[float]:
+    """function to time sequential requests against an in-process app"""
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {TOKEN}"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(WARMUP):
+            await client.get("/ping", headers=headers)
+        samples = []
+        for _ in range(REQUESTS):
+            start = time.perf_counter()
+            response = await client.get("/ping", headers=headers)
+            samples.append(time.perf_counter() - start)
+            assert response.status_code == 200
+    return samples
+
+
+def report(name: str, samples: List[float]) -> float:
+    """function to print latency percentiles in microseconds"""
+    ordered = sorted(samples)
+    mean = statistics.fmean(ordered) * 1e6
+    p50 = ordered[len(ordered) // 2] * 1e6
+    p99 = ordered[int(len(ordered) * 0.99)] * 1e6
+    print(f"{name:<20} mean {mean:8.1f} us   p50 {p50:8.1f} us   p99 {p99:8.1f} us")
+    return mean
+
+
+def bench_jwt_middleware() -> None:
+    """function to run the benchmark and print the per-request difference"""
+    token_cache.clear()
+    # Per-request log lines would dominate the numbers.
+    logger.remove()
+    # Verification cost is identical for both; keep it out of the numbers.
+    with patch("jwt.decode", return_value=PAYLOAD):
+        legacy_samples = asyncio.run(measure(build_app(LegacyJWTMiddleware)))
+        asgi_samples = asyncio.run(measure(build_app(JWTMiddleware)))
+    legacy = report("BaseHTTPMiddleware", legacy_samples)
+    asgi = report("pure ASGI", asgi_samples)
+    print(f"{'difference':<20} {legacy - asgi:8.1f} us per request")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        REQUESTS = int(sys.argv[1])
+    bench_jwt_middleware()
@@ -0,0 +1,142 @@
+"""script to load-test the MCP tools end to end through the fastmcp client"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+# Keep per-call logs out of the measurements and the report.
+os.environ.setdefault("LOG_CONSOLE_LEVEL", "WARNING")
+
+from src.client.bench import (  # pylint: disable=wrong-import-position
+    DEFAULT_MIX,
+    BenchConfig,
+    run_benchmark,
+)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """function to parse the command line"""
+    parser = argparse.ArgumentParser(
+        prog="bench-mcp",
+        description="Drive a mix of MCP tool calls and report latency percentiles.",
+    )
+    parser.add_argument(
+        "--target",
+        default="inprocess",
+        help="MCP server URL, e.g. http://127.0.0.1:8000/api/v1/mcp/, or "
+        "'inprocess' to call the tools without HTTP (default)",
+    )
+    parser.add_argument(
+        "--mix",
+        default=DEFAULT_MIX,
+        help=f"weighted tools, 'crud' = add/update/delete (default: {DEFAULT_MIX})",
+    )
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, default=8, help="closed-loop callers")
+    load.add_argument("--rate", type=float, help="open-loop arrivals per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=1.0, help="unmeasured seconds first")
+    parser.add_argument("--sessions", type=int, default=1, help="MCP sessions to spread calls over")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="open-loop cap")
+    parser.add_argument("--page-size", type=int, default=100, help="limit for list tools")
+    parser.add_argument(
+        "--distinct-queries",
+        type=int,
+        default=100,
+        help="distinct example_tool queries; fewer means more response-cache hits",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=100, help="operations per bulk_mutate_inventory call"
+    )
+    parser.add_argument(
+        "--upstream-sim",
+        help="serve example_tool's upstream from a local simulator (in-process target "
+        "only), e.g. 'latency=lognormal,latency_ms=50,latency_sigma=1,error_rate=0.01'",
+    )
+    parser.add_argument("--token", default=os.getenv("MCP_TOKEN"), help="bearer token")
+    parser.add_argument("--seed", type=int, help="seed for the tool and argument choices")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare with")
+    return parser.parse_args(argv)
+
+
+def print_report(results: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    """function to print one line per tool, with changes against a baseline"""
+    header = f"{'tool':<24} {'calls':>7} {'err%':>6} {'rps':>8} " + " ".join(
+        f"{name:>8}" for name in ("p50", "p95", "p99", "max")
+    )
+    print(header)
+    rows = {"total": results["total"], **results["tools"]}
+    for tool, row in rows.items():
+        latency = row["latency_ms"]
+        print(
+            f"{tool:<24} {row['calls']:>7} {row['error_rate'] * 100:>5.1f}% "
+            f"{row['throughput_rps']:>8.1f} "
+            + " ".join(f"{latency[name]:>8.2f}" for name in ("p50", "p95", "p99", "max"))
+        )
+        before = None
+        if baseline is not None:
+            before = baseline["total"] if tool == "total" else baseline["tools"].get(tool)
+        if before is not None:
+            changes = [
+                _change(row["throughput_rps"], before["throughput_rps"]),
+                *(
+                    _change(latency[name], before["latency_ms"][name])
+                    for name in ("p50", "p95", "p99", "max")
+                ),
+            ]
+            print(f"{'  vs baseline':<24} {'':>7} {'':>6} {changes[0]:>8} " + " ".join(
+                f"{change:>8}" for change in changes[1:]
+            ))
+    for error, count in results["errors"].items():
+        print(f"  {count} x {error}")
+    if results["skipped_arrivals"]:
+        print(f"  {results['skipped_arrivals']} arrivals skipped at --max-in-flight")
+    if results["upstream"] is not None:
+        print(f"  upstream simulator: {results['upstream']['stats']}")
+
+
+def _change(now: float, before: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(now - before) / before * 100:+.1f}%"
+
+
+def bench_mcp(argv: Optional[List[str]] = None) -> None:
+    """function to run the benchmark from the command line"""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    logging.disable(logging.INFO)
+    config = BenchConfig(
+        target=args.target,
+        mix=args.mix,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        duration=args.duration,
+        warmup=args.warmup,
+        sessions=args.sessions,
+        max_in_flight=args.max_in_flight,
+        page_size=args.page_size,
+        distinct_queries=args.distinct_queries,
+        batch_size=args.batch_size,
+        upstream_sim=args.upstream_sim,
+        token=args.token,
+        seed=args.seed,
+    )
+    results = asyncio.run(run_benchmark(config))
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(results, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    bench_mcp()
@@ -0,0 +1,98 @@
+"""script to measure throughput of the production server across worker counts"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import List, Optional
+
+import httpx
+
+DURATION = 10.0
+CONCURRENCY = 64
+PATH = "/openapi.json"
+
+
+def free_port() -> int:
+    """function to pick an unused local port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen[bytes]:
+    """function to start `start()` in production mode with the given workers"""
+    env = {
+        **os.environ,
+        "RELOAD": "false",
+        "WORKERS": str(workers),
+        # Several workers can only share the JSON inventory store read-only.
+        "INVENTORY_READ_ONLY": "true",
+        "HOST": "127.0.0.1",
+        "PORT": str(port),
+    }
+    return subprocess.Popen(  # pylint: disable=consider-using-with
+        [sys.executable, "-c", "from src.main import start; start()"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_ready(url: str, timeout: float = 60.0) -> None:
+    """function to poll the server until it answers"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server at {url} did not start")
+
+
+async def drive(url: str) -> int:
+    """function to send requests from CONCURRENCY clients for DURATION seconds"""
+    deadline = time.monotonic() + DURATION
+    limits = httpx.Limits(max_connections=CONCURRENCY)
+
+    async with httpx.AsyncClient(limits=limits) as client:
+
+        async def loop() -> int:
+            done = 0
+            while time.monotonic() < deadline:
+                response = await client.get(url)
+                response.raise_for_status()
+                done += 1
+            return done
+
+        counts = await asyncio.gather(*(loop() for _ in range(CONCURRENCY)))
+    return sum(counts)
+
+
+def bench_workers(counts: Optional[List[int]] = None) -> None:
+    """function to print requests per second for 1, 2, 4 ... CPU workers"""
+    if not counts:
+        cpus = os.cpu_count() or 1
+        counts = sorted({1, *[n for n in (2, 4, 8, 16) if n <= cpus], cpus})
+    baseline = None
+    print(f"{'workers':>8} {'req/s':>10} {'speedup':>8}")
+    for workers in counts:
+        port = free_port()
+        server = start_server(workers, port)
+        try:
+            url = f"http://127.0.0.1:{port}{PATH}"
+            wait_ready(url)
+            throughput = asyncio.run(drive(url)) / DURATION
+        finally:
+            server.terminate()
+            server.wait()
+        baseline = baseline or throughput
+        print(f"{workers:>8} {throughput:>10.0f} {throughput / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    bench_workers([int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,85 @@
+"""script to stream a CSV, JSON Lines or xlsx file into the inventory store"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+# Keep per-batch logs out of the progress output.
+os.environ.setdefault("LOG_CONSOLE_LEVEL", "WARNING")
+
+from src.tools.impl.inventory_import import (  # pylint: disable=wrong-import-position
+    ImportReport,
+    InventoryImport,
+)
+from src.tools.impl.inventory_store import (  # pylint: disable=wrong-import-position
+    InventoryStore,
+    get_inventory_store,
+)
+from src.tools.impl.inventory_wal import (  # pylint: disable=wrong-import-position
+    LogLockedError,
+)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """function to parse the command line"""
+    parser = argparse.ArgumentParser(
+        prog="import-inventory",
+        description="Validate inventory rows from a file and add them to the inventory store.",
+    )
+    parser.add_argument("file", help="CSV, JSON Lines (.jsonl/.ndjson) or .xlsx file")
+    parser.add_argument("--format", choices=("csv", "jsonl", "xlsx"), help="override the suffix")
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows per commit")
+    parser.add_argument("--dry-run", action="store_true", help="validate without importing")
+    parser.add_argument(
+        "--data-file",
+        help="inventory JSON file to import into (default: INVENTORY_DATA_FILE or the "
+        "bundled data)",
+    )
+    parser.add_argument("--max-errors", type=int, default=20, help="rejected rows to list")
+    return parser.parse_args(argv)
+
+
+def print_progress(report: ImportReport) -> None:
+    """function to print a progress line over the previous one"""
+    rate = report.rows / report.elapsed if report.elapsed else 0.0
+    print(
+        f"\r{report.rows} rows read, {report.imported} imported, "
+        f"{report.rejected} rejected ({rate:,.0f} rows/s)",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def import_inventory(argv: Optional[List[str]] = None) -> None:
+    """function to run an import from the command line"""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    store = InventoryStore(args.data_file) if args.data_file else get_inventory_store()
+    try:
+        # A running server holds the data file's writer lock.
+        store.load()
+    except LogLockedError as e:
+        sys.exit(f"{e}; stop the server or import through the import_inventory tool")
+    try:
+        with InventoryImport(
+            args.file,
+            store,
+            args.format,
+            batch_size=args.batch_size,
+            dry_run=args.dry_run,
+            max_errors=args.max_errors,
+        ) as importer:
+            report = importer.run(print_progress)
+    finally:
+        # Folds the imported batches into a new snapshot.
+        store.close()
+    print(file=sys.stderr)
+    print(json.dumps(report.to_dict(), indent=2))
+    if report.rejected:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    import_inventory()
@@ -0,0 +1,467 @@
+"""End-to-end MCP load generation.
+
+Drives a weighted mix of tool calls through the fastmcp ``Client`` against
+a server URL or an in-process FastMCP server, either closed-loop (a fixed
+number of concurrent callers) or open-loop (calls start at a fixed arrival
+rate whatever the latency). Open-loop latency is measured from each call's
+scheduled start, so a stalled server is not hidden by callers that stop
+sending.
+
+The results are a JSON-serializable dictionary so runs can be stored and
+compared between commits.
+"""
+
+import asyncio
+import json
+import math
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+from contextlib import AsyncExitStack, contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from fastmcp import Client
+from fastmcp.client.transports import ClientTransport
+
+from src.client.mcp_client import create_client
+from src.server.coreai_simulator import CoreAISimulator, SimulatorConfig, SimulatorServer
+from src.utils.http_client import get_upstream_clients
+
+DEFAULT_MIX = "list_inventory_json=4,list_inventory_excel=2,crud=3,example_tool=1"
+MIX_ALIASES = {
+    "crud": ("add_inventory_item", "update_inventory_item", "delete_inventory_item"),
+}
+BENCH_ITEM = {
+    "Product Category": "Benchmark",
+    "Seasonal vs Evergreen": "Evergreen",
+    "Item": "Benchmark Item",
+    "Reg Price": 10.0,
+    "Promotional Price": 8.0,
+}
+
+
+@dataclass
+class BenchState:
+    """What the scenarios know about the target while the run goes on.
+
+    Item ids are positions, and concurrent calls land in any order. The
+    first ``protected`` positions are never deleted, so updates pick ids
+    among them, and every delete removes position ``protected``, which
+    stays valid while more records than deletes in flight lie at or past
+    it. Adds append and never move a position. Ids are handed out and
+    settled on the load generator's event loop, between awaits, so no two
+    calls see the same counts.
+    """
+
+    records: int = 0
+    page_size: int = 100
+    distinct_queries: int = 100
+    batch_size: int = 100
+    protected: Optional[int] = None
+    deletes_in_flight: int = 0
+
+    def __post_init__(self) -> None:
+        if self.protected is None:
+            self.protected = self.records // 2
+
+    def update_id(self, rng: random.Random) -> int:
+        """Return a position no in-flight delete can remove."""
+        return rng.randrange(self.protected) if self.protected else 0
+
+    def reserve_delete(self) -> int:
+        """Return the position to delete and count the delete as in flight.
+
+        Once every record past the protected ones has a delete in flight,
+        further deletes fail: the mix deletes faster than it adds.
+        """
+        self.deletes_in_flight += 1
+        return self.protected or 0
+
+    def settle(self, tool: str, arguments: Dict[str, Any], ok: bool) -> None:
+        """Account for a finished call whose arguments came from this state."""
+        if tool == "delete_inventory_item":
+            self.deletes_in_flight -= 1
+            if ok:
+                self.records -= 1
+        elif ok and tool == "add_inventory_item":
+            self.records += 1
+        elif ok and tool == "bulk_mutate_inventory":
+            operations = arguments["input_data"]["operations"]
+            self.records += sum(operation["op"] == "add" for operation in operations)
+
+
+Scenario = Callable[[random.Random, BenchState], Dict[str, Any]]
+
+
+def _update_arguments(rng: random.Random, state: BenchState) -> Dict[str, Any]:
+    item_id = state.update_id(rng)
+    return {"input_data": {"item_id": item_id, "item": dict(BENCH_ITEM)}}
+
+
+def _delete_arguments(_rng: random.Random, state: BenchState) -> Dict[str, Any]:
+    return {"input_data": {"item_id": state.reserve_delete()}}
+
+
+def _add_arguments(_rng: random.Random, _state: BenchState) -> Dict[str, Any]:
+    return {"input_data": dict(BENCH_ITEM)}
+
+
+def _bulk_arguments(rng: random.Random, state: BenchState) -> Dict[str, Any]:
+    # Updates only, so the record count stays put.
+    operations = [
+        {"op": "update", "item_id": state.update_id(rng), "item": dict(BENCH_ITEM)}
+        for _ in range(state.batch_size if state.protected else 0)
+    ] or [{"op": "add", "item": dict(BENCH_ITEM)}]
+    return {"input_data": {"operations": operations}}
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "list_inventory_json": lambda rng, state: {"input_data": {"limit": state.page_size}},
+    "list_inventory_excel": lambda rng, state: {"input_data": {"limit": state.page_size}},
+    "query_inventory": lambda rng, state: {
+        "input_data": {
+            "where": [{"column": "Product Category", "op": "==", "value": "Electronics"}]
+        }
+    },
+    "add_inventory_item": _add_arguments,
+    "update_inventory_item": _update_arguments,
+    "delete_inventory_item": _delete_arguments,
+    "bulk_mutate_inventory": _bulk_arguments,
+    # Repeated queries are served by the tool's response cache.
+    "example_tool": lambda rng, state: {
+        "input_data": {
+            "query": f"benchmark {rng.randrange(state.distinct_queries)}",
+            "workspace_id": "benchmark",
+        }
+    },
+}
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse ``"tool=weight,..."`` into normalized weights.
+
+    A bare tool name has weight 1. ``crud`` splits its weight evenly over
+    the add, update and delete tools.
+
+    Raises:
+        ValueError: For unknown tools or non-positive weights.
+    """
+    weights: Dict[str, float] = {}
+    for part in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, weight_text = part.partition("=")
+        weight = float(weight_text) if weight_text else 1.0
+        if weight <= 0:
+            raise ValueError(f"Weight of {name!r} must be positive")
+        tools = MIX_ALIASES.get(name, (name,))
+        for tool in tools:
+            if tool not in SCENARIOS:
+                raise ValueError(
+                    f"Unknown tool {tool!r}; choose from {', '.join(sorted(SCENARIOS))}"
+                )
+            weights[tool] = weights.get(tool, 0.0) + weight / len(tools)
+    if not weights:
+        raise ValueError("The tool mix is empty")
+    total = sum(weights.values())
+    return {tool: weight / total for tool, weight in weights.items()}
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """Throughput, error rate and latency percentiles (ms) of one group of calls."""
+    ordered = sorted(latencies)
+    calls = len(ordered)
+    return {
+        "calls": calls,
+        "errors": errors,
+        "error_rate": errors / calls if calls else 0.0,
+        "throughput_rps": calls / elapsed if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "mean": sum(ordered) / calls * 1000 if calls else 0.0,
+            "p50": percentile(ordered, 0.50) * 1000,
+            "p95": percentile(ordered, 0.95) * 1000,
+            "p99": percentile(ordered, 0.99) * 1000,
+            "max": ordered[-1] * 1000 if ordered else 0.0,
+        },
+    }
+
+
+@dataclass
+class BenchConfig:
+    """Parameters of one benchmark run.
+
+    Exactly one of ``concurrency`` (closed loop) and ``rate`` (open loop,
+    calls per second) drives the load. ``upstream_sim`` is a
+    :meth:`SimulatorConfig.from_spec` string; when set, in-process runs send
+    ``example_tool`` calls to a local CoreAI simulator.
+    """
+
+    target: str = "inprocess"
+    mix: str = DEFAULT_MIX
+    concurrency: int = 8
+    rate: Optional[float] = None
+    duration: float = 10.0
+    warmup: float = 1.0
+    sessions: int = 1
+    max_in_flight: int = 1000
+    page_size: int = 100
+    distinct_queries: int = 100
+    batch_size: int = 100
+    upstream_sim: Optional[str] = None
+    token: Optional[str] = None
+    seed: Optional[int] = None
+    weights: Dict[str, float] = field(default_factory=dict)
+
+
+def _error_payload(content: List[Any]) -> Optional[str]:
+    """Return the message of a tool that reports failure as ``{"error": ...}``."""
+    text = getattr(content[0], "text", "") if content else ""
+    if not text.startswith('{"error"'):
+        return None
+    try:
+        return str(json.loads(text)["error"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+@dataclass
+class _Sample:
+    tool: str
+    started: float
+    latency: float
+    error: Optional[str]
+
+
+class LoadGenerator:
+    """Issue tool calls from a weighted mix over one or more MCP sessions.
+
+    Args:
+        clients: Connected clients; calls are spread over them round-robin.
+        weights: Normalized weight per tool, as returned by :func:`parse_mix`.
+        state: Shared knowledge about the target used to build arguments.
+        seed: Seed for the tool and argument choices.
+    """
+
+    def __init__(
+        self,
+        clients: List[Client[ClientTransport]],
+        weights: Dict[str, float],
+        state: BenchState,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.clients = clients
+        self.tools = list(weights)
+        self.weights = list(weights.values())
+        self.state = state
+        self.rng = random.Random(seed)
+        self.samples: List[_Sample] = []
+        self.skipped = 0
+        self._next_client = 0
+
+    async def call(self, scheduled: Optional[float] = None) -> None:
+        """Make one call; latency counts from ``scheduled`` when given."""
+        tool = self.rng.choices(self.tools, self.weights)[0]
+        arguments = SCENARIOS[tool](self.rng, self.state)
+        client = self.clients[self._next_client % len(self.clients)]
+        self._next_client += 1
+        started = time.perf_counter()
+        error = None
+        try:
+            content = await client.call_tool(tool, arguments)
+            message = _error_payload(content)
+            if message is not None:
+                error = f"error payload: {message[:120]}"
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            message = str(e).splitlines()[0][:120] if str(e) else ""
+            error = f"{type(e).__name__}: {message}"
+        finished = time.perf_counter()
+        self.state.settle(tool, arguments, error is None)
+        origin = started if scheduled is None else scheduled
+        self.samples.append(_Sample(tool, origin, finished - origin, error))
+
+    async def run_closed(self, concurrency: int, until: float) -> None:
+        """Keep ``concurrency`` calls outstanding until ``until``."""
+
+        async def caller() -> None:
+            while time.perf_counter() < until:
+                await self.call()
+
+        await asyncio.gather(*(caller() for _ in range(concurrency)))
+
+    async def run_open(self, rate: float, until: float, max_in_flight: int) -> None:
+        """Start calls at ``rate`` per second until ``until``.
+
+        Arrivals while ``max_in_flight`` calls are outstanding are counted in
+        :attr:`skipped` instead of piling up without bound.
+        """
+        interval = 1.0 / rate
+        in_flight: Set["asyncio.Future[None]"] = set()
+        next_start = time.perf_counter()
+        while next_start < until:
+            delay = next_start - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(in_flight) >= max_in_flight:
+                self.skipped += 1
+            else:
+                task = asyncio.ensure_future(self.call(scheduled=next_start))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            next_start += interval
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+    def report(self, measured_from: float, elapsed: float) -> Dict[str, Any]:
+        """Summarize the calls that started at or after ``measured_from``."""
+        samples = [sample for sample in self.samples if sample.started >= measured_from]
+        by_tool: Dict[str, Tuple[List[float], int]] = {}
+        error_kinds: Dict[str, int] = {}
+        for sample in samples:
+            latencies, errors = by_tool.get(sample.tool, ([], 0))
+            latencies.append(sample.latency)
+            if sample.error is not None:
+                errors += 1
+                error_kinds[sample.error] = error_kinds.get(sample.error, 0) + 1
+            by_tool[sample.tool] = (latencies, errors)
+        return {
+            "total": summarize(
+                [sample.latency for sample in samples],
+                sum(errors for _, errors in by_tool.values()),
+                elapsed,
+            ),
+            "tools": {
+                tool: summarize(latencies, errors, elapsed)
+                for tool, (latencies, errors) in sorted(by_tool.items())
+            },
+            "errors": dict(sorted(error_kinds.items(), key=lambda kv: -kv[1])),
+            "skipped_arrivals": self.skipped,
+        }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _in_process_server() -> Any:
+    """Create the app's MCP server with its JSON store on a scratch copy."""
+    # pylint: disable=import-outside-toplevel
+    from src.core.config import settings
+    from src.server.server import create_mcp_server
+    from src.tools.impl.inventory_store import DATA_FILE, get_inventory_store
+
+    if get_inventory_store.cache_info().currsize == 0:
+        # CRUD calls must not rewrite the bundled data file.
+        scratch = tempfile.mkdtemp(prefix="bench-mcp-")
+        source = settings.inventory_data_file or DATA_FILE
+        settings.inventory_data_file = shutil.copy(source, scratch)
+    return create_mcp_server("TEMP")
+
+
+@contextmanager
+def _enterprise_base_url(url: str) -> Iterator[None]:
+    """Point upstream calls of the in-process tools at ``url``."""
+    from src.core.config import settings  # pylint: disable=import-outside-toplevel
+
+    original = settings.enterprise_base_url
+    settings.enterprise_base_url = url
+    try:
+        yield
+    finally:
+        settings.enterprise_base_url = original
+
+
+async def _discover(client: Client[ClientTransport], state: BenchState) -> None:
+    """Learn the record count used to build update and delete arguments."""
+    try:
+        content = await client.call_tool("list_inventory_json", {"input_data": {"limit": 1}})
+        state.records = int(json.loads(content[0].text)["total"])  # type: ignore[union-attr]
+    except Exception:  # pylint: disable=broad-exception-caught
+        state.records = 0
+    state.protected = state.records // 2
+
+
+async def run_benchmark(config: BenchConfig) -> Dict[str, Any]:
+    """Run one benchmark and return its JSON-serializable results."""
+    if config.rate is None and config.concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if config.rate is not None and config.rate <= 0:
+        raise ValueError("rate must be positive")
+    if config.upstream_sim is not None and config.target != "inprocess":
+        raise ValueError("upstream_sim needs the in-process target")
+    weights = parse_mix(config.mix)
+    config.weights = weights
+
+    async with AsyncExitStack() as stack:
+        upstream: Optional[SimulatorServer] = None
+        if config.upstream_sim is not None:
+            upstream = stack.enter_context(
+                SimulatorServer(CoreAISimulator(SimulatorConfig.from_spec(config.upstream_sim)))
+            )
+            stack.enter_context(_enterprise_base_url(upstream.url))
+        if config.target == "inprocess":
+            server = _in_process_server()
+            clients = [create_client(server) for _ in range(config.sessions)]
+            # As in the app lifespan: pooled connections belong to this loop.
+            stack.push_async_callback(get_upstream_clients().aclose)
+        else:
+            clients = [
+                create_client(config.target, config.token) for _ in range(config.sessions)
+            ]
+        state = BenchState(
+            page_size=config.page_size,
+            distinct_queries=config.distinct_queries,
+            batch_size=config.batch_size,
+        )
+        generator = LoadGenerator(clients, weights, state, seed=config.seed)
+        for client in clients:
+            await stack.enter_async_context(client)
+        await _discover(clients[0], state)
+        measured_from = time.perf_counter() + config.warmup
+        until = measured_from + config.duration
+        if config.rate is not None:
+            await generator.run_open(config.rate, until, config.max_in_flight)
+        else:
+            await generator.run_closed(config.concurrency, until)
+        elapsed = time.perf_counter() - measured_from
+        upstream_report = None
+        if upstream is not None:
+            upstream_report = {
+                "config": asdict(upstream.simulator.config),
+                "stats": upstream.simulator.stats(),
+            }
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {key: value for key, value in asdict(config).items() if key != "token"},
+        "mode": "open" if config.rate is not None else "closed",
+        "elapsed_s": elapsed,
+        **generator.report(measured_from, elapsed),
+        "upstream": upstream_report,
+    }
+
+
+__all__ = [
+    "BenchConfig",
+    "DEFAULT_MIX",
+    "LoadGenerator",
+    "SCENARIOS",
+    "parse_mix",
+    "percentile",
+    "run_benchmark",
+    "summarize",
+]
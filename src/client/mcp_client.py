@@ -1,17 +1,35 @@
 import asyncio
-from fastmcp import Client
-from dotenv import load_dotenv
 import os
+from typing import Any, Optional, Union
+
+from dotenv import load_dotenv
+from fastmcp import Client, FastMCP
+from fastmcp.client.transports import ClientTransport
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Retrieve the MCP URL from environment variables
-mcp_url = os.getenv("MCP_URL")
 
-client = Client(mcp_url)
+def create_client(
+    target: Union[str, FastMCP[Any], None] = None, token: Optional[str] = None
+) -> Client[ClientTransport]:
+    """Create an MCP client.
+
+    Args:
+        target: Server URL or an in-process FastMCP server; defaults to the
+            ``MCP_URL`` environment variable.
+        token: Bearer token sent with every HTTP request.
+    """
+    # Retrieve the MCP URL from environment variables
+    if target is None:
+        target = os.getenv("MCP_URL")
+    if not target:
+        raise ValueError("No MCP server given; set MCP_URL")
+    return Client(target, auth=token)
+
 
 async def main():
+    client = create_client()
     # Connection is established here
     async with client:
         print(f"Client connected: {client.is_connected()}")
@@ -32,10 +50,3 @@ async def main():
 
 if __name__ == "__main__":
     asyncio.run(main())
-
-
-
-
-
-
-
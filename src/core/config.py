@@ -3,13 +3,17 @@
 import os
 import json
 
+from dataclasses import dataclass
 from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
 from typing import Dict, List
 
 from dotenv import load_dotenv
 
 import toml
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from uvicorn.config import HTTPProtocolType, LoopSetupType
 
 load_dotenv()
 
@@ -37,6 +41,13 @@ class GlobalConfigs(BaseSettings, extra="allow"):
     reload: bool = True
     debug: bool = False
 
+    # Production serving, used when reload is off
+    workers: int = 1  # 0 starts one worker per CPU
+    max_requests: int = 0  # recycle a worker after this many requests; 0 never
+    max_requests_jitter: int = 0
+    uvicorn_loop: LoopSetupType = "auto"  # uvloop when installed
+    uvicorn_http: HTTPProtocolType = "auto"  # httptools when installed
+
     commit_id: str = ""
     branch_name: str = ""
     build_time: str = ""
@@ -44,6 +55,13 @@ class GlobalConfigs(BaseSettings, extra="allow"):
 
     encryption_algorithm: str = "RS256"
     enterprise_auth_public_key: str = "ENTERPRISE_AUTH_PUBLIC_KEY"
+    jwt_cache_size: int = 10_000
+    jwt_cache_ttl: float = 300.0
+    jwks_url: str = ""  # JWKS file path or URL; empty uses the static public key
+    jwks_refresh_interval: float = 300.0
+    jwks_refresh_jitter: float = 0.1
+    jwks_min_refresh_interval: float = 30.0
+    jwks_fetch_timeout: float = 5.0
     enterprise_base_url: str = "ENTERPRISE_BASE_URL"
     enterprise_llm_headers: List[str] = [
         "traceparent",
@@ -53,7 +71,61 @@ class GlobalConfigs(BaseSettings, extra="allow"):
         "x-workspace-id",
     ]
 
-    skip_paths: List[str] = ["/docs", "/openapi.json"]
+    skip_paths: List[str] = ["/docs", "/openapi.json", "/metrics"]
+
+    inventory_data_file: str = ""  # defaults to the bundled retails-mockdata.json
+    inventory_fsync_interval: float = 0.05
+    inventory_compact_threshold: int = 10_000
+    inventory_page_size: int = 100
+    inventory_max_page_size: int = 1000
+    inventory_max_batch_ops: int = 10_000
+    inventory_import_dir: str = ""  # files the import tool may read; empty disables it
+    # Reject every inventory mutation. WORKERS > 1 requires it, so pre-fork
+    # serving with several workers has no write support.
+    inventory_read_only: bool = False
+
+    upstream_max_connections: int = 100
+    upstream_max_keepalive_connections: int = 20
+    upstream_keepalive_expiry: float = 30.0
+    upstream_timeout: float = 30.0
+    upstream_connect_timeout: float = 5.0
+    upstream_host_timeouts: Dict[str, float] = {}
+    upstream_http2: bool = True
+
+    example_tool_cache_ttl: float = 60.0  # 0 disables caching
+    example_tool_cache_size: int = 1024
+    # Per-tool overrides of the bulkhead limits declared at registration, e.g.
+    # {"example_tool": {"max_concurrent": 64, "max_queue": 128, "queue_timeout": 1.0}}
+    tool_bulkheads: Dict[str, Dict[str, float]] = {}
+    # Deadline of each tool call in seconds (0 = none), per-tool overrides,
+    # and the header a client can shorten it with (milliseconds).
+    tool_timeout: float = 30.0
+    tool_timeouts: Dict[str, float] = {"import_inventory": 600.0}
+    request_timeout_header: str = "x-request-timeout-ms"
+
+    log_max_bytes: int = 10 * 1024 * 1024  # rotate log files at this size
+    log_backup_count: int = 5
+    log_queue_size: int = 10_000
+    log_batch_size: int = 256
+    log_flush_interval: float = 0.5
+    log_overflow: str = "drop"  # or "block": wait briefly for queue space
+    log_console_level: str = "DEBUG"
+    # One record per request: successful requests are sampled per route
+    # prefix; failed, rejected and slow requests are always logged.
+    log_sample_rate: float = 0.1
+    log_sample_rates: Dict[str, float] = {}
+    log_slow_request_ms: float = 1000.0
+
+    loop_lag_interval: float = 0.5  # seconds between event-loop lag samples
+
+    tracing_exporter: str = "none"  # "otlp", "file" or "console"
+    tracing_sample_ratio: float = 1.0  # of new traces; sampled parents always win
+    tracing_file: str = "logs/traces.jsonl"
+    tracing_otlp_endpoint: str = ""  # empty uses the OTEL_EXPORTER_OTLP_* variables
+    tracing_excluded_paths: List[str] = ["/metrics"]
+
+    io_pool_size: int = 0  # 0 picks min(32, cpu_count + 4)
+    io_queue_size: int = 256
 
     @property
     def app(self) -> Dict[str, str]:
@@ -62,12 +134,41 @@ class GlobalConfigs(BaseSettings, extra="allow"):
         Returns:
             Dict[str, str]: {name=name, description=description, version=version}
         """
-        app_details = {}
-        project_config = toml.load("pyproject.toml")["project"]
-        app_details["name"] = self.title
-        app_details["description"] = project_config["description"]
-        app_details["version"] = project_config["version"]
-        return app_details
+        build_info = get_build_info()
+        return {
+            "name": build_info.name,
+            "description": build_info.description,
+            "version": build_info.version,
+        }
+
+
+PYPROJECT_FILE = Path(__file__).resolve().parents[2] / "pyproject.toml"
+DISTRIBUTION_NAME = "src"
+
+
+@dataclass(frozen=True)
+class BuildInfo:
+    """Immutable build and version metadata, resolved once per process"""
+
+    name: str
+    description: str
+    version: str
+    commit: str = ""
+    branch: str = ""
+    build_time: str = ""
+    tag: str = ""
+
+
+def _project_metadata() -> Dict[str, str]:
+    """read name/description/version from pyproject.toml next to the sources,
+    falling back to the installed distribution metadata"""
+    if PYPROJECT_FILE.is_file():
+        return toml.load(PYPROJECT_FILE)["project"]
+    try:
+        dist = metadata.metadata(DISTRIBUTION_NAME)
+        return {"description": dist["Summary"] or "", "version": dist["Version"]}
+    except metadata.PackageNotFoundError:
+        return {"description": "", "version": "0.0.0"}
 
 
 @lru_cache
@@ -76,6 +177,22 @@ def get_settings() -> GlobalConfigs:
     return GlobalConfigs()
 
 
+@lru_cache
+def get_build_info() -> BuildInfo:
+    """caching BuildInfo"""
+    config = get_settings()
+    project_config = _project_metadata()
+    return BuildInfo(
+        name=config.title,
+        description=project_config.get("description", ""),
+        version=project_config.get("version", ""),
+        commit=config.commit_id,
+        branch=config.branch_name,
+        build_time=config.build_time,
+        tag=config.tag,
+    )
+
+
 settings = get_settings()
 
-__all__ = ["settings"]
+__all__ = ["settings", "BuildInfo", "get_build_info"]
@@ -0,0 +1,316 @@
+"""Non-blocking, batched file sink for loguru.
+
+Calling ``logger.info`` only puts the record on a bounded queue. A writer
+thread serializes queued records in the same JSON layout as loguru's
+``serialize=True``, writes them in batches and rotates the file by size;
+rotated files are gzip-compressed on a separate thread.
+"""
+
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+import traceback
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+TEXT_FORMAT = "{time} | {level: <8} | {name}:{function}:{line} - {message}\n"
+
+OVERFLOW_POLICIES = ("drop", "block")
+
+# A record and the traceback loguru rendered for it, if any.
+Entry = Tuple[Dict[str, Any], Optional[str]]
+
+
+def serialize_record(record: Dict[str, Any], exception_text: Optional[str] = None) -> str:
+    """Return ``record`` as one JSON line, like loguru's ``serialize=True``.
+
+    Args:
+        record: The loguru record.
+        exception_text: Traceback as rendered by loguru, honouring the
+            handler's ``backtrace`` and ``diagnose`` options; a plain
+            traceback is formatted when it is missing.
+    """
+    exception = record["exception"]
+    text = TEXT_FORMAT.format(
+        time=record["time"].strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
+        level=record["level"].name,
+        name=record["name"],
+        function=record["function"],
+        line=record["line"],
+        message=record["message"],
+    )
+    if exception_text is not None:
+        text += exception_text
+    elif exception is not None:
+        text += "".join(
+            traceback.format_exception(exception.type, exception.value, exception.traceback)
+        )
+    payload = {
+        "text": text,
+        "record": {
+            "elapsed": {
+                "repr": str(record["elapsed"]),
+                "seconds": record["elapsed"].total_seconds(),
+            },
+            "exception": None
+            if exception is None
+            else {
+                "type": None if exception.type is None else exception.type.__name__,
+                "value": exception.value,
+                "traceback": bool(exception.traceback),
+            },
+            "extra": record["extra"],
+            "file": {"name": record["file"].name, "path": record["file"].path},
+            "function": record["function"],
+            "level": {
+                "icon": record["level"].icon,
+                "name": record["level"].name,
+                "no": record["level"].no,
+            },
+            "line": record["line"],
+            "message": record["message"],
+            "module": record["module"],
+            "name": record["name"],
+            "process": {"id": record["process"].id, "name": record["process"].name},
+            "thread": {"id": record["thread"].id, "name": record["thread"].name},
+            "time": {"repr": str(record["time"]), "timestamp": record["time"].timestamp()},
+        },
+    }
+    return json.dumps(payload, default=str, ensure_ascii=False) + "\n"
+
+
+def _compress(path: str) -> None:
+    with open(path, "rb") as source, gzip.open(path + ".gz", "wb") as target:
+        shutil.copyfileobj(source, target)
+    os.remove(path)
+
+
+class BatchingFileSink:
+    """Queue-backed loguru sink writing serialized records in batches.
+
+    Add it with ``format="{message}"``: loguru then renders an exception
+    right after the message, with the handler's ``backtrace`` and
+    ``diagnose`` options, and the sink keeps that rendering.
+
+    Args:
+        path: Log file path.
+        max_bytes: Rotate once the file would grow beyond this size.
+        backup_count: Number of compressed rotated files to keep.
+        queue_size: Maximum records waiting to be written.
+        batch_size: Maximum records per write.
+        flush_interval: Seconds the writer waits to fill a batch.
+        overflow: ``"drop"`` discards records when the queue is full;
+            ``"block"`` makes the caller wait up to ``block_timeout`` seconds
+            before dropping.
+        block_timeout: See ``overflow``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        queue_size: int = 10_000,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        overflow: str = "drop",
+        block_timeout: float = 0.05,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.rotations = 0
+        self.errors = 0
+        self._compress_lock = threading.Lock()
+        self._start()
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self) -> None:
+        # Threads do not survive fork(); a live sink needs a new writer, and
+        # a lock held by a compressor in the parent would never be released.
+        self._compress_lock = threading.Lock()
+        if not self._stopped.is_set():
+            self._start()
+
+    def _start(self) -> None:
+        """(Re)create the queue and the writer thread, e.g. after a fork."""
+        self._queue: "queue.Queue[Optional[Entry]]" = queue.Queue(self.queue_size)
+        self._file: Optional[Any] = None
+        self._stopped = threading.Event()
+        self._compressors: List[threading.Thread] = []
+        self._writer = threading.Thread(
+            target=self._writer_loop, name=f"log-writer:{os.path.basename(self.path)}", daemon=True
+        )
+        self._writer.start()
+
+    # ----------------------------------------------------------- caller side
+
+    def write(self, message: Any) -> None:
+        """loguru entry point; ``message.record`` is queued, not serialized."""
+        record = message.record
+        exception_text = None
+        if record["exception"] is not None:
+            rendered = str(message)
+            prefix = record["message"] + "\n"
+            if rendered.startswith(prefix):
+                exception_text = rendered[len(prefix) :]
+        entry = (record, exception_text)
+        try:
+            if self.overflow == "block":
+                self._queue.put(entry, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    # ----------------------------------------------------------- writer side
+
+    def _open(self) -> Any:
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")  # pylint: disable=consider-using-with
+        return self._file
+
+    def _rotate_if_needed(self, incoming: int) -> None:
+        file = self._open()
+        try:
+            current = os.stat(self.path)
+        except FileNotFoundError:
+            current = None
+        if current is None or current.st_ino != os.fstat(file.fileno()).st_ino:
+            # Another process rotated the file; follow it to the new one.
+            file.close()
+            self._file = None
+            file = self._open()
+        size = os.fstat(file.fileno()).st_size
+        if size == 0 or size + incoming <= self.max_bytes:
+            return
+        file.close()
+        self._file = None
+        stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S_%f")
+        rotated = f"{os.path.splitext(self.path)[0]}.{stamp}.log"
+        try:
+            os.rename(self.path, rotated)
+        except FileNotFoundError:
+            return
+        self.rotations += 1
+        compressor = threading.Thread(target=self._compress_and_prune, args=(rotated,), daemon=True)
+        compressor.start()
+        self._compressors.append(compressor)
+
+    def _compress_and_prune(self, rotated: str) -> None:
+        with self._compress_lock:
+            self._compress_and_prune_locked(rotated)
+
+    def _compress_and_prune_locked(self, rotated: str) -> None:
+        try:
+            _compress(rotated)
+            stem = os.path.basename(os.path.splitext(self.path)[0]) + "."
+            directory = os.path.dirname(self.path) or "."
+            backups = sorted(
+                name
+                for name in os.listdir(directory)
+                if name.startswith(stem) and name.endswith(".log.gz")
+            )
+            for name in backups[: max(0, len(backups) - self.backup_count)]:
+                os.remove(os.path.join(directory, name))
+        except OSError:
+            self.errors += 1
+
+    def _write_batch(self, batch: List[Entry]) -> None:
+        lines = []
+        for record, exception_text in batch:
+            try:
+                lines.append(serialize_record(record, exception_text))
+            except Exception:  # pylint: disable=broad-exception-caught
+                self.errors += 1
+        data = "".join(lines)
+        try:
+            self._rotate_if_needed(len(data.encode("utf-8")))
+            file = self._open()
+            file.write(data)
+            file.flush()
+        except OSError:
+            self.errors += 1
+            return
+        self.written += len(lines)
+        self.batches += 1
+
+    def _writer_loop(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            taken = 1
+            batch: List[Entry] = []
+            stop = first is None
+            if first is not None:
+                batch.append(first)
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    entry = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                taken += 1
+                if entry is None:
+                    stop = True
+                else:
+                    batch.append(entry)
+            if batch:
+                self._write_batch(batch)
+            for _ in range(taken):
+                self._queue.task_done()
+            if stop:
+                return
+
+    # -------------------------------------------------------------- control
+
+    def drain(self, timeout: float = 5.0) -> None:
+        """Wait until every record queued so far has been written.
+
+        Not named ``flush``: loguru would call that after every record.
+        """
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    def stop(self) -> None:
+        """Write what is queued, close the file and stop the threads."""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._queue.put(None)
+        self._writer.join(timeout=5)
+        for compressor in self._compressors:
+            compressor.join(timeout=5)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def stats(self) -> Dict[str, int]:
+        """Return queue depth and write/drop counters."""
+        return {
+            "queued": self._queue.qsize(),
+            "dropped": self.dropped,
+            "written": self.written,
+            "batches": self.batches,
+            "rotations": self.rotations,
+            "errors": self.errors,
+        }
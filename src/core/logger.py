@@ -1,36 +1,62 @@
 """logging setup"""
 
 import sys
+from typing import Dict
 
 from loguru import logger
 
+from src.core.config import settings
+from src.core.log_sink import BatchingFileSink
+
 LOG_FOLDER = "logs/"
-LOG_ROTATION = "1 day"
+
+
+def _file_sink(name: str) -> BatchingFileSink:
+    """queue-backed sink so logging never writes files on the event loop"""
+    return BatchingFileSink(
+        LOG_FOLDER + name,
+        max_bytes=settings.log_max_bytes,
+        backup_count=settings.log_backup_count,
+        queue_size=settings.log_queue_size,
+        batch_size=settings.log_batch_size,
+        flush_interval=settings.log_flush_interval,
+        overflow=settings.log_overflow,
+    )
+
+
+# loguru's atexit logger.remove() stops these sinks, which drains their queues
+info_sink = _file_sink("info.log")
+error_sink = _file_sink("error.log")
 
 logger.remove(0)
 
 # all logger.info('message') goes strictly to info.log
 logger.add(
-    LOG_FOLDER + "info.log",
+    info_sink,
     filter=lambda record: record["level"].name == "INFO",
-    serialize=True,
-    rotation=LOG_ROTATION,
+    format="{message}",
 )
 
 # all logger.error('message') goes strictly to error.log,
 logger.add(
-    LOG_FOLDER + "error.log",
+    error_sink,
     filter=lambda record: record["level"].name == "ERROR"
     and "traceback" not in record["extra"],
-    serialize=True,
-    rotation=LOG_ROTATION,
+    format="{message}",
     backtrace=True,
     diagnose=True,
 )
 
 logger.add(
     sys.stderr,
-    level="DEBUG",
+    level=settings.log_console_level,
     colorize=True,
 )
-__all__ = ["logger"]
+
+
+def get_log_stats() -> Dict[str, Dict[str, int]]:
+    """queued/dropped/written counters of the file sinks"""
+    return {"info": info_sink.stats(), "error": error_sink.stats()}
+
+
+__all__ = ["logger", "get_log_stats"]
@@ -0,0 +1,169 @@
+"""Request-scoped log aggregation.
+
+Instead of logging a line per phase, hot paths call :func:`log_event`, which
+appends to the log of the current request. When the request finishes,
+:class:`RequestLogMiddleware` emits one structured record holding every
+phase and its offset in milliseconds. Successful requests are sampled per
+route; failed, rejected and slow requests are always logged with all their
+events.
+"""
+
+import random
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from mcp.server.lowlevel.server import request_ctx
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+from src.core.logger import logger
+
+_current: ContextVar[Optional["RequestLog"]] = ContextVar("request_log", default=None)
+
+
+class RequestLog:
+    """Phase events and timings of one HTTP request."""
+
+    __slots__ = ("method", "path", "started", "events", "failed", "closed")
+
+    def __init__(self, method: str, path: str) -> None:
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.events: List[Dict[str, Any]] = []
+        self.failed = False
+        self.closed = False
+
+    def add(self, phase: str, fields: Dict[str, Any]) -> None:
+        """Record ``phase`` with its offset from the start of the request."""
+        offset = round((time.perf_counter() - self.started) * 1000, 3)
+        self.events.append({"phase": phase, "ms": offset, **fields})
+
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the request started."""
+        return (time.perf_counter() - self.started) * 1000
+
+
+def sample_rate(path: str) -> float:
+    """Return the sampling rate of the longest matching route prefix."""
+    best = ""
+    rate = settings.log_sample_rate
+    for prefix, prefix_rate in settings.log_sample_rates.items():
+        if path.startswith(prefix) and len(prefix) > len(best):
+            best, rate = prefix, prefix_rate
+    return rate
+
+
+def mcp_request_state() -> Optional[Dict[str, Any]]:
+    """Return the ASGI state of the HTTP request carrying the current MCP message.
+
+    Returns None outside an MCP handler or when the transport has no request.
+    """
+    try:
+        request = request_ctx.get().request
+    except LookupError:
+        return None
+    if request is None:
+        return None
+    return request.scope.get("state", {})
+
+
+def current_request_log() -> Optional[RequestLog]:
+    """Return the log of the request being handled, if any.
+
+    MCP tools run on the session's task, whose context belongs to the request
+    that opened the session, so the MCP request context is checked first.
+    """
+    state = mcp_request_state()
+    if state is not None:
+        request_log = state.get("request_log")
+        if request_log is not None:
+            return request_log
+    request_log = _current.get()
+    if request_log is None or request_log.closed:
+        return None
+    return request_log
+
+
+def log_event(phase: str, failed: bool = False, **fields: Any) -> None:
+    """Add a phase event to the current request's log.
+
+    Outside a request the event is logged at DEBUG, formatted only if a sink
+    accepts that level.
+
+    Args:
+        phase: Short dotted name, e.g. ``"auth.verified"``.
+        failed: Mark the request as failed so its log is always emitted.
+        fields: Extra structured fields for the event.
+    """
+    request_log = current_request_log()
+    if request_log is None:
+        logger.debug("{} {}", phase, fields)
+        return
+    if failed:
+        request_log.failed = True
+    request_log.add(phase, fields)
+
+
+class RequestLogMiddleware:
+    """Collect a request's events and emit them as a single record."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_log = RequestLog(scope["method"], scope["path"])
+        scope.setdefault("state", {})["request_log"] = request_log
+        token = _current.set(request_log)
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            request_log.failed = True
+            raise
+        finally:
+            _current.reset(token)
+            request_log.closed = True
+            self._emit(request_log, status)
+
+    @staticmethod
+    def _emit(request_log: RequestLog, status: int) -> None:
+        duration = request_log.elapsed_ms()
+        if request_log.failed or status >= 500:
+            level = "ERROR"
+        elif status >= 400:
+            level = "WARNING"
+        elif duration >= settings.log_slow_request_ms:
+            level = "INFO"
+        elif random.random() < sample_rate(request_log.path):
+            level = "INFO"
+        else:
+            return
+        logger.bind(
+            request={
+                "method": request_log.method,
+                "path": request_log.path,
+                "status": status,
+                "duration_ms": round(duration, 3),
+                "events": request_log.events,
+            }
+        ).log(
+            level,
+            "{} {} {} in {:.1f}ms",
+            request_log.method,
+            request_log.path,
+            status,
+            duration,
+        )
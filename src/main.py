@@ -1,20 +1,42 @@
 # pylint: disable=redefined-outer-name
 """TEMP MCP Server Main Application"""
 
-from typing import Any, Dict
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
 
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.routing import APIRoute
 
-from src.core.config import settings
-from src.core.logger import logger
+from src.core.config import get_build_info, settings
+from src.core.logger import get_log_stats, logger
+from src.core.request_log import RequestLogMiddleware
+from src.middleware.jwks import get_jwks_provider
 from src.middleware.jwt_bearer import JWTMiddleware
+from src.middleware.tracing import TracingMiddleware
+from src.server.prefork import PreforkServer, resolve_workers
 from src.server.server import create_mcp_server
+from src.tools.impl.example_tool import ExampleTool
+from src.tools.meta.bulkhead import bulkhead_stats
+from src.tools.impl.inventory_store import get_inventory_store
+from src.tools.impl.inventory_tools import load_inventory
+from src.utils.blocking_io import get_io_executor, run_blocking
+from src.utils.http_client import get_upstream_clients
+from src.utils.metrics import (
+    CONTENT_TYPE_LATEST,
+    EventLoopLagMonitor,
+    build_registry,
+    clear_multiprocess_dir,
+    mark_worker_dead,
+    render_metrics,
+    stats_collector,
+)
+from src.utils.tracing import configure_tracing, flush_tracing
 import traceback
 
     
@@ -43,15 +65,38 @@ def create_application() -> FastAPI:
     mcp = create_mcp_server("TEMP")
     mcp_app = mcp.http_app()  
 
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        """Run the MCP lifespan around the shared upstream client registry."""
+        upstream_clients = get_upstream_clients()
+        jwks_provider = get_jwks_provider()
+        if jwks_provider is not None:
+            # Load the signing keys before the first request arrives.
+            await run_blocking(jwks_provider.start)
+        loop_lag = EventLoopLagMonitor(settings.loop_lag_interval)
+        loop_lag.start()
+        try:
+            async with mcp_app.lifespan(app):
+                yield
+        finally:
+            await loop_lag.stop()
+            if jwks_provider is not None:
+                jwks_provider.close()
+            await upstream_clients.aclose()
+            flush_tracing()
+
+    configure_tracing()
+    build_info = get_build_info()
+
     # Create FastAPI application
     app = FastAPI(
         title=settings.title,
         root_path=settings.base_path,
-        version=settings.app["version"],
-        description=settings.app["description"],
+        version=build_info.version,
+        description=build_info.description,
         generate_unique_id_function=custom_generate_unique_id,
         openapi_url="/openapi.json",
-        lifespan=mcp_app.lifespan,
+        lifespan=lifespan,
     )
 
     # Mount the FastMCP application at the root path
@@ -60,6 +105,7 @@ def create_application() -> FastAPI:
     for route in app.routes:
         print("ROUTE:", route.path)
     _configure_middleware(app)
+    _configure_metrics(app)
     _configure_openapi(app)
     _register_exception_handlers(app)
 
@@ -90,6 +136,39 @@ def _configure_middleware(app: FastAPI) -> None:
     #         expose_headers=["Content-Type", "Authorization"],
     #     )
 
+    # Tracing middleware, outside auth so the auth span has a parent
+    app.add_middleware(TracingMiddleware)
+
+    # Request log middleware, outermost so it times the whole request
+    app.add_middleware(RequestLogMiddleware)
+
+
+def _configure_metrics(app: FastAPI) -> None:
+    """Expose Prometheus metrics at /metrics.
+
+    Args:
+        app: FastAPI application instance
+    """
+    stats_collector.register("blocking_io", lambda: get_io_executor().stats())
+    stats_collector.register(
+        "upstream_pool", lambda: get_upstream_clients().stats(), label="origin"
+    )
+    stats_collector.register(
+        "example_tool_cache", lambda: ExampleTool.response_cache.stats()
+    )
+    stats_collector.register("tool_bulkhead", bulkhead_stats, label="tool")
+    stats_collector.register("inventory_store", lambda: get_inventory_store().stats())
+    stats_collector.register("log_sink", get_log_stats, label="sink")
+    jwks_provider = get_jwks_provider()
+    if jwks_provider is not None:
+        stats_collector.register("jwks", jwks_provider.stats)
+    registry = build_registry()
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics() -> Response:
+        """Prometheus text exposition of this server's metrics"""
+        return Response(render_metrics(registry), media_type=CONTENT_TYPE_LATEST)
+
 
 def _configure_openapi(app: FastAPI) -> None:
     """Configure custom OpenAPI schema for docs.
@@ -105,7 +184,7 @@ def _configure_openapi(app: FastAPI) -> None:
 
         openapi_schema = get_openapi(
             title=settings.title,
-            version=settings.app["version"],
+            version=get_build_info().version,
             description=settings.description,
             routes=app.routes,
             servers=[
@@ -185,17 +264,74 @@ def _register_exception_handlers(app: FastAPI) -> None:
 app = create_application()
 
 
+def _warm_up() -> None:
+    """Load read-only data in the supervisor so forked workers share it.
+
+    The JSON inventory store is mutable, so each worker opens it on first
+    use instead.
+    """
+    try:
+        load_inventory()
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.warning(f"Skipping inventory preload: {str(e)}")
+
+
+def _close_worker() -> None:
+    """Persist and unlock the inventory store when a worker stops."""
+    get_inventory_store().close()
+
+
 def start() -> None:
     """Start the server with uvicorn"""
 
     logger.info("Starting up TEMP MCP Server...")
 
-    uvicorn.run(
-        "src.main:app",
-        host=settings.host,
-        port=settings.port,
-        reload=settings.reload,
-    )
+    if settings.reload:
+        # Development: single process with a file watcher.
+        uvicorn.run(
+            "src.main:app",
+            host=settings.host,
+            port=settings.port,
+            reload=True,
+        )
+        return
+
+    workers = resolve_workers(settings.workers)
+    if workers > 1:
+        if not settings.inventory_read_only:
+            # Workers would each log and compact their own diverging copy of
+            # the same data file.
+            raise SystemExit(
+                "WORKERS > 1 has no write support: the JSON inventory store has "
+                "a single writer. Run one worker, or set INVENTORY_READ_ONLY=true "
+                "to serve the inventory read-only"
+            )
+        logger.warning(
+            f"Serving {workers} workers with a read-only inventory; "
+            "the inventory mutation tools are disabled"
+        )
+        if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            logger.warning(
+                "PROMETHEUS_MULTIPROC_DIR is not set; /metrics shows only "
+                "the worker that answers the scrape"
+            )
+    clear_multiprocess_dir()
+    PreforkServer(
+        uvicorn.Config(
+            "src.main:app",
+            host=settings.host,
+            port=settings.port,
+            loop=settings.uvicorn_loop,
+            http=settings.uvicorn_http,
+            proxy_headers=True,
+        ),
+        workers=workers,
+        max_requests=settings.max_requests,
+        max_requests_jitter=settings.max_requests_jitter,
+        warm_up=_warm_up,
+        on_worker_exit=mark_worker_dead,
+        on_worker_stop=_close_worker,
+    ).run()
 
 
 if __name__ == "__main__":
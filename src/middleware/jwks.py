@@ -0,0 +1,223 @@
+"""JWKS key provider for JWT verification.
+
+Signing keys are loaded from a JWKS document (a local file or an HTTP(S)
+URL), parsed once and indexed by ``kid``. A background thread refreshes the
+document on a jittered interval, so key rotation needs no redeploy and the
+request path only ever performs a dictionary lookup.
+"""
+
+import json
+import random
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import httpx
+import jwt
+
+from src.core.config import settings
+from src.core.logger import logger
+
+
+class JWKSKeyProvider:
+    """Keeps a ``kid`` -> public key index in sync with a JWKS document.
+
+    An unknown ``kid`` never waits for the network: :meth:`get_key` returns
+    ``None`` and schedules a refresh. Such refreshes are rate limited, so a
+    burst of requests carrying the same (or a forged) ``kid`` results in at
+    most one fetch per ``min_refresh_interval``.
+
+    Args:
+        source: Path or ``http(s)://`` URL of the JWKS document.
+        refresh_interval: Seconds between periodic refreshes.
+        jitter: Fraction of ``refresh_interval`` added or removed at random
+            so replicas do not refresh in lockstep.
+        min_refresh_interval: Minimum seconds between refreshes triggered by
+            unknown key ids.
+        fetch_timeout: Timeout in seconds for fetching the document.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        refresh_interval: float = 300.0,
+        jitter: float = 0.1,
+        min_refresh_interval: float = 30.0,
+        fetch_timeout: float = 5.0,
+    ) -> None:
+        self.source = source
+        self.refresh_interval = refresh_interval
+        self.jitter = jitter
+        self.min_refresh_interval = min_refresh_interval
+        self.fetch_timeout = fetch_timeout
+        # Replaced wholesale on refresh; readers never see a partial index.
+        self._keys: Dict[str, Any] = {}
+        self._default_key: Optional[Any] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._loaded = False
+        self._refresh_pending = False
+        self._last_forced_refresh = float("-inf")
+        self._last_success: Optional[float] = None
+        self.refreshes = 0
+        self.failures = 0
+        self.forced_refreshes = 0
+
+    @classmethod
+    def from_settings(cls) -> "JWKSKeyProvider":
+        """Build a provider from the ``jwks_*`` settings."""
+        return cls(
+            source=settings.jwks_url,
+            refresh_interval=settings.jwks_refresh_interval,
+            jitter=settings.jwks_refresh_jitter,
+            min_refresh_interval=settings.jwks_min_refresh_interval,
+            fetch_timeout=settings.jwks_fetch_timeout,
+        )
+
+    # ---------------------------------------------------------------- lookup
+
+    def get_key(self, kid: Optional[str]) -> Optional[Any]:
+        """Return the key for ``kid`` without blocking.
+
+        Tokens without a ``kid`` are accepted only when the document holds a
+        single key. An unknown ``kid`` schedules a rate-limited refresh.
+        """
+        if not self._loaded:
+            self.start(wait=False)
+        if kid is None:
+            return self._default_key
+        key = self._keys.get(kid)
+        if key is None:
+            self.request_refresh()
+        return key
+
+    def request_refresh(self) -> bool:
+        """Wake the refresh thread unless a forced refresh ran recently.
+
+        Returns:
+            ``True`` if this call scheduled a refresh.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._refresh_pending or now - self._last_forced_refresh < self.min_refresh_interval:
+                return False
+            self._refresh_pending = True
+            self._last_forced_refresh = now
+            self.forced_refreshes += 1
+        self.start(wait=False)
+        self._wake.set()
+        return True
+
+    # --------------------------------------------------------------- refresh
+
+    def _fetch(self) -> Dict[str, Any]:
+        if self.source.startswith(("http://", "https://")):
+            response = httpx.get(self.source, timeout=self.fetch_timeout)
+            response.raise_for_status()
+            return response.json()
+        with open(self.source, "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    @staticmethod
+    def parse(document: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the signing keys of a JWKS document indexed by ``kid``.
+
+        Keys that cannot be parsed or are not meant for signatures are
+        skipped with a warning rather than failing the whole document.
+        """
+        keys: Dict[str, Any] = {}
+        for jwk in document.get("keys", []):
+            if jwk.get("use", "sig") != "sig":
+                continue
+            try:
+                keys[jwk.get("kid", "")] = jwt.PyJWK(jwk).key
+            except (jwt.PyJWKError, jwt.InvalidKeyError, ValueError, TypeError) as e:
+                logger.warning(f"Skipping JWKS key {jwk.get('kid')}: {str(e)}")
+        return keys
+
+    def refresh(self) -> bool:
+        """Fetch and index the document now; keeps the old keys on failure.
+
+        Returns:
+            ``True`` if the key index was replaced.
+        """
+        try:
+            keys = self.parse(self._fetch())
+        except (OSError, ValueError, httpx.HTTPError) as e:
+            self.failures += 1
+            logger.error(f"JWKS refresh from {self.source} failed: {str(e)}")
+            return False
+        finally:
+            with self._lock:
+                self._refresh_pending = False
+        self._keys = keys
+        self._default_key = next(iter(keys.values())) if len(keys) == 1 else None
+        self._loaded = True
+        self._last_success = time.monotonic()
+        self.refreshes += 1
+        logger.info(f"Loaded {len(keys)} JWKS keys from {self.source}")
+        return True
+
+    def _next_delay(self) -> float:
+        spread = self.refresh_interval * self.jitter
+        return max(0.0, self.refresh_interval + random.uniform(-spread, spread))
+
+    def _refresh_loop(self) -> None:
+        if not self._loaded:
+            self.refresh()
+        while not self._stopped.is_set():
+            self._wake.wait(self._next_delay())
+            if self._stopped.is_set():
+                break
+            self._wake.clear()
+            self.refresh()
+
+    # ------------------------------------------------------------- lifecycle
+
+    def start(self, wait: bool = True) -> None:
+        """Start the background refresh thread.
+
+        Args:
+            wait: Load the document before returning. With ``False`` the
+                first load happens on the refresh thread.
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._refresh_loop, name="jwks-refresh", daemon=True
+            )
+        if wait:
+            self.refresh()
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop the background refresh thread."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=self.fetch_timeout + 1)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return key count and refresh counters."""
+        age = None
+        if self._last_success is not None:
+            age = time.monotonic() - self._last_success
+        return {
+            "keys": len(self._keys),
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "forced_refreshes": self.forced_refreshes,
+            "seconds_since_refresh": age,
+        }
+
+
+@lru_cache
+def get_jwks_provider() -> Optional[JWKSKeyProvider]:
+    """Return the application-wide JWKS provider, or ``None`` if not configured."""
+    if not settings.jwks_url:
+        return None
+    return JWKSKeyProvider.from_settings()
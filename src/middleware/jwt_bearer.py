@@ -2,18 +2,119 @@
 # pylint: disable=too-few-public-methods
 """JWTBearer class to Verify the Authorization header"""
 
-from typing import Optional
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 
 import jwt
 from fastapi import HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.responses import Response
+from opentelemetry import trace
+from starlette.types import ASGIApp, Receive, Scope, Send
 from httpx import RequestError
 
 from src.core.config import settings
 from src.core.logger import logger
+from src.core.request_log import log_event
+from src.middleware.jwks import get_jwks_provider
+from src.utils.tracing import tracer
+
+
+@lru_cache(maxsize=8)
+def get_verification_key(public_key: str, algorithm: str) -> Any:
+    """Parse the configured public key once into a key object.
+
+    Falls back to the raw string when it cannot be parsed, so ``jwt.decode``
+    reports the problem per request exactly as before.
+    """
+    try:
+        return jwt.get_algorithm_by_name(algorithm).prepare_key(public_key)
+    except (jwt.InvalidKeyError, NotImplementedError, ValueError) as e:
+        logger.warning(f"Could not parse JWT public key for {algorithm}: {str(e)}")
+        return public_key
+
+
+class TokenCache:
+    """Bounded cache of verified token payloads keyed by token hash.
+
+    Entries expire at the token's ``exp`` claim, or after ``max_ttl``
+    seconds if that comes first, so revocation by expiry is honored.
+
+    Args:
+        max_entries: Maximum number of cached tokens.
+        max_ttl: Upper bound in seconds on how long a payload is reused.
+    """
+
+    def __init__(self, max_entries: int, max_ttl: float) -> None:
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return the cached payload for ``token`` if it is still valid."""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, token: str, payload: Dict[str, Any]) -> None:
+        """Cache a verified ``payload`` for ``token``."""
+        expires_at = time.time() + self.max_ttl
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget every cached token."""
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache(settings.jwt_cache_size, settings.jwt_cache_ttl)
+
+
+def resolve_signing_key(token: str) -> Any:
+    """Return the key that should have signed ``token``.
+
+    Uses the JWKS provider when one is configured and the static public key
+    otherwise.
+
+    Raises:
+        jwt.InvalidTokenError: If the token header is malformed or names a
+            key the provider does not know (yet).
+    """
+    provider = get_jwks_provider()
+    if provider is None:
+        return get_verification_key(
+            settings.enterprise_auth_public_key,
+            settings.encryption_algorithm,
+        )
+    kid = jwt.get_unverified_header(token).get("kid")
+    key = provider.get_key(kid)
+    if key is None:
+        raise jwt.InvalidTokenError(f"unknown signing key {kid!r}")
+    return key
 
 
 # JWTBearer class to Verify the Authorization header
@@ -37,15 +138,12 @@ class JWTBearer(HTTPBearer):
     ) -> Optional[HTTPAuthorizationCredentials]:
         """Verify and extract JWT token"""
         try:
-            logger.info("Starting JWT validation")
-
             # Try token from cookie
             auth_token = request.cookies.get("Authorization")
            
             # Fallback to header
             if not auth_token:
                 # If not in cookie, try Authorization header
-                logger.info("No token in cookie, checking Authorization header")
                 credentials = await super().__call__(request)
                 if credentials.scheme != "Bearer":
                     logger.error("Invalid authentication scheme")
@@ -61,11 +159,20 @@ class JWTBearer(HTTPBearer):
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Invalid authorization code",
                 )
+            # Warm tokens skip signature verification entirely
+            payload = token_cache.get(auth_token)
+            if payload is not None:
+                log_event("auth.verified", cached=True)
+                trace.get_current_span().set_attribute("auth.cached", True)
+                request.state.token = auth_token
+                request.state.user_info = payload["UserInfo"]
+                return credentials if "credentials" in locals() else None
+
             # Verify the token
             try:
                 payload = jwt.decode(
                     auth_token,
-                    settings.enterprise_auth_public_key,
+                    resolve_signing_key(auth_token),
                     algorithms=[settings.encryption_algorithm],
                 )
             except jwt.ExpiredSignatureError as exc:
@@ -90,7 +197,9 @@ class JWTBearer(HTTPBearer):
                     detail="Invalid token: missing user info",
                 )
 
-            logger.info(f"Token verified. User info: {user_info}")
+            log_event("auth.verified", cached=False)
+            trace.get_current_span().set_attribute("auth.cached", False)
+            token_cache.put(auth_token, payload)
             request.state.token = auth_token
             request.state.user_info = user_info
             return credentials if "credentials" in locals() else None
@@ -106,51 +215,64 @@ class JWTBearer(HTTPBearer):
 
 
 # JWTMiddleware class which invokes the middleware
-class JWTMiddleware(BaseHTTPMiddleware):
-    """JWT Middleware for validating tokens"""
+class JWTMiddleware:
+    """JWT Middleware for validating tokens.
+
+    A pure ASGI middleware: authenticated requests are handed to the wrapped
+    app with the original ``receive`` and ``send`` callables, so streamed
+    responses (the MCP streamable-HTTP/SSE transport) pass through untouched
+    and no extra task or memory stream is created per request.
+    """
 
-    def __init__(self, app):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.skip_paths = frozenset(
+            f"{settings.base_path}{suffix}" for suffix in settings.skip_paths
+        )
+        self.jwt_bearer = JWTBearer(auto_error=True)
         logger.info("JWT Middleware initialized")
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        """Process each request through JWT validation"""
-        logger.info(f"JWT Middleware processing request: {request.url.path}")
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process each HTTP request through JWT validation"""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
         try:
-            skip_paths = [
-                f"{settings.base_path}{suffix}" for suffix in settings.skip_paths
-            ]
             # Skip if path is excluded
-            if request.url.path in skip_paths:
-                logger.info(f"Skipping JWT validation for path: {request.url.path}")
-                return await call_next(request)
+            if request.url.path in self.skip_paths:
+                log_event("auth.skipped")
+                await self.app(scope, receive, send)
+                return
 
             # Validate with JWTBearer
-            jwt_bearer = JWTBearer(auto_error=True)
-            await jwt_bearer(request)
-
-            logger.info("JWT validation passed")
-
-            # Inject Authorization header if missing
-            if "Authorization" not in request.headers:
-                token = request.state.token
-                headers = dict(request.headers)
-                headers["Authorization"] = f"Bearer {token}"
-                request._headers = headers  # pylint: disable=protected-access
-
-            return await call_next(request)
+            with tracer.start_as_current_span("auth.jwt"):
+                await self.jwt_bearer(request)
 
         except HTTPException as exc:
             logger.error(f"JWT validation failed: {exc.detail}")
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=exc.status_code,
                 content={"detail": exc.detail},
             )
+            await response(scope, receive, send)
+            return
         except RequestError as e:
             logger.error(f"Request error in middleware: {str(e)}")
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content={"detail": "Internal server error"},
             )
+            await response(scope, receive, send)
+            return
+
+        # Inject Authorization header if missing (token came from the cookie)
+        if "authorization" not in request.headers:
+            scope = dict(scope)
+            scope["headers"] = [
+                *scope["headers"],
+                (b"authorization", f"Bearer {request.state.token}".encode("latin-1")),
+            ]
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,55 @@
+"""Server spans for incoming HTTP requests"""
+
+from typing import Dict
+
+from opentelemetry import context, propagate
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+from src.utils.tracing import tracer
+
+
+class TracingMiddleware:
+    """Open a server span per HTTP request.
+
+    The W3C ``traceparent``/``tracestate`` headers of the request become the
+    span's parent. The context holding the span is also stored in the
+    request's ASGI state, where MCP tool spans pick it up.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.excluded_paths = frozenset(settings.tracing_excluded_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
+        if path.removeprefix(scope.get("root_path", "")) in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        carrier: Dict[str, str] = {
+            key.decode("latin-1"): value.decode("latin-1")
+            for key, value in scope["headers"]
+        }
+        method = scope["method"]
+        with tracer.start_as_current_span(
+            f"{method} {path}",
+            context=propagate.extract(carrier),
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": method, "url.path": path},
+        ) as span:
+            scope.setdefault("state", {})["otel_context"] = context.get_current()
+
+            async def send_with_status(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    span.set_attribute("http.response.status_code", status)
+                    if status >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+
+            await self.app(scope, receive, send_with_status)
@@ -1,5 +1,231 @@
-from pydantic import BaseModel
+from typing import Any, Dict, List, Literal, Optional, Union
+
+from pydantic import BaseModel, ConfigDict, Field, StrictBool, model_validator
 
 class NoInput(BaseModel):
     """Empty schema for tools with no input"""
     pass
+
+
+class ListInventoryInput(BaseModel):
+    """Input schema for the paginated inventory list tools."""
+
+    limit: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="""Maximum number of records to return (page size).
+        Defaults to the server's configured page size.""",
+    )
+    cursor: Optional[str] = Field(
+        default=None,
+        description="""Opaque continuation token returned as next_cursor by the
+        previous call. Omit it to start from the first record. A cursor is
+        rejected once the inventory has changed; start again without it.""",
+    )
+    stream: bool = Field(
+        default=False,
+        description="""Stream all remaining records as chunks of `limit` records
+        through MCP log notifications (logger "inventory.stream") with progress
+        updates, instead of returning them in the response.""",
+    )
+
+
+class RetailAnalyticsInput(BaseModel):
+    """Input schema for the retail analytics tools."""
+
+    category: Optional[str] = Field(
+        default=None,
+        description="""Only return items of this Product Category, e.g.
+        'Electronics'. Omit it for every category.""",
+    )
+    limit: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="""Maximum number of items to return (page size).
+        Defaults to the server's configured page size.""",
+    )
+    cursor: Optional[str] = Field(
+        default=None,
+        description="""Opaque continuation token returned as next_cursor by the
+        previous call. Omit it to start from the first item. A cursor is
+        rejected once the inventory has changed; start again without it.""",
+    )
+
+
+class InventoryViewInput(BaseModel):
+    """Input schema for the materialized inventory view tool."""
+
+    view: str = Field(
+        ...,
+        description="""View to read: 'promotion_candidates', 'overstock',
+        'high_dsi' or 'seasonal_high_demand'.""",
+    )
+    limit: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="""Maximum number of records to return (page size).
+        Defaults to the server's configured page size.""",
+    )
+    cursor: Optional[str] = Field(
+        default=None,
+        description="""Opaque continuation token returned as next_cursor by the
+        previous call. Omit it to start from the first record. A cursor is
+        rejected once the inventory has changed; start again without it.""",
+    )
+
+
+class InventoryViewCheckInput(BaseModel):
+    """Input schema for the inventory view consistency check."""
+
+    repair: bool = Field(
+        default=False,
+        description="Rebuild every view that does not match a full recompute.",
+    )
+
+
+class InventoryPredicate(BaseModel):
+    """A single filter condition on an inventory column."""
+
+    column: str = Field(..., description="Column name, e.g. 'Product Category'.")
+    op: Literal["==", "!=", ">", ">=", "<", "<=", "in", "contains"] = Field(
+        ..., description="Comparison operator."
+    )
+    value: Union[StrictBool, int, float, str, List[Union[int, float, str]]] = Field(
+        ...,
+        description="""Value to compare against. Use a list with the 'in'
+        operator; 'contains' is a case-insensitive substring match.""",
+    )
+
+
+class InventorySortKey(BaseModel):
+    """A sort key for inventory query results."""
+
+    column: str = Field(..., description="Column to sort by.")
+    descending: bool = Field(default=False, description="Sort in descending order.")
+
+
+class InventoryQueryInput(BaseModel):
+    """Input schema for the inventory query tool."""
+
+    source: Literal["json", "excel"] = Field(
+        default="json",
+        description="Query the JSON inventory store or the Excel workbook.",
+    )
+    where: List[InventoryPredicate] = Field(
+        default_factory=list,
+        description="Filter conditions; a record must match all of them.",
+    )
+    select: Optional[List[str]] = Field(
+        default=None, description="Columns to return. Omit to return every column."
+    )
+    order_by: List[InventorySortKey] = Field(
+        default_factory=list, description="Sort keys, applied in order."
+    )
+    limit: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="""Maximum number of records to return (page size).
+        Defaults to the server's configured page size and is capped by its
+        maximum; follow next_cursor for more.""",
+    )
+    cursor: Optional[str] = Field(
+        default=None,
+        description="""Opaque continuation token returned as next_cursor by the
+        previous call with the same query. Omit it to start from the first
+        match. A cursor is rejected once the inventory has changed; start
+        again without it.""",
+    )
+
+
+class InventoryOperation(BaseModel):
+    """One operation of a bulk inventory mutation."""
+
+    op: Literal["add", "update", "delete"] = Field(..., description="Operation to apply.")
+    item_id: Optional[int] = Field(
+        None,
+        ge=0,
+        description="""Position of the record to update or delete. Positions
+        count after the earlier operations of the same batch.""",
+    )
+    item: Optional[Dict[str, Any]] = Field(
+        None, description="The record to add, or the replacement record for update."
+    )
+
+    @model_validator(mode="after")
+    def _no_unused_fields(self) -> "InventoryOperation":
+        # A field the operation ignores points at a malformed batch; fail it
+        # before anything is committed.
+        if self.op == "add" and self.item_id is not None:
+            raise ValueError("add takes no item_id; new items are appended")
+        if self.op == "delete" and self.item is not None:
+            raise ValueError("delete takes no item")
+        return self
+
+
+class BulkInventoryInput(BaseModel):
+    """Input schema for the bulk inventory mutation tool."""
+
+    operations: List[InventoryOperation] = Field(
+        ...,
+        min_length=1,
+        description="""Operations applied in order and committed together: if any
+        of them is invalid, none is applied.""",
+    )
+
+
+YesNo = Literal["Yes", "No"]
+
+
+class InventoryRecord(BaseModel):
+    """One inventory record, validated on import.
+
+    Fields use the dataset's column names as aliases; columns the schema
+    does not know are dropped.
+    """
+
+    model_config = ConfigDict(populate_by_name=True, extra="ignore")
+
+    product_category: str = Field(..., alias="Product Category", min_length=1)
+    seasonal_vs_evergreen: Literal["Seasonal", "Evergreen"] = Field(
+        ..., alias="Seasonal vs Evergreen"
+    )
+    item: str = Field(..., alias="Item", min_length=1)
+    reg_price: float = Field(..., alias="Reg Price", ge=0)
+    promotional_price: float = Field(..., alias="Promotional Price", ge=0)
+    on_hand_wh1: int = Field(..., alias="On hand Inventory WH1", ge=0)
+    on_hand_wh2: int = Field(..., alias="On hand Inventory WH2", ge=0)
+    on_hand_wh3: int = Field(..., alias="On hand Inventory WH3", ge=0)
+    expected_wh1: int = Field(..., alias="Expected Inventory WH1", ge=0)
+    expected_wh2: int = Field(..., alias="Expected Inventory WH2", ge=0)
+    expected_wh3: int = Field(..., alias="Expected Inventory WH3", ge=0)
+    forecasted_demand: int = Field(..., alias="Forecasted Demand", ge=0)
+    overstock: YesNo = Field(..., alias="Overstock")
+    supplier_deal: YesNo = Field(..., alias="Supplier Deal")
+    seasonal_high_demand: YesNo = Field(..., alias="Seasonal High Demand")
+    high_dsi: YesNo = Field(..., alias="High DSI")
+    recommended_for_promotion: YesNo = Field(..., alias="Recommended for Promotion")
+
+
+class InventoryImportInput(BaseModel):
+    """Input schema for the inventory import tool."""
+
+    path: str = Field(
+        ...,
+        description="""File to import, relative to the server's import
+        directory. CSV and xlsx files need a header row with the inventory
+        column names; JSON Lines files hold one record object per line.""",
+    )
+    format: Optional[Literal["csv", "jsonl", "xlsx"]] = Field(
+        default=None,
+        description="File format. Omit it to detect the format from the file suffix.",
+    )
+    batch_size: int = Field(
+        default=1000,
+        ge=1,
+        le=10_000,
+        description="Rows validated and committed together.",
+    )
+    dry_run: bool = Field(
+        default=False,
+        description="Validate every row and report errors without importing.",
+    )
@@ -0,0 +1,322 @@
+"""Local stand-in for the CoreAI upstream used by ``ExampleTool``.
+
+Serves ``GET /example-coreai-service`` with injected latency, errors,
+hangs and a configurable payload size, so connection pooling, timeouts
+and response caching can be measured without the real service. It runs
+as an ASGI app, in a background thread of the current process
+(:class:`SimulatorServer`), or standalone::
+
+    python -m src.server.coreai_simulator --port 9000 --latency lognormal \\
+        --latency-ms 50 --latency-sigma 0.8 --error-rate 0.01
+
+and then ``ENTERPRISE_BASE_URL=http://127.0.0.1:9000``.
+
+``GET /_simulator/stats`` returns request counters and ``POST
+/_simulator/config`` changes any :class:`SimulatorConfig` field at run time.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import socket
+import threading
+import time
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+SERVICE_PATH = "/example-coreai-service"
+
+
+@dataclass(frozen=True)
+class SimulatorConfig:
+    """Behaviour of the simulated upstream.
+
+    Attributes:
+        latency: Distribution of response delays: ``fixed`` (``latency_ms``),
+            ``uniform`` (``latency_ms`` to ``latency_max_ms``), ``exponential``
+            (mean ``latency_ms``) or ``lognormal`` (median ``latency_ms`` and
+            shape ``latency_sigma``; a sigma of 1 puts p99 near 10x median).
+        latency_ms: Main latency parameter in milliseconds.
+        latency_max_ms: Upper bound of ``uniform``; also caps every delay.
+        latency_sigma: Shape of ``lognormal``.
+        error_rate: Share of requests answered with ``error_status``.
+        error_status: HTTP status of injected errors.
+        timeout_rate: Share of requests that hang for ``hang_seconds``, long
+            enough to trip the caller's read timeout.
+        hang_seconds: How long hanging requests wait before answering.
+        payload_bytes: Approximate size of successful response bodies.
+        seed: Seed for reproducible runs.
+    """
+
+    latency: str = "fixed"
+    latency_ms: float = 0.0
+    latency_max_ms: float = 10_000.0
+    latency_sigma: float = 0.5
+    error_rate: float = 0.0
+    error_status: int = 503
+    timeout_rate: float = 0.0
+    hang_seconds: float = 60.0
+    payload_bytes: int = 1024
+    seed: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"latency must be one of {', '.join(LATENCY_DISTRIBUTIONS)}, "
+                f"not {self.latency!r}"
+            )
+        for name in ("error_rate", "timeout_rate"):
+            if not 0.0 <= getattr(self, name) <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1")
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "SimulatorConfig":
+        """Parse ``"field=value,..."``, e.g. ``"latency=lognormal,latency_ms=50"``.
+
+        Raises:
+            ValueError: For unknown fields or invalid values.
+        """
+        values: Dict[str, Any] = {}
+        for part in filter(None, (part.strip() for part in spec.split(","))):
+            name, _, value = part.partition("=")
+            name = name.strip().replace("-", "_")
+            values[name] = _field_type(name)(value.strip())
+        return cls(**values)
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Return one delay in seconds drawn from the distribution."""
+        if self.latency == "uniform":
+            millis = rng.uniform(self.latency_ms, self.latency_max_ms)
+        elif self.latency == "exponential":
+            millis = rng.expovariate(1.0 / self.latency_ms) if self.latency_ms > 0 else 0.0
+        elif self.latency == "lognormal":
+            millis = (
+                rng.lognormvariate(math.log(self.latency_ms), self.latency_sigma)
+                if self.latency_ms > 0
+                else 0.0
+            )
+        else:
+            millis = self.latency_ms
+        return min(max(millis, 0.0), self.latency_max_ms) / 1000
+
+
+_FIELD_TYPES = {
+    "seed": int,
+    **{
+        field.name: type(field.default)
+        for field in fields(SimulatorConfig)
+        if field.default is not None
+    },
+}
+
+
+def _field_type(name: str) -> Any:
+    """Return the type values of the config field ``name`` are parsed with."""
+    try:
+        return _FIELD_TYPES[name]
+    except KeyError:
+        raise ValueError(f"Unknown simulator setting: {name}") from None
+
+
+class CoreAISimulator:
+    """The simulated service and its counters.
+
+    Args:
+        config: Initial behaviour; see :meth:`configure` to change it.
+    """
+
+    def __init__(self, config: Optional[SimulatorConfig] = None) -> None:
+        self.config = config or SimulatorConfig()
+        self._rng = random.Random(self.config.seed)
+        self._filler = self._make_filler(self.config.payload_bytes)
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.app = Starlette(
+            routes=[
+                Route(SERVICE_PATH, self.handle, methods=["GET"]),
+                Route("/_simulator/stats", self._stats, methods=["GET"]),
+                Route("/_simulator/config", self._configure, methods=["POST"]),
+            ]
+        )
+
+    @staticmethod
+    def _make_filler(payload_bytes: int) -> bytes:
+        # Built once per size; responses only splice in the query.
+        overhead = len(json.dumps({"id": 0, "snippet": ""})) + 2
+        results: List[Dict[str, Any]] = []
+        remaining = payload_bytes
+        while remaining > overhead:
+            snippet = "x" * min(200, remaining - overhead)
+            results.append({"id": len(results), "snippet": snippet})
+            remaining -= overhead + len(snippet)
+        return json.dumps(results).encode()
+
+    def configure(self, **changes: Any) -> SimulatorConfig:
+        """Replace config fields by name.
+
+        Raises:
+            ValueError: For unknown fields or invalid values.
+        """
+        known = {field.name for field in fields(SimulatorConfig)}
+        unknown = set(changes) - known
+        if unknown:
+            raise ValueError(f"Unknown simulator settings: {', '.join(sorted(unknown))}")
+        config = replace(self.config, **changes)
+        if "seed" in changes:
+            self._rng = random.Random(config.seed)
+        if config.payload_bytes != self.config.payload_bytes:
+            self._filler = self._make_filler(config.payload_bytes)
+        self.config = config
+        return config
+
+    def stats(self) -> Dict[str, int]:
+        """Return request, error and concurrency counters."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+        }
+
+    async def handle(self, request: Request) -> Response:
+        """Answer one service call according to the current config."""
+        config = self.config
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            roll = self._rng.random()
+            if roll < config.timeout_rate:
+                self.timeouts += 1
+                await asyncio.sleep(config.hang_seconds)
+            else:
+                await asyncio.sleep(config.sample_latency(self._rng))
+            if roll >= 1.0 - config.error_rate:
+                self.errors += 1
+                return JSONResponse(
+                    {"detail": "simulated upstream error"}, status_code=config.error_status
+                )
+            query = json.dumps(request.query_params.get("query", "")).encode()
+            body = b'{"query":' + query + b',"results":' + self._filler + b"}"
+            return Response(body, media_type="application/json")
+        finally:
+            self.in_flight -= 1
+
+    async def _stats(self, _request: Request) -> JSONResponse:
+        return JSONResponse(self.stats())
+
+    async def _configure(self, request: Request) -> JSONResponse:
+        try:
+            config = self.configure(**await request.json())
+        except (ValueError, TypeError) as e:
+            return JSONResponse({"detail": str(e)}, status_code=400)
+        return JSONResponse(asdict(config))
+
+
+class SimulatorServer:
+    """Serve a :class:`CoreAISimulator` on a local port from a background thread.
+
+    Use as a context manager; :attr:`url` is the base URL to configure as
+    ``enterprise_base_url``.
+
+    Args:
+        simulator: The simulator to serve; a default one when omitted.
+        host: Interface to listen on.
+        port: Port to listen on; 0 picks a free one.
+    """
+
+    def __init__(
+        self,
+        simulator: Optional[CoreAISimulator] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.simulator = simulator or CoreAISimulator()
+        self.host = host
+        self.port = port
+        self._server: Optional[uvicorn.Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running simulator."""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self, timeout: float = 10.0) -> None:
+        """Start serving and wait until the socket accepts connections."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        self.port = sock.getsockname()[1]
+        self._server = uvicorn.Server(
+            uvicorn.Config(
+                self.simulator.app,
+                log_level="warning",
+                timeout_graceful_shutdown=1,
+                backlog=2048,
+            )
+        )
+        self._thread = threading.Thread(
+            target=self._server.run,
+            kwargs={"sockets": [sock]},
+            name="coreai-simulator",
+            daemon=True,
+        )
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("CoreAI simulator did not start")
+            time.sleep(0.01)
+
+    def stop(self) -> None:
+        """Stop serving; hanging requests are cut off after a second."""
+        if self._server is not None and self._thread is not None:
+            self._server.should_exit = True
+            self._thread.join()
+        self._server = self._thread = None
+
+    def __enter__(self) -> "SimulatorServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def start_simulator(argv: Optional[List[str]] = None) -> None:
+    """Run the simulator from the command line."""
+    defaults = SimulatorConfig()
+    parser = argparse.ArgumentParser(
+        prog="coreai-sim",
+        description="Serve a simulated CoreAI upstream with injected latency and faults.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    for field in fields(SimulatorConfig):
+        parser.add_argument(
+            f"--{field.name.replace('_', '-')}",
+            type=_field_type(field.name),
+            default=getattr(defaults, field.name),
+        )
+    args = vars(parser.parse_args(argv))
+    host, port = args.pop("host"), args.pop("port")
+    simulator = CoreAISimulator(SimulatorConfig(**args))
+    uvicorn.run(simulator.app, host=host, port=port, log_level="warning")
+
+
+if __name__ == "__main__":
+    start_simulator()
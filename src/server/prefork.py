@@ -0,0 +1,187 @@
+"""Pre-fork production server.
+
+The supervisor imports the application and loads its read-only data once,
+freezes the heap and then forks the workers, so every worker shares those
+pages copy-on-write instead of building its own copy. Mutable state must be
+opened in the workers, after the fork: a replacement worker is forked from
+the supervisor's state, not from its predecessor's. Workers are uvicorn
+servers accepting on one inherited listening socket; a worker that exits
+(for instance after serving ``max_requests`` requests) is replaced.
+"""
+
+import gc
+import os
+import random
+import signal
+import socket
+import sys
+import time
+from types import FrameType
+from typing import Callable, Dict, Optional, Set, Union
+
+import uvicorn
+
+from src.core.logger import logger
+
+STOP_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+WarmUp = Callable[[], None]
+WorkerExit = Callable[[int], None]
+WorkerStop = Callable[[], None]
+SignalMask = Set[Union[int, signal.Signals]]
+
+
+def _exit_worker(_signum: int, _frame: Optional[FrameType]) -> None:
+    raise SystemExit(0)
+
+
+def resolve_workers(workers: int) -> int:
+    """Return ``workers``, or one worker per CPU when it is ``0``."""
+    if workers > 0:
+        return workers
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+
+class PreforkServer:
+    """Supervise ``workers`` forked uvicorn servers sharing one socket.
+
+    Args:
+        config: uvicorn configuration shared by every worker.
+        workers: Number of worker processes.
+        max_requests: Requests after which a worker exits and is replaced;
+            ``0`` keeps workers for the lifetime of the supervisor.
+        max_requests_jitter: Random extra requests per worker, so workers
+            do not all recycle at the same moment.
+        warm_up: Called in the supervisor after the app is imported and
+            before forking, to load data the workers should share.
+        on_worker_exit: Called in the supervisor with the pid of every
+            worker that exits, e.g. to clean up per-process metric files.
+        on_worker_stop: Called in a worker after its server stopped, e.g. to
+            close files opened there. Workers leave through ``os._exit``,
+            which skips ``atexit`` handlers.
+    """
+
+    def __init__(
+        self,
+        config: uvicorn.Config,
+        workers: int,
+        max_requests: int = 0,
+        max_requests_jitter: int = 0,
+        warm_up: Optional[WarmUp] = None,
+        on_worker_exit: Optional[WorkerExit] = None,
+        on_worker_stop: Optional[WorkerStop] = None,
+    ) -> None:
+        self.config = config
+        self.workers = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.warm_up = warm_up
+        self.on_worker_exit = on_worker_exit
+        self.on_worker_stop = on_worker_stop
+        self.children: Dict[int, int] = {}  # pid -> worker slot
+        self.recycled = 0
+        self._stopping = False
+
+    def _worker(self, sock: socket.socket, mask: SignalMask) -> None:
+        """Run one uvicorn server in a freshly forked process."""
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        # uvicorn re-raises the stop signal once it has shut down; unwinding
+        # instead of dying lets on_worker_stop run.
+        for signum in STOP_SIGNALS:
+            signal.signal(signum, _exit_worker)
+        signal.pthread_sigmask(signal.SIG_SETMASK, mask)
+        if self.max_requests:
+            self.config.limit_max_requests = self.max_requests + random.randint(
+                0, self.max_requests_jitter
+            )
+        uvicorn.Server(self.config).run(sockets=[sock])
+
+    def _spawn(self, sock: socket.socket, slot: int) -> None:
+        # A stop signal arriving mid-fork would miss the new worker, or run
+        # the supervisor's handler in it; hold it until both sides are set up.
+        mask = signal.pthread_sigmask(signal.SIG_BLOCK, STOP_SIGNALS)
+        try:
+            pid = os.fork()
+            if pid == 0:
+                code = 0
+                try:
+                    self._worker(sock, mask)
+                except SystemExit:
+                    pass
+                except BaseException:  # pylint: disable=broad-exception-caught
+                    logger.exception(f"Worker {slot} crashed")
+                    code = 1
+                finally:
+                    code = self._stop_worker(slot, code)
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                    os._exit(code)  # pylint: disable=protected-access
+            self.children[pid] = slot
+        finally:
+            signal.pthread_sigmask(signal.SIG_SETMASK, mask)
+        logger.info(f"Started worker {slot} [{pid}]")
+
+    def _stop_worker(self, slot: int, code: int) -> int:
+        if self.on_worker_stop is None:
+            return code
+        try:
+            self.on_worker_stop()
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception(f"Worker {slot} failed to shut down cleanly")
+            return code or 1
+        return code
+
+    def _handle_stop(self, signum: int, _frame: Optional[FrameType]) -> None:
+        self._stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> None:
+        """Load the app, fork the workers and supervise them until stopped."""
+        self.config.load()
+        if self.warm_up is not None:
+            self.warm_up()
+        # Objects that exist now are never collected; keeping the collector
+        # away from them stops it from dirtying shared pages in the workers.
+        gc.collect()
+        gc.freeze()
+
+        sock = self.config.bind_socket()
+        for signum in STOP_SIGNALS:
+            signal.signal(signum, self._handle_stop)
+        logger.info(
+            f"Serving on {self.config.host}:{self.config.port} with {self.workers} workers "
+            f"(loop={self.config.loop}, http={self.config.http})"
+        )
+        try:
+            for slot in range(self.workers):
+                self._spawn(sock, slot)
+            while self.children:
+                try:
+                    pid, status = os.wait()
+                except ChildProcessError:
+                    break
+                except InterruptedError:
+                    continue
+                if pid not in self.children:
+                    continue
+                slot = self.children.pop(pid)
+                if self.on_worker_exit is not None:
+                    self.on_worker_exit(pid)
+                if self._stopping:
+                    continue
+                code = os.waitstatus_to_exitcode(status)
+                if code != 0:
+                    logger.error(f"Worker {slot} [{pid}] exited with {code}; restarting")
+                    # Avoid a tight fork loop when workers fail at startup.
+                    time.sleep(1)
+                else:
+                    self.recycled += 1
+                    logger.info(f"Worker {slot} [{pid}] recycled")
+                self._spawn(sock, slot)
+        finally:
+            sock.close()
+            logger.info("All workers stopped")
@@ -1,62 +1,194 @@
-import json
-import os
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 import logging
 
+from fastmcp.server.dependencies import get_context
+
+from src.core.config import settings
+from src.core.request_log import log_event
+from src.schemas.inventory import (
+    BulkInventoryInput,
+    InventoryImportInput,
+    InventoryViewCheckInput,
+    InventoryViewInput,
+    ListInventoryInput,
+)
+from src.tools.impl.inventory_import import InventoryImport, resolve_import_path
+from src.tools.impl.inventory_store import (
+    DATA_FILE,
+    BatchValidationError,
+    InventoryStore,
+    get_inventory_store,
+)
+from src.utils.blocking_io import run_blocking
+from src.utils.pagination import paginate, stream_records
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Update the DATA_FILE path to be relative to the current file's directory
-DATA_FILE = os.path.join(os.path.dirname(__file__), "data", "retails-mockdata.json")
-
-def read_data() -> List[Dict]:
-    if not os.path.exists(DATA_FILE):
-        logger.warning(f"Data file {DATA_FILE} does not exist.")
-        return []
-    try:
-        with open(DATA_FILE, "r") as f:
-            data = json.load(f)
-            logger.info(f"Data read successfully from {DATA_FILE}.")
-            return data
-    except json.JSONDecodeError as e:
-        logger.error(f"Error decoding JSON from {DATA_FILE}: {e}")
-        return []
-
-def write_data(data: List[Dict]):
-    with open(DATA_FILE, "w") as f:
-        json.dump(data, f, indent=2)
-        logger.info(f"Data written successfully to {DATA_FILE}.")
+__all__ = ["DATA_FILE", "MockInventoryTool"]
+
 
 class MockInventoryTool:
+    """CRUD operations over the process-resident inventory store."""
+
+    def __init__(self, store: Optional[InventoryStore] = None) -> None:
+        self.store = store if store is not None else get_inventory_store()
+
+    async def _ensure_loaded(self) -> None:
+        # The first access parses the snapshot and replays the log.
+        if not self.store.loaded:
+            await run_blocking(self.store.load)
+
     async def list_items(self) -> List[Dict]:
-        data = read_data()
-        logger.info(f"Listing items: {len(data)} items found.")
+        await self._ensure_loaded()
+        data = self.store.list_items()
+        log_event("inventory.list", items=len(data))
         return data
 
+    async def list_page(self, input_data: ListInventoryInput) -> Dict[str, Any]:
+        """Return one page of items, or stream them when requested."""
+        await self._ensure_loaded()
+        version = self.store.version
+        args = (
+            self.store.slice,
+            len(self.store),
+            "inventory_json",
+            input_data.limit,
+            input_data.cursor,
+            version,
+        )
+        if input_data.stream:
+            result = await stream_records(*args)
+        else:
+            result = paginate(*args)
+        log_event("inventory.page", items=len(result["items"]), total=result["total"])
+        return result
+
+    async def view_page(self, input_data: InventoryViewInput) -> Dict[str, Any]:
+        """Return one page of a materialized view.
+
+        Views are kept up to date on every mutation, so this costs the size
+        of the view rather than a scan of the inventory.
+        """
+        await self._ensure_loaded()
+        version = self.store.version
+        records = self.store.view(input_data.view)
+        result = paginate(
+            lambda start, stop: records[start:stop],
+            len(records),
+            f"view:{input_data.view}",
+            input_data.limit,
+            input_data.cursor,
+            version,
+        )
+        log_event(
+            "inventory.view",
+            view=input_data.view,
+            items=len(result["items"]),
+            total=result["total"],
+        )
+        return result
+
+    async def check_views(self, input_data: InventoryViewCheckInput) -> Dict[str, Any]:
+        """Verify every view against a full recompute over the inventory."""
+        await self._ensure_loaded()
+        views = await run_blocking(self.store.check_views, input_data.repair)
+        consistent = all(report["consistent"] for report in views.values())
+        if not consistent:
+            logger.warning("Inconsistent inventory views: %s", views)
+        log_event("inventory.view_check", consistent=consistent, repair=input_data.repair)
+        return {"consistent": consistent, "views": views}
+
     async def add_item(self, item: Dict) -> Dict:
-        data = read_data()
-        data.append(item)
-        write_data(data)
-        logger.info(f"Item added: {item}")
+        await run_blocking(self.store.add, item)
+        logger.info("Item added: %s", item)
         return item
 
     async def update_item(self, item_id: int, item: Dict) -> Optional[Dict]:
-        data = read_data()
-        if 0 <= item_id < len(data):
-            data[item_id] = item
-            write_data(data)
-            logger.info(f"Item updated at index {item_id}: {item}")
+        if await run_blocking(self.store.update, item_id, item) is not None:
+            logger.info("Item updated at index %s: %s", item_id, item)
             return item
-        logger.warning(f"Update failed: No item at index {item_id}.")
+        logger.warning("Update failed: No item at index %s.", item_id)
         return None
 
     async def delete_item(self, item_id: int) -> Optional[Dict]:
-        data = read_data()
-        if 0 <= item_id < len(data):
-            removed = data.pop(item_id)
-            write_data(data)
-            logger.info(f"Item deleted at index {item_id}: {removed}")
+        removed = await run_blocking(self.store.delete, item_id)
+        if removed is not None:
+            logger.info("Item deleted at index %s: %s", item_id, removed)
             return removed
-        logger.warning(f"Delete failed: No item at index {item_id}.")
+        logger.warning("Delete failed: No item at index %s.", item_id)
         return None
+
+    async def apply_batch(self, input_data: BulkInventoryInput) -> Dict[str, Any]:
+        """Apply a batch of operations in one commit and report each one.
+
+        Invalid batches are not applied; their result lists the error of
+        every invalid operation and ``committed`` is false.
+        """
+        if len(input_data.operations) > settings.inventory_max_batch_ops:
+            raise ValueError(
+                f"A batch holds at most {settings.inventory_max_batch_ops} operations"
+            )
+        operations: List[Dict[str, Any]] = []
+        for operation in input_data.operations:
+            mutation: Dict[str, Any] = {"op": operation.op}
+            if operation.item_id is not None:
+                mutation["id"] = operation.item_id
+            if operation.item is not None:
+                mutation["item"] = operation.item
+            operations.append(mutation)
+        try:
+            applied = await run_blocking(self.store.apply_batch, operations)
+        except BatchValidationError as e:
+            logger.warning("Batch rejected: %s", e)
+            log_event("inventory.batch", ops=len(operations), committed=False)
+            rejected = []
+            for index, mutation in enumerate(operations):
+                result = {"index": index, "op": mutation["op"], "ok": index not in e.errors}
+                if index in e.errors:
+                    result["error"] = e.errors[index]
+                rejected.append(result)
+            return {"committed": False, "applied": 0, "results": rejected}
+        log_event("inventory.batch", ops=len(operations), committed=True)
+        results = []
+        for index, (mutation, (item_id, record)) in enumerate(zip(operations, applied)):
+            result = {"index": index, "op": mutation["op"], "ok": True, "item_id": item_id}
+            if mutation["op"] == "delete":
+                result["item"] = record
+            results.append(result)
+        return {"committed": True, "applied": len(applied), "results": results}
+
+    async def import_file(self, input_data: InventoryImportInput) -> Dict[str, Any]:
+        """Stream a file from the import directory into the store.
+
+        Each batch is parsed and committed on the blocking-I/O pool; between
+        batches the rows read so far go out as MCP progress notifications.
+        """
+        path = resolve_import_path(input_data.path, settings.inventory_import_dir)
+        await self._ensure_loaded()
+        try:
+            ctx = get_context()
+        except RuntimeError:
+            ctx = None
+        importer = InventoryImport(
+            path,
+            self.store,
+            input_data.format,
+            input_data.batch_size,
+            input_data.dry_run,
+        )
+        try:
+            while await run_blocking(importer.step):
+                if ctx is not None:
+                    await ctx.report_progress(importer.report.rows)
+        finally:
+            importer.close()
+        report = importer.report
+        log_event(
+            "inventory.import",
+            rows=report.rows,
+            imported=report.imported,
+            rejected=report.rejected,
+        )
+        return report.to_dict()
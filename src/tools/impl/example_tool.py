@@ -2,14 +2,16 @@
 
 from typing import Any, Dict, Union
 import json
-import httpx
 
 from src.schemas.example_tool import ExampleToolInput
 from src.tools.meta.base import BaseTool
+from src.tools.meta.response_cache import ResponseCache
 from src.utils.auth import get_authorization_token
 from src.utils.ent_headers import add_ent_headers
+from src.utils.http_client import get_upstream_clients
 from src.core.config import settings
 from src.core.logger import logger
+from src.core.request_log import log_event
 
 
 class ExampleTool(BaseTool[ExampleToolInput]):
@@ -19,8 +21,16 @@ class ExampleTool(BaseTool[ExampleToolInput]):
         name (str): The name of the tool.
         description (str): A description of the tool's functionality.
         input_schema (Dict[str, Any]): The schema for input data required by the tool.
+        response_cache (ResponseCache): Caches upstream results per input,
+            caller and enterprise headers; identical concurrent calls share
+            one upstream request.
     """
 
+    response_cache: ResponseCache[Any] = ResponseCache(
+        ttl=settings.example_tool_cache_ttl,
+        max_entries=settings.example_tool_cache_size,
+    )
+
     @property
     def name(self) -> str:
         """Get the name of the tool.
@@ -79,63 +89,67 @@ class ExampleTool(BaseTool[ExampleToolInput]):
         This example tool performs an API call to an example CoreAI service.
         """
         try:
-            async with httpx.AsyncClient() as client:
-                url = f"{settings.enterprise_base_url}/example-coreai-service"  # Example url
-
-                # Extract auth token from request headers
-                auth_token = get_authorization_token(request_headers)
-               
-                
-                default_headers = {
-                    "Authorization": f"Bearer {auth_token}",
-                    "Content-Type": "application/json",
-                }
-                # Add enterprise headers
-                headers = add_ent_headers(default_headers, request_headers)
-
-                # Add the required params for the call
-                params = {
-                    "query": input_data["query"],
-                    "workspace_id": input_data["workspace_id"],
-                }
-                # Add the optional params for the call if they're provided in the input data
-                if (
-                    "workflow_id" in input_data
-                    and input_data["workflow_id"] is not None
-                ):
-                    params["workflow_id"] = input_data["workflow_id"]
-
-                response = await client.get(
-                    url,
-                    headers=headers,
-                    params=params,
-                    timeout=30.0,
-                )
-
-                logger.info(f"Example API response status: {response.status_code}")
-
-                if response.status_code != 200:
-                    error_text = response.text
-                    logger.error(f"Example API error: {error_text}")
-                    return json.dumps({"error": f"Example API error: {error_text}"})
-
-                try:
-                    data = response.json()
-                except (TypeError, AttributeError, ValueError) as e:
-                    logger.error(f"Error parsing Example API response: {str(e)}")
-                    raise
-
-                result = {
-                    "function": self.name,
-                    "data": {"results": data, "query": input_data["query"]},
-                }
-                return json.dumps(result)
+            url = f"{settings.enterprise_base_url}/example-coreai-service"  # Example url
+            # Shared keep-alive client; timeouts come from the upstream_* settings,
+            # capped at the remaining deadline of the tool call
+            client = get_upstream_clients().client_for(url)
+
+            # Extract auth token from request headers
+            auth_token = get_authorization_token(request_headers)
+
+            default_headers = {
+                "Authorization": f"Bearer {auth_token}",
+                "Content-Type": "application/json",
+            }
+            # Add enterprise headers
+            headers = add_ent_headers(default_headers, request_headers)
+
+            # Add the required params for the call
+            params = {
+                "query": input_data["query"],
+                "workspace_id": input_data["workspace_id"],
+            }
+            # Add the optional params for the call if they're provided in the input data
+            if (
+                "workflow_id" in input_data
+                and input_data["workflow_id"] is not None
+            ):
+                params["workflow_id"] = input_data["workflow_id"]
+
+            response = await client.get(
+                url,
+                headers=headers,
+                params=params,
+            )
+
+            log_event("upstream.response", status=response.status_code)
+
+            if response.status_code != 200:
+                error_text = response.text
+                logger.error(f"Example API error: {error_text}")
+                return json.dumps({"error": f"Example API error: {error_text}"})
+
+            try:
+                data = response.json()
+            except (TypeError, AttributeError, ValueError) as e:
+                logger.error(f"Error parsing Example API response: {str(e)}")
+                raise
+
+            result = {
+                "function": self.name,
+                "data": {"results": data, "query": input_data["query"]},
+            }
+            return json.dumps(result)
 
         except Exception as e:  # pylint: disable=broad-exception-caught
             error_msg = f"Exception during {self.name} tool call"
             logger.error(f"{error_msg}: {str(e)}")
             return json.dumps({"error": error_msg})
 
+    def is_cacheable(self, result: Any) -> bool:
+        """Error payloads are never cached."""
+        return isinstance(result, str) and not result.startswith('{"error"')
+
     def to_mcp_schema(self) -> Dict[str, Any]:
         """Return the MCP-compatible schema for this tool.
 
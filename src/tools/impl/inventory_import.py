@@ -0,0 +1,244 @@
+"""Streaming import of inventory records from CSV, JSON Lines and xlsx files.
+
+Files are read row by row: CSV through :mod:`csv`, JSON Lines a line at a
+time and workbooks through openpyxl's read-only mode. Rows are validated
+against :class:`InventoryRecord` and added to the inventory store in batches,
+each batch one :meth:`InventoryStore.apply_batch` commit. Only the current
+batch is held in memory on the parsing side, so the size of the file does
+not matter.
+
+Invalid rows are skipped and counted; the first ``max_errors`` of them are
+reported with their row number.
+"""
+
+import csv
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+
+from src.core.logger import logger
+from src.schemas.inventory import InventoryRecord
+from src.tools.impl.inventory_store import InventoryStore
+
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".xlsx": "xlsx"}
+
+# A raw row: a JSON Lines line (validated by pydantic's JSON parser) or a
+# mapping of column names to cell values.
+RawRow = Union[str, Dict[str, Any]]
+Rows = Generator[Tuple[int, RawRow], None, None]
+
+
+def detect_format(path: str, fmt: Optional[str] = None) -> str:
+    """Return ``fmt``, or the format implied by the suffix of ``path``.
+
+    Raises:
+        ValueError: For unsupported formats.
+    """
+    if fmt is None:
+        fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None or fmt not in FORMATS.values():
+        raise ValueError(
+            f"Cannot import {os.path.basename(path)!r}; "
+            f"supported formats: {', '.join(sorted(set(FORMATS.values())))}"
+        )
+    return fmt
+
+
+def _without_blanks(row: Dict[Any, Any]) -> Dict[str, Any]:
+    # Empty cells are missing values, so validation reports them as such.
+    return {
+        str(key).strip(): value
+        for key, value in row.items()
+        if key is not None and value is not None and value != ""
+    }
+
+
+def _csv_rows(path: str) -> Rows:
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, _without_blanks(row)
+
+
+def _jsonl_rows(path: str) -> Rows:
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if line.strip():
+                yield line_number, line
+
+
+def _xlsx_rows(path: str) -> Rows:
+    # Imported here so the server only needs openpyxl when importing xlsx.
+    from openpyxl import load_workbook  # pylint: disable=import-outside-toplevel
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, ())
+        for row_number, values in enumerate(rows, 2):
+            row = _without_blanks(dict(zip(header, values)))
+            if row:
+                yield row_number, row
+    finally:
+        workbook.close()
+
+
+_READERS: Dict[str, Callable[[str], Rows]] = {
+    "csv": _csv_rows,
+    "jsonl": _jsonl_rows,
+    "xlsx": _xlsx_rows,
+}
+
+
+def iter_rows(path: str, fmt: Optional[str] = None) -> Rows:
+    """Yield ``(row number, raw row)`` from ``path`` one row at a time."""
+    return _READERS[detect_format(path, fmt)](path)
+
+
+def resolve_import_path(path: str, import_dir: str) -> str:
+    """Return the absolute path of ``path`` inside ``import_dir``.
+
+    Raises:
+        ValueError: When ``import_dir`` is empty (imports disabled) or
+            ``path`` points outside of it.
+    """
+    if not import_dir:
+        raise ValueError("Inventory imports are disabled; set INVENTORY_IMPORT_DIR")
+    root = os.path.realpath(import_dir)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f"{path!r} is outside the import directory")
+    if not os.path.isfile(resolved):
+        raise ValueError(f"No file {path!r} in the import directory")
+    return resolved
+
+
+@dataclass
+class ImportReport:
+    """Progress and outcome of one import."""
+
+    source: str
+    format: str
+    dry_run: bool = False
+    rows: int = 0
+    imported: int = 0
+    rejected: int = 0
+    batches: int = 0
+    elapsed: float = 0.0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the report as a JSON-serializable dictionary."""
+        return asdict(self)
+
+
+class InventoryImport:
+    """One import of a file into an inventory store.
+
+    Call :meth:`step` until it returns ``False`` (or :meth:`run`), then
+    :meth:`close`; the object is also a context manager.
+
+    Args:
+        path: File to import.
+        store: Store the records are added to.
+        fmt: ``csv``, ``jsonl`` or ``xlsx``; detected from the suffix when
+            omitted.
+        batch_size: Valid rows committed together.
+        dry_run: Validate and count rows without adding them.
+        max_errors: Rejected rows reported in detail; all are counted.
+
+    Raises:
+        ValueError: For unsupported formats.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        store: InventoryStore,
+        fmt: Optional[str] = None,
+        batch_size: int = 1000,
+        dry_run: bool = False,
+        max_errors: int = 100,
+    ) -> None:
+        self.store = store
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.report = ImportReport(source=path, format=detect_format(path, fmt), dry_run=dry_run)
+        self._rows = iter_rows(path, self.report.format)
+        self._elapsed = 0.0
+
+    def _reject(self, row_number: int, error: ValidationError) -> None:
+        self.report.rejected += 1
+        if len(self.report.errors) < self.max_errors:
+            self.report.errors.append(
+                {
+                    "row": row_number,
+                    "error": "; ".join(
+                        f"{'.'.join(str(part) for part in detail['loc']) or 'row'}: "
+                        f"{detail['msg']}"
+                        for detail in error.errors()
+                    ),
+                }
+            )
+
+    def _next_batch(self) -> Optional[List[Dict[str, Any]]]:
+        batch: List[Dict[str, Any]] = []
+        for row_number, raw in self._rows:
+            self.report.rows += 1
+            try:
+                record = (
+                    InventoryRecord.model_validate_json(raw)
+                    if isinstance(raw, str)
+                    else InventoryRecord.model_validate(raw)
+                )
+            except ValidationError as e:
+                self._reject(row_number, e)
+                continue
+            batch.append(record.model_dump(by_alias=True))
+            if len(batch) >= self.batch_size:
+                return batch
+        return batch or None
+
+    def step(self) -> bool:
+        """Read, validate and commit the next batch.
+
+        Returns:
+            ``False`` once the file is exhausted.
+        """
+        started = time.perf_counter()
+        try:
+            batch = self._next_batch()
+            if batch is None:
+                return False
+            if not self.report.dry_run:
+                self.store.apply_batch([{"op": "add", "item": record} for record in batch])
+            self.report.imported += len(batch)
+            self.report.batches += 1
+            return True
+        finally:
+            self._elapsed += time.perf_counter() - started
+            self.report.elapsed = round(self._elapsed, 3)
+
+    def run(self, progress: Optional[Callable[[ImportReport], None]] = None) -> ImportReport:
+        """Import the whole file, calling ``progress`` after every batch."""
+        while self.step():
+            if progress is not None:
+                progress(self.report)
+        logger.info(
+            f"Imported {self.report.imported} of {self.report.rows} rows from "
+            f"{self.report.source} ({self.report.rejected} rejected)"
+        )
+        return self.report
+
+    def close(self) -> None:
+        """Close the source file."""
+        self._rows.close()
+
+    def __enter__(self) -> "InventoryImport":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
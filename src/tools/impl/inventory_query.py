@@ -0,0 +1,170 @@
+"""Server-side filtering, projection and sorting over the inventory."""
+
+import hashlib
+from typing import Any, Dict, List, Union
+
+import pandas as pd
+
+from src.core.request_log import log_event
+from src.schemas.inventory import InventoryPredicate, InventoryQueryInput
+from src.tools.impl.inventory_store import get_inventory_store
+from src.tools.impl.inventory_tools import inventory_version, load_inventory
+from src.tools.meta.base import BaseTool
+from src.utils.blocking_io import run_blocking
+from src.utils.pagination import Version, decode_cursor, paginate, resolve_limit
+
+
+def _require_columns(df: pd.DataFrame, columns: List[str]) -> None:
+    missing = [column for column in columns if column not in df.columns]
+    if missing:
+        raise ValueError(f"Unknown column(s): {', '.join(missing)}")
+
+
+def _mask(df: pd.DataFrame, predicate: InventoryPredicate) -> "pd.Series[bool]":
+    """Evaluate one predicate as a vectorized boolean mask."""
+    series = df[predicate.column]
+    value = predicate.value
+    op = predicate.op
+    if op == "in":
+        return series.isin(value if isinstance(value, list) else [value])
+    if isinstance(value, list):
+        raise ValueError(f"Operator '{op}' does not accept a list value")
+    if op == "contains":
+        return series.astype("string").str.contains(
+            str(value), case=False, regex=False, na=False
+        )
+    if op == "==":
+        return series == value
+    if op == "!=":
+        return series != value
+    try:
+        if op == ">":
+            return series > value
+        if op == ">=":
+            return series >= value
+        if op == "<":
+            return series < value
+        return series <= value
+    except TypeError as e:
+        raise ValueError(
+            f"Cannot compare column '{predicate.column}' with {value!r}"
+        ) from e
+
+
+def _source(query: InventoryQueryInput) -> str:
+    """Name the query's result set, so a cursor only continues the same query."""
+    shape = query.model_dump_json(exclude={"limit", "cursor"})
+    return f"query:{hashlib.sha256(shape.encode('utf-8')).hexdigest()[:16]}"
+
+
+def _sort(df: pd.DataFrame, query: InventoryQueryInput, top: int) -> pd.DataFrame:
+    columns = [key.column for key in query.order_by]
+    directions = {key.descending for key in query.order_by}
+    numeric = all(pd.api.types.is_numeric_dtype(df[column]) for column in columns)
+    if numeric and len(directions) == 1:
+        # Top-k selection is O(n) and keeps ties in original order, like a
+        # stable sort followed by head().
+        if directions == {True}:
+            return df.nlargest(top, columns, keep="first")
+        return df.nsmallest(top, columns, keep="first")
+    return df.sort_values(
+        by=columns,
+        ascending=[not key.descending for key in query.order_by],
+        kind="stable",
+    )
+
+
+def run_query(
+    df: pd.DataFrame, query: InventoryQueryInput, version: Version = None
+) -> Dict[str, Any]:
+    """Apply ``query`` to ``df`` and return one page of the result.
+
+    Args:
+        df: Columnar inventory data.
+        query: Predicates, projection, sort keys, page size and cursor.
+        version: Version of ``df``, bound into the cursor.
+
+    Returns:
+        ``{"items": [...], "next_cursor": ..., "matched": <rows matching the
+        predicates>}``; ``next_cursor`` is ``None`` on the last page.
+
+    Raises:
+        ValueError: If the query references unknown columns or compares a
+            column with a value of an incompatible type, or the cursor is
+            invalid or stale.
+    """
+    _require_columns(df, [p.column for p in query.where])
+    _require_columns(df, [key.column for key in query.order_by])
+    if query.select is not None:
+        _require_columns(df, query.select)
+
+    result = df
+    if query.where:
+        mask = _mask(df, query.where[0])
+        for predicate in query.where[1:]:
+            mask &= _mask(df, predicate)
+        result = df[mask.to_numpy()]
+    matched = len(result)
+
+    source = _source(query)
+    if query.order_by:
+        # Only the rows up to the end of the requested page need ordering.
+        top = decode_cursor(query.cursor, source, version) + resolve_limit(query.limit)
+        result = _sort(result, query, top)
+    if query.select is not None:
+        result = result[query.select]
+
+    def fetch(start: int, stop: int) -> List[Dict[str, Any]]:
+        rows = result.iloc[start:stop]
+        # Missing cells become None so the result is valid JSON.
+        rows = rows.astype(object).where(rows.notna(), None)
+        records: List[Dict[str, Any]] = rows.to_dict(orient="records")
+        return records
+
+    page = paginate(fetch, matched, source, query.limit, query.cursor, version)
+    page["matched"] = page.pop("total")
+    return page
+
+
+class InventoryQueryTool(BaseTool[InventoryQueryInput]):
+    """Filter, project and sort inventory records on the server."""
+
+    @property
+    def name(self) -> str:
+        return "query_inventory"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Query inventory records on the server. Filter with 'where' "
+            "predicates (e.g. Product Category == Electronics, Forecasted "
+            "Demand > 200), pick columns with 'select', sort with 'order_by' "
+            "and page through matches with 'limit' and 'cursor'. Prefer this "
+            "over listing the whole inventory and filtering it yourself."
+        )
+
+    @property
+    def input_schema(self) -> Dict[str, Any]:
+        return InventoryQueryInput.model_json_schema()
+
+    def _run(self, query: InventoryQueryInput) -> Dict[str, Any]:
+        version: Version
+        if query.source == "excel":
+            df = load_inventory()
+            version = inventory_version()
+        else:
+            store = get_inventory_store()
+            store.load()
+            # Read before the frame, as for the list tools.
+            version = store.version
+            df = store.frame()
+        return run_query(df, query, version)
+
+    async def execute(
+        self, input_data: Union[InventoryQueryInput, Dict[str, Any]], *args: Any
+    ) -> Any:
+        if not isinstance(input_data, InventoryQueryInput):
+            input_data = InventoryQueryInput.model_validate(input_data)
+        result = await run_blocking(self._run, input_data)
+        log_event("inventory.query", matched=result["matched"], returned=len(result["items"]))
+        return result
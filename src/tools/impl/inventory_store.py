@@ -0,0 +1,474 @@
+"""Process-resident inventory store.
+
+The store loads ``retails-mockdata.json`` once, keeps the records in memory
+with secondary indexes on ``Item`` and ``Product Category`` and the
+materialized views of :mod:`src.tools.impl.inventory_views`, and serves all
+reads and mutations from memory. Mutations are recorded in an append-only
+log (see :mod:`src.tools.impl.inventory_wal`); a background thread fsyncs
+the log in batches and periodically compacts it into a new snapshot.
+
+A writable store locks its data file against other processes when it loads;
+a second writer gets :class:`~src.tools.impl.inventory_wal.LogLockedError`.
+Several processes can share one file only as read-only stores.
+"""
+
+import atexit
+import os
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from src.core.config import settings
+from src.core.logger import logger
+from src.tools.impl.inventory_views import VIEWS, ViewDefinition, build_views
+from src.tools.impl.inventory_wal import Mutation, MutationLog
+from src.utils.tracing import tracer
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "data", "retails-mockdata.json")
+
+ITEM_KEY = "Item"
+CATEGORY_KEY = "Product Category"
+
+
+def to_columnar(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Build a DataFrame from ``records`` with compact string columns.
+
+    Low-cardinality text columns such as ``Product Category`` or the
+    Yes/No flags become categoricals, so equality and membership filters
+    compare integer codes instead of strings.
+    """
+    frame = pd.DataFrame.from_records(records)
+    for column in frame.columns:
+        series = frame[column]
+        if pd.api.types.is_string_dtype(series) and series.nunique() <= len(series) // 2:
+            frame[column] = series.astype("category")
+    return frame
+
+
+def _remove_by_identity(bucket: List[Dict[str, Any]], record: Dict[str, Any]) -> None:
+    """Remove ``record`` from ``bucket`` comparing by identity, not equality."""
+    for position, candidate in enumerate(bucket):
+        if candidate is record:
+            del bucket[position]
+            return
+
+
+class BatchValidationError(ValueError):
+    """Some operations of a batch are invalid, so none was applied.
+
+    Attributes:
+        errors: Reason per position of an invalid operation in the batch.
+    """
+
+    def __init__(self, errors: Dict[int, str]) -> None:
+        self.errors = errors
+        super().__init__(f"{len(errors)} invalid operation(s); nothing was applied")
+
+
+def _validate_batch(operations: List[Mutation], size: int) -> Dict[int, str]:
+    """Check ``operations`` against a store of ``size`` records, in order."""
+    errors: Dict[int, str] = {}
+    for position, operation in enumerate(operations):
+        op = operation.get("op")
+        if op not in ("add", "update", "delete"):
+            errors[position] = f"Unknown operation {op!r}"
+            continue
+        if op != "delete" and not isinstance(operation.get("item"), dict):
+            errors[position] = f"{op} needs an item object"
+            continue
+        if op != "add":
+            item_id = operation.get("id")
+            if isinstance(item_id, bool) or not isinstance(item_id, int):
+                errors[position] = f"{op} needs an integer item_id"
+                continue
+            if not 0 <= item_id < size:
+                errors[position] = f"No item at index {item_id}"
+                continue
+        # Later ids are positions after this operation.
+        size += {"add": 1, "update": 0, "delete": -1}[op]
+    return errors
+
+
+class InventoryStore:
+    """In-memory inventory with background persistence.
+
+    Records are addressed by their position in the list, matching the
+    ``item_id`` semantics of the inventory tools.
+
+    Args:
+        data_file: Path of the JSON snapshot backing the store.
+        fsync_interval: Seconds between group commits of the mutation log.
+        compact_threshold: Number of logged mutations after which the log is
+            folded into a new snapshot.
+        views: Materialized views to maintain; :data:`VIEWS` by default.
+        read_only: Reject mutations and never write to the data file, so
+            other processes may load it at the same time.
+    """
+
+    def __init__(
+        self,
+        data_file: str = DATA_FILE,
+        fsync_interval: float = 0.05,
+        compact_threshold: int = 10_000,
+        views: Iterable[ViewDefinition] = VIEWS,
+        read_only: bool = False,
+    ) -> None:
+        self.data_file = data_file
+        self.read_only = read_only
+        self.fsync_interval = fsync_interval
+        self.compact_threshold = compact_threshold
+        self._log = MutationLog(data_file)
+        self._records: List[Dict[str, Any]] = []
+        self._by_item: Dict[Any, List[Dict[str, Any]]] = {}
+        self._by_category: Dict[Any, List[Dict[str, Any]]] = {}
+        self._views = build_views(views)
+        self._lock = threading.RLock()
+        self._compact_lock = threading.Lock()
+        self._loaded = False
+        self._version = 0
+        self._compacted_version = 0
+        self._compact_requested = threading.Event()
+        self._stopped = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self._frame: Optional[Tuple[int, pd.DataFrame]] = None
+
+    # ------------------------------------------------------------------ load
+
+    def load(self) -> None:
+        """Load the backing file into memory. Subsequent calls are no-ops.
+
+        Raises:
+            LogLockedError: If the store is writable and another process is
+                writing to the same data file.
+            SnapshotMismatchError: If the data file does not match the
+                mutation log next to it.
+        """
+        with self._lock:
+            if self._loaded:
+                return
+            if not self.read_only:
+                self._log.acquire()
+            with tracer.start_as_current_span(
+                "inventory.load", attributes={"file.path": self.data_file}
+            ) as span:
+                self._records, replayed = self._log.recover()
+                self._rebuild_indexes()
+                span.set_attribute("inventory.records", len(self._records))
+                span.set_attribute("inventory.replayed_mutations", replayed)
+            self._loaded = True
+            logger.info(
+                f"Inventory store loaded {len(self._records)} items from {self.data_file}"
+            )
+        if replayed:
+            self._version += replayed
+            if not self.read_only:
+                # Fold the replayed log into a fresh snapshot before serving writes.
+                self.compact()
+
+    def _rebuild_indexes(self) -> None:
+        self._by_item = {}
+        self._by_category = {}
+        for view in self._views.values():
+            view.rebuild(())
+        for record in self._records:
+            self._index(record)
+
+    def _index(self, record: Dict[str, Any]) -> None:
+        self._by_item.setdefault(record.get(ITEM_KEY), []).append(record)
+        self._by_category.setdefault(record.get(CATEGORY_KEY), []).append(record)
+        for view in self._views.values():
+            view.add(record)
+
+    def _unindex(self, record: Dict[str, Any]) -> None:
+        for index, key in (
+            (self._by_item, record.get(ITEM_KEY)),
+            (self._by_category, record.get(CATEGORY_KEY)),
+        ):
+            bucket = index.get(key)
+            if bucket is None:
+                continue
+            _remove_by_identity(bucket, record)
+            if not bucket:
+                del index[key]
+        for view in self._views.values():
+            view.remove(record)
+
+    # ----------------------------------------------------------------- reads
+
+    def __len__(self) -> int:
+        self.load()
+        return len(self._records)
+
+    def stats(self) -> Dict[str, int]:
+        """Return record count and mutation counters without loading."""
+        return {
+            "records": len(self._records) if self._loaded else 0,
+            "version": self._version,
+            "uncompacted_mutations": self._version - self._compacted_version,
+        }
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the snapshot has been read into memory."""
+        return self._loaded
+
+    @property
+    def version(self) -> int:
+        """Monotonic counter incremented on every mutation."""
+        return self._version
+
+    def list_items(self) -> List[Dict[str, Any]]:
+        """Return a shallow copy of all records in positional order."""
+        self.load()
+        with self._lock:
+            return list(self._records)
+
+    def slice(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """Return the records in positions ``[start, stop)``."""
+        self.load()
+        with self._lock:
+            return self._records[start:stop]
+
+    def frame(self) -> pd.DataFrame:
+        """Return a columnar copy of the records.
+
+        The DataFrame is rebuilt lazily after mutations and shared between
+        callers until the next one, so it must not be modified.
+        """
+        self.load()
+        with self._lock:
+            cached = self._frame
+            if cached is not None and cached[0] == self._version:
+                return cached[1]
+            version = self._version
+            snapshot = list(self._records)
+        frame = to_columnar(snapshot)
+        with self._lock:
+            if self._frame is None or self._frame[0] < version:
+                self._frame = (version, frame)
+        return frame
+
+    def get(self, item_id: int) -> Optional[Dict[str, Any]]:
+        """Return the record at ``item_id`` or ``None``."""
+        self.load()
+        with self._lock:
+            if 0 <= item_id < len(self._records):
+                return self._records[item_id]
+            return None
+
+    def find_by_item(self, item: str) -> List[Dict[str, Any]]:
+        """Return all records whose ``Item`` equals ``item``."""
+        self.load()
+        with self._lock:
+            return list(self._by_item.get(item, ()))
+
+    def find_by_category(self, category: str) -> List[Dict[str, Any]]:
+        """Return all records whose ``Product Category`` equals ``category``."""
+        self.load()
+        with self._lock:
+            return list(self._by_category.get(category, ()))
+
+    def categories(self) -> List[Any]:
+        """Return the distinct product categories currently indexed."""
+        self.load()
+        with self._lock:
+            return list(self._by_category)
+
+    def views(self) -> Dict[str, str]:
+        """Return the description of every materialized view by name."""
+        return {name: view.definition.description for name, view in self._views.items()}
+
+    def view(self, name: str) -> List[Dict[str, Any]]:
+        """Return the records of the materialized view ``name``.
+
+        Raises:
+            ValueError: If there is no such view.
+        """
+        self.load()
+        with self._lock:
+            if name not in self._views:
+                raise ValueError(f"Unknown view {name!r}; available: {', '.join(self._views)}")
+            return self._views[name].items()
+
+    def check_views(self, repair: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Compare every view with a full recompute over the records.
+
+        Views only see records added, replaced or removed through the
+        store; a record changed in place goes unnoticed until this check.
+
+        Args:
+            repair: Rebuild the views found inconsistent.
+
+        Returns:
+            The outcome of :meth:`MaterializedView.check` per view name.
+        """
+        self.load()
+        with self._lock:
+            report = {}
+            for name, view in self._views.items():
+                report[name] = view.check(self._records)
+                if repair and not report[name]["consistent"]:
+                    view.rebuild(self._records)
+                    logger.warning(f"Rebuilt inconsistent inventory view {name}")
+        return report
+
+    # ------------------------------------------------------------- mutations
+
+    def add(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Append ``item`` and return it."""
+        self.load()
+        with self._lock:
+            self._commit({"op": "add", "item": item})
+            self._records.append(item)
+            self._index(item)
+        return item
+
+    def update(self, item_id: int, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Replace the record at ``item_id``; return ``None`` if out of range."""
+        self.load()
+        with self._lock:
+            if not 0 <= item_id < len(self._records):
+                return None
+            self._commit({"op": "update", "id": item_id, "item": item})
+            self._unindex(self._records[item_id])
+            self._records[item_id] = item
+            self._index(item)
+        return item
+
+    def delete(self, item_id: int) -> Optional[Dict[str, Any]]:
+        """Remove and return the record at ``item_id``; ``None`` if out of range."""
+        self.load()
+        with self._lock:
+            if not 0 <= item_id < len(self._records):
+                return None
+            self._commit({"op": "delete", "id": item_id})
+            removed = self._records.pop(item_id)
+            self._unindex(removed)
+        return removed
+
+    def apply_batch(self, operations: List[Mutation]) -> List[Tuple[int, Dict[str, Any]]]:
+        """Apply ``operations`` in order as one logged mutation.
+
+        Each operation is ``{"op": "add", "item": ...}``, ``{"op": "update",
+        "id": ..., "item": ...}`` or ``{"op": "delete", "id": ...}``; ids refer
+        to positions after the preceding operations of the batch. Either every
+        operation is applied or, if any of them is invalid, none is.
+
+        Returns:
+            Per operation, its position and the added or updated item or
+            the deleted record.
+
+        Raises:
+            BatchValidationError: With the reason of every invalid operation.
+        """
+        self.load()
+        with self._lock:
+            errors = _validate_batch(operations, len(self._records))
+            if errors:
+                raise BatchValidationError(errors)
+            self._commit({"op": "batch", "ops": operations})
+            results: List[Tuple[int, Dict[str, Any]]] = []
+            for operation in operations:
+                op = operation["op"]
+                if op == "add":
+                    self._records.append(operation["item"])
+                    self._index(operation["item"])
+                    results.append((len(self._records) - 1, operation["item"]))
+                elif op == "update":
+                    self._unindex(self._records[operation["id"]])
+                    self._records[operation["id"]] = operation["item"]
+                    self._index(operation["item"])
+                    results.append((operation["id"], operation["item"]))
+                else:
+                    removed = self._records.pop(operation["id"])
+                    self._unindex(removed)
+                    results.append((operation["id"], removed))
+        return results
+
+    # ----------------------------------------------------------- persistence
+
+    def _commit(self, mutation: Mutation) -> None:
+        """Log ``mutation``; the caller holds the lock and applies it after.
+
+        Raises:
+            PermissionError: If the store is read-only.
+        """
+        if self.read_only:
+            raise PermissionError(
+                "The inventory store is read-only (INVENTORY_READ_ONLY=true); "
+                "mutations are disabled"
+            )
+        # A no-op unless close() released the lock before this mutation.
+        self._log.acquire()
+        if not self._log.stamped:
+            # Recovery can only match segments to a snapshot that records its
+            # generation, so stamp a seed file before logging on top of it.
+            self._log.write_snapshot(list(self._records), self._log.rotate())
+        self._log.append(mutation)
+        self._version += 1
+        if self._log.segment_records >= self.compact_threshold:
+            self._compact_requested.set()
+        self._ensure_writer()
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None and self._writer.is_alive():
+            return
+        self._stopped.clear()
+        self._writer = threading.Thread(
+            target=self._writer_loop, name="inventory-store-writer", daemon=True
+        )
+        self._writer.start()
+
+    def _writer_loop(self) -> None:
+        while not self._stopped.wait(self.fsync_interval):
+            try:
+                self._log.sync()
+                if self._compact_requested.is_set():
+                    self.compact()
+            except OSError as e:
+                logger.error(f"Failed to persist inventory to {self.data_file}: {e}")
+
+    def flush(self) -> None:
+        """Make every logged mutation durable."""
+        self._log.sync()
+
+    def compact(self) -> None:
+        """Write the current state as a snapshot and truncate the log."""
+        with self._compact_lock:
+            self._compact_requested.clear()
+            with self._lock:
+                if self._version == self._compacted_version:
+                    return
+                version = self._version
+                snapshot = list(self._records)
+                generation = self._log.rotate()
+            # Records are replaced, never mutated in place, so the shallow copy
+            # stays consistent while it is serialized outside the lock.
+            self._log.write_snapshot(snapshot, generation)
+            self._compacted_version = version
+
+    def close(self) -> None:
+        """Stop the background writer, compact and close the log."""
+        self._stopped.set()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        if self._loaded:
+            if not self.read_only:
+                self.compact()
+            self._log.close()
+
+
+@lru_cache
+def get_inventory_store() -> InventoryStore:
+    """Return the process-wide inventory store."""
+    store = InventoryStore(
+        settings.inventory_data_file or DATA_FILE,
+        fsync_interval=settings.inventory_fsync_interval,
+        compact_threshold=settings.inventory_compact_threshold,
+        read_only=settings.inventory_read_only,
+    )
+    atexit.register(store.close)
+    return store
@@ -1,22 +1,131 @@
+import hashlib
 import os
-from typing import Any, Dict, Union
+import pickle
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
 import json
 import pandas as pd
 
 from src.tools.meta.base import BaseTool
-from src.schemas.inventory import NoInput  # You'll define this schema (empty model)
+from src.schemas.inventory import ListInventoryInput
 from src.core.logger import logger
+from src.core.request_log import log_event
+from src.utils.blocking_io import run_blocking
+from src.utils.pagination import paginate, stream_records
+from src.utils.tracing import tracer
 
 # Define the absolute path to the Excel file
 INVENTORY_FILE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'inventory.xlsx')
 
+SIDECAR_SUFFIX = ".cache.pkl"
 
-def load_inventory():
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExcelInventoryCache:
+    """Parse an Excel workbook once and serve it from memory.
+
+    The parsed DataFrame is kept in memory keyed on the file's mtime and
+    size, and mirrored to a pickled sidecar next to the workbook so a cold
+    process skips openpyxl entirely. When mtime or size change, the file's
+    SHA-256 is compared with the one recorded in the sidecar and the workbook
+    is only re-parsed if its content really changed.
+
+    The returned DataFrame is shared between callers and must not be mutated.
+
+    Args:
+        path: Path of the Excel workbook.
+        sidecar_path: Where to store the parsed copy; defaults to
+            ``path + ".cache.pkl"``.
+    """
+
+    def __init__(self, path: str, sidecar_path: Optional[str] = None) -> None:
+        self.path = path
+        self.sidecar_path = sidecar_path or f"{path}{SIDECAR_SUFFIX}"
+        self._lock = threading.Lock()
+        self._key: Optional[Tuple[int, int]] = None
+        self._digest = ""
+        self._frame: Optional[pd.DataFrame] = None
+
+    def load(self) -> pd.DataFrame:
+        """Return the workbook contents, parsing it only when it changed."""
+        stat = os.stat(self.path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if self._frame is not None and self._key == key:
+                return self._frame
+            with tracer.start_as_current_span(
+                "excel.load", attributes={"file.path": self.path}
+            ) as span:
+                if self._frame is None:
+                    self._load_sidecar()
+                if self._frame is not None and self._key == key:
+                    span.set_attribute("excel.source", "sidecar")
+                    return self._frame
+
+                digest = _file_digest(self.path)
+                if self._frame is None or digest != self._digest:
+                    self._frame = pd.read_excel(self.path)
+                    span.set_attribute("excel.source", "workbook")
+                    logger.info(f"Parsed Excel workbook {self.path}")
+                else:
+                    span.set_attribute("excel.source", "unchanged")
+                self._key, self._digest = key, digest
+                self._write_sidecar()
+                return self._frame
+
+    @property
+    def digest(self) -> str:
+        """SHA-256 of the workbook last returned by :meth:`load`."""
+        return self._digest
+
+    def _load_sidecar(self) -> None:
+        try:
+            with open(self.sidecar_path, "rb") as f:
+                cached = pickle.load(f)
+            self._key = (cached["mtime_ns"], cached["size"])
+            self._digest = cached["sha256"]
+            self._frame = cached["frame"]
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError, TypeError) as e:
+            logger.info(f"No usable Excel sidecar at {self.sidecar_path}: {e}")
+            self._key, self._digest, self._frame = None, "", None
+
+    def _write_sidecar(self) -> None:
+        assert self._key is not None
+        cached = {
+            "mtime_ns": self._key[0],
+            "size": self._key[1],
+            "sha256": self._digest,
+            "frame": self._frame,
+        }
+        tmp_path = f"{self.sidecar_path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.sidecar_path)
+        except OSError as e:
+            # The in-memory copy still works; only cold starts get slower.
+            logger.warning(f"Could not write Excel sidecar {self.sidecar_path}: {e}")
+
+
+_inventory_cache = ExcelInventoryCache(INVENTORY_FILE_PATH)
+
+
+def inventory_version() -> str:
+    """Return the SHA-256 of the workbook last returned by :func:`load_inventory`."""
+    return _inventory_cache.digest
+
+
+def load_inventory() -> pd.DataFrame:
     """Load inventory data from the Excel file."""
     try:
-        # Read the Excel file into a DataFrame
-        df = pd.read_excel(INVENTORY_FILE_PATH)
-        logger.info("Inventory data loaded successfully.")
+        df = _inventory_cache.load()
         return df
     except FileNotFoundError:
         logger.error(f"File not found: {INVENTORY_FILE_PATH}")
@@ -25,25 +134,51 @@ def load_inventory():
         logger.error(f"Error loading inventory data: {str(e)}")
         raise
 
-class LoadInventoryTool(BaseTool[NoInput]):
+class LoadInventoryTool(BaseTool[ListInventoryInput]):
     @property
     def name(self) -> str:
         return "load_inventory"
 
     @property
     def description(self) -> str:
-        return "Loads the inventory data from the Excel file."
+        return "Loads the inventory data from the Excel file, one page at a time."
 
     @property
     def input_schema(self) -> Dict[str, Any]:
-        return {"type": "object", "properties": {}, "required": []}
+        schema = ListInventoryInput.model_json_schema()
+        return {
+            "type": "object",
+            "properties": schema.get("properties", {}),
+            "required": schema.get("required", []),
+        }
 
-    async def execute(self, input_data: NoInput, *args: Any) -> Any:
+    async def execute(
+        self, input_data: Union[ListInventoryInput, Dict[str, Any]], *args: Any
+    ) -> Any:
+        if not isinstance(input_data, ListInventoryInput):
+            input_data = ListInventoryInput.model_validate(input_data)
         try:
-            df = load_inventory()
-            result = df.to_dict(orient="records")
-            logger.info("Execute- Loaded inventory data from Excel")
-            return json.dumps({"function": self.name, "data": result})
+            # Excel parsing blocks; keep it off the loop.
+            df = await run_blocking(load_inventory)
+
+            # Only the requested rows are converted to records.
+            def fetch(start: int, stop: int) -> List[Dict[str, Any]]:
+                return df.iloc[start:stop].to_dict(orient="records")
+
+            args = (
+                fetch,
+                len(df),
+                self.name,
+                input_data.limit,
+                input_data.cursor,
+                inventory_version(),
+            )
+            if input_data.stream:
+                result = await stream_records(*args)
+            else:
+                result = paginate(*args)
+            log_event("inventory.page", items=len(result["items"]), total=result["total"])
+            return json.dumps({"function": self.name, "data": result.pop("items"), **result})
         except Exception as e:
             logger.error(f"Execution error: {str(e)}")
             raise
@@ -0,0 +1,129 @@
+"""Materialized views over the inventory store.
+
+A view holds the records that match one flag column of the dataset, such as
+``Overstock == "Yes"``. :class:`InventoryStore` keeps every view up to date
+next to its secondary indexes: each add, update or delete checks only the
+records it touches, so reading a view costs O(view size) instead of a scan
+of the whole inventory.
+
+Members are keyed on record identity, like the index buckets, and listed in
+the order they entered the view: an updated record moves to the end.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List
+
+
+@dataclass(frozen=True)
+class ViewDefinition:
+    """Records whose ``column`` equals ``value``."""
+
+    name: str
+    description: str
+    column: str
+    value: Any = "Yes"
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        """Whether ``record`` belongs to the view."""
+        return record.get(self.column) == self.value
+
+
+VIEWS = (
+    ViewDefinition(
+        "promotion_candidates",
+        "Items recommended for promotion",
+        "Recommended for Promotion",
+    ),
+    ViewDefinition("overstock", "Overstocked items", "Overstock"),
+    ViewDefinition("high_dsi", "Items with high days sales of inventory", "High DSI"),
+    ViewDefinition(
+        "seasonal_high_demand",
+        "Items in their season of high demand",
+        "Seasonal High Demand",
+    ),
+)
+
+
+class MaterializedView:
+    """The current members of one :class:`ViewDefinition`.
+
+    Not thread-safe; the store calls it under its lock.
+    """
+
+    def __init__(self, definition: ViewDefinition) -> None:
+        self.definition = definition
+        self._members: Dict[int, Dict[str, Any]] = {}
+        # Extra positions of records held more than once, by id(record).
+        self._repeats: Counter[int] = Counter()
+
+    @property
+    def name(self) -> str:
+        return self.definition.name
+
+    def __len__(self) -> int:
+        return len(self._members) + self._repeats.total()
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """Account for ``record`` entering the inventory."""
+        if not self.definition.matches(record):
+            return
+        key = id(record)
+        if key in self._members:
+            self._repeats[key] += 1
+        else:
+            self._members[key] = record
+
+    def remove(self, record: Dict[str, Any]) -> None:
+        """Account for ``record`` leaving the inventory."""
+        key = id(record)
+        if self._repeats[key]:
+            self._repeats[key] -= 1
+            if not self._repeats[key]:
+                del self._repeats[key]
+        else:
+            self._members.pop(key, None)
+
+    def rebuild(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Recompute the members from ``records``."""
+        self._members = {}
+        self._repeats = Counter()
+        for record in records:
+            self.add(record)
+
+    def items(self) -> List[Dict[str, Any]]:
+        """Return the member records."""
+        if not self._repeats:
+            return list(self._members.values())
+        return [
+            record
+            for key, record in self._members.items()
+            for _ in range(1 + self._repeats[key])
+        ]
+
+    def check(self, records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Compare the members with a full recompute over ``records``.
+
+        Returns:
+            The view size, the recomputed size, the number of records
+            missing from the view and of those that should not be in it.
+        """
+        expected: Counter[int] = Counter(
+            id(record) for record in records if self.definition.matches(record)
+        )
+        actual = Counter(self._members.keys()) + self._repeats
+        missing = (expected - actual).total()
+        unexpected = (actual - expected).total()
+        return {
+            "size": len(self),
+            "expected": expected.total(),
+            "missing": missing,
+            "unexpected": unexpected,
+            "consistent": not missing and not unexpected,
+        }
+
+
+def build_views(definitions: Iterable[ViewDefinition]) -> Dict[str, MaterializedView]:
+    """Return an empty view per definition, keyed by name."""
+    return {definition.name: MaterializedView(definition) for definition in definitions}
+
@@ -0,0 +1,341 @@
+"""Append-only mutation log for the inventory store.
+
+Mutations are appended as one compact JSON line per operation to a log
+segment next to the snapshot file (``<data_file>.wal.<generation>``) and
+fsynced in batches. Compaction writes the in-memory state as a new snapshot
+and starts a fresh segment, so write cost no longer depends on the size of
+the inventory.
+
+A snapshot written by the log is a JSON object holding the records, the
+first segment generation that has to be replayed on top of them and the
+SHA-256 of the serialized records::
+
+    {"generation": 3, "records_sha256": "...", "records": [...]}
+
+The snapshot is replaced atomically, so it always describes itself and
+recovery replays exactly the segments from its generation onwards. A plain
+JSON list, such as the bundled dataset, is a seed: the store stamps it into
+a snapshot before the first segment is written on top of it. Recovery
+refuses to replay segments over a seed or over a snapshot whose records no
+longer match their hash (for example a hand-edited or swapped data file),
+because positional updates and deletes would then hit the wrong records.
+
+Only one process may write: the writer holds an exclusive ``flock`` on
+``<data_file>.lock`` (see :meth:`MutationLog.acquire`) for as long as it has
+the log open.
+"""
+
+import fcntl
+import glob
+import hashlib
+import json
+import os
+import threading
+from typing import IO, Any, Dict, List, Optional, Tuple
+
+from src.core.logger import logger
+
+Mutation = Dict[str, Any]
+
+
+class LogLockedError(RuntimeError):
+    """Another process is writing to the same inventory log."""
+
+
+class SnapshotMismatchError(RuntimeError):
+    """The data file does not match the mutation log next to it."""
+
+
+def apply_mutation(records: List[Dict[str, Any]], mutation: Mutation) -> None:
+    """Apply a logged mutation to ``records`` in place.
+
+    Args:
+        records: The inventory records in positional order.
+        mutation: A mutation as written by :meth:`MutationLog.append`.
+
+    Raises:
+        ValueError: If the mutation has an unknown ``op``.
+    """
+    op = mutation.get("op")
+    if op == "batch":
+        # One log line, so a crash keeps either all or none of the batch.
+        for inner in mutation["ops"]:
+            apply_mutation(records, inner)
+    elif op == "add":
+        records.append(mutation["item"])
+    elif op == "update":
+        records[mutation["id"]] = mutation["item"]
+    elif op == "delete":
+        del records[mutation["id"]]
+    else:
+        raise ValueError(f"Unknown inventory mutation: {op!r}")
+
+
+def _serialize_records(records: List[Dict[str, Any]]) -> str:
+    return json.dumps(records, separators=(",", ":"))
+
+
+def _fsync_replace(path: str, payload: bytes) -> None:
+    """Durably replace ``path`` with ``payload``."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(os.path.dirname(path) or ".")
+
+
+def _fsync_dir(path: str) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:  # pragma: no cover - platforms without directory fds
+        return
+    try:
+        os.fsync(fd)
+    except OSError:  # pragma: no cover
+        pass
+    finally:
+        os.close(fd)
+
+
+class MutationLog:
+    """Segmented, fsync-batched write-ahead log beside a JSON snapshot.
+
+    Args:
+        data_file: Path of the JSON snapshot.
+    """
+
+    def __init__(self, data_file: str) -> None:
+        self.data_file = data_file
+        self.lock_file = f"{data_file}.lock"
+        self._lock = threading.Lock()
+        self._writer_lock: Optional[IO[bytes]] = None
+        self._generation = 0
+        self._stamped = False
+        self._segment: Optional[IO[bytes]] = None
+        self._segment_records = 0
+        self._unsynced = False
+
+    # ----------------------------------------------------------- writer lock
+
+    def acquire(self) -> None:
+        """Become the only process writing to this log.
+
+        The lock is released by :meth:`close`, or by the kernel when the
+        process dies.
+
+        Raises:
+            LogLockedError: If another process holds it.
+        """
+        if self._writer_lock is not None:
+            return
+        lock = open(self.lock_file, "ab")  # pylint: disable=consider-using-with
+        try:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError as e:
+            lock.close()
+            raise LogLockedError(
+                f"{self.data_file} is being written by another process"
+            ) from e
+        self._writer_lock = lock
+
+    # -------------------------------------------------------------- recovery
+
+    def segment_path(self, generation: int) -> str:
+        """Return the path of the segment for ``generation``."""
+        return f"{self.data_file}.wal.{generation}"
+
+    def _segments(self) -> List[Tuple[int, str]]:
+        segments = []
+        for path in glob.glob(glob.escape(self.data_file) + ".wal.*"):
+            suffix = path.rsplit(".", 1)[-1]
+            if suffix.isdigit():
+                segments.append((int(suffix), path))
+        return sorted(segments)
+
+    def _read_snapshot(self) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Return the snapshot records and the generation they were stamped with.
+
+        The generation is None for a seed, a missing or undecodable file and
+        a snapshot whose records do not match their hash.
+        """
+        if not os.path.exists(self.data_file):
+            logger.warning(f"Data file {self.data_file} does not exist.")
+            return [], None
+        try:
+            with open(self.data_file, "rb") as f:
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            logger.error(f"Error decoding JSON from {self.data_file}: {e}")
+            return [], None
+        if isinstance(data, list):
+            return data, None
+        if not isinstance(data, dict) or not isinstance(data.get("records"), list):
+            logger.error(f"Unrecognized inventory snapshot in {self.data_file}")
+            return [], None
+        records = data["records"]
+        digest = hashlib.sha256(_serialize_records(records).encode("utf-8")).hexdigest()
+        if digest != data.get("records_sha256"):
+            logger.warning(f"{self.data_file} was modified outside the inventory store")
+            return records, None
+        return records, int(data.get("generation", 0))
+
+    def _replay_segment(self, path: str, records: List[Dict[str, Any]]) -> int:
+        applied = 0
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    mutation = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-append; nothing after
+                    # it can have been acknowledged as durable.
+                    logger.warning(f"Ignoring truncated record in {path}")
+                    break
+                apply_mutation(records, mutation)
+                applied += 1
+        return applied
+
+    def recover(self) -> Tuple[List[Dict[str, Any]], int]:
+        """Load the snapshot and replay the log segments it does not contain.
+
+        Never writes to disk, so read-only stores can call it next to a
+        writer.
+
+        Returns:
+            The recovered records and the number of replayed mutations.
+
+        Raises:
+            SnapshotMismatchError: If non-empty segments exist but the data
+                file is not a snapshot stamped by this log, so there is no
+                way to tell which of them it already contains.
+        """
+        records, first = self._read_snapshot()
+        segments = self._segments()
+        self._stamped = first is not None
+        if first is None:
+            pending = [path for _, path in segments if os.path.getsize(path)]
+            if pending:
+                raise SnapshotMismatchError(
+                    f"{self.data_file} is not the snapshot the mutation log "
+                    f"{', '.join(pending)} was written against; restore the data "
+                    "file or move the log segments away before starting"
+                )
+            to_replay = []
+        else:
+            # Older segments are leftovers of a compaction that replaced the
+            # snapshot but did not get to delete them.
+            to_replay = [path for gen, path in segments if gen >= first]
+
+        replayed = sum(self._replay_segment(path, records) for path in to_replay)
+        self._generation = max(segments[-1][0] if segments else 0, (first or 1) - 1)
+        if replayed:
+            logger.info(f"Replayed {replayed} inventory mutations from the log")
+        return records, replayed
+
+    # ------------------------------------------------------------- appending
+
+    @property
+    def stamped(self) -> bool:
+        """Whether the data file is a snapshot written by :meth:`write_snapshot`.
+
+        Segments may only be appended on top of a stamped snapshot; see
+        :meth:`recover`.
+        """
+        return self._stamped
+
+    @property
+    def segment_records(self) -> int:
+        """Number of mutations appended to the active segment."""
+        return self._segment_records
+
+    def append(self, mutation: Mutation) -> None:
+        """Append ``mutation`` to the active segment.
+
+        The record reaches the OS page cache before this returns, so it
+        survives a process crash; :meth:`sync` makes it durable on disk.
+        """
+        line = json.dumps(mutation, separators=(",", ":")).encode("utf-8") + b"\n"
+        with self._lock:
+            if self._segment is None:
+                self._open_segment(self._generation + 1)
+            assert self._segment is not None
+            self._segment.write(line)
+            self._segment.flush()
+            self._segment_records += 1
+            self._unsynced = True
+
+    def _open_segment(self, generation: int) -> None:
+        self._generation = generation
+        self._segment = open(  # pylint: disable=consider-using-with
+            self.segment_path(generation), "ab"
+        )
+        self._segment_records = 0
+
+    def sync(self) -> None:
+        """fsync everything appended so far (group commit)."""
+        with self._lock:
+            if self._segment is None or not self._unsynced:
+                return
+            os.fsync(self._segment.fileno())
+            self._unsynced = False
+
+    def rotate(self) -> int:
+        """Seal the active segment and start a new one.
+
+        Must be called while the caller holds the lock protecting the
+        in-memory state, so the snapshot taken at the same time corresponds
+        exactly to the sealed segments.
+
+        Returns:
+            The generation of the new segment; a snapshot of the state at
+            rotation time needs segments from this generation replayed.
+        """
+        with self._lock:
+            if self._segment is not None:
+                self._segment.flush()
+                os.fsync(self._segment.fileno())
+                self._segment.close()
+                self._segment = None
+            self._unsynced = False
+            self._open_segment(self._generation + 1)
+            return self._generation
+
+    def write_snapshot(self, records: List[Dict[str, Any]], generation: int) -> None:
+        """Persist ``records`` as the snapshot and drop obsolete segments.
+
+        Args:
+            records: State captured at the :meth:`rotate` that returned
+                ``generation``.
+            generation: First segment generation not contained in ``records``.
+        """
+        serialized = _serialize_records(records)
+        digest = hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+        payload = (
+            f'{{"generation":{generation},"records_sha256":"{digest}",'
+            f'"records":{serialized}}}'
+        )
+        _fsync_replace(self.data_file, payload.encode("utf-8"))
+        self._stamped = True
+        for gen, path in self._segments():
+            if gen < generation:
+                os.remove(path)
+        logger.info(f"Inventory snapshot written to {self.data_file}.")
+
+    def close(self) -> None:
+        """Sync and close the active segment, removing it if it is empty.
+
+        Also releases the writer lock.
+        """
+        with self._lock:
+            if self._segment is not None:
+                self._segment.flush()
+                os.fsync(self._segment.fileno())
+                self._segment.close()
+                self._segment = None
+                if self._segment_records == 0:
+                    os.remove(self.segment_path(self._generation))
+            self._unsynced = False
+            if self._writer_lock is not None:
+                self._writer_lock.close()
+                self._writer_lock = None
@@ -1,58 +1,209 @@
-import json
-from typing import Any, Dict, List
+"""Retail analytics over the columnar copy of the inventory store.
 
-from src.core.logger import logger
-from src.schemas.inventory import NoInput
+Every tool derives its result from :meth:`InventoryStore.frame` with
+vectorized pandas expressions, once per store version, and serves it a page
+at a time. Between mutations, paging through a result only slices it.
+"""
 
+from abc import abstractmethod
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-class LoadInventoryTool:
-    async def execute(self, _: NoInput) -> List[Dict[str, str]]:
-        with open("data/retails-mockdata.json", "r") as f:
-            inventory = json.load(f)
-        logger.info("Loaded inventory data from JSON")
-        return inventory
+import numpy as np
+import pandas as pd
 
+from src.core.request_log import log_event
+from src.schemas.inventory import RetailAnalyticsInput
+from src.tools.impl.inventory_store import (
+    CATEGORY_KEY,
+    ITEM_KEY,
+    InventoryStore,
+    get_inventory_store,
+)
+from src.tools.meta.base import BaseTool
+from src.utils.blocking_io import run_blocking
+from src.utils.pagination import paginate
 
-class ForecastedDemandTool:
-    async def execute(self, _: NoInput) -> List[Dict[str, str]]:
-        with open("data/retails-mockdata.json", "r") as f:
-            inventory = json.load(f)
-        logger.info("Calculating forecasted demand")
-        return [
+WAREHOUSES = ("WH1", "WH2", "WH3")
+ON_HAND_COLUMNS = [f"On hand Inventory {wh}" for wh in WAREHOUSES]
+EXPECTED_COLUMNS = [f"Expected Inventory {wh}" for wh in WAREHOUSES]
+DEMAND_KEY = "Forecasted Demand"
+PROMOTION_KEY = "Recommended for Promotion"
+
+
+def _numeric(frame: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """Return ``columns`` as numbers; missing columns and bad cells are NaN."""
+    return frame.reindex(columns=columns).apply(pd.to_numeric, errors="coerce")
+
+
+def _text(frame: pd.DataFrame, column: str) -> pd.Series:
+    return frame[column] if column in frame.columns else pd.Series(None, index=frame.index)
+
+
+def _identity(frame: pd.DataFrame) -> Dict[str, Any]:
+    """Columns shared by every result: position, item name and category."""
+    return {
+        "item_id": frame.index.to_numpy(),
+        "item": _text(frame, ITEM_KEY),
+        "category": _text(frame, CATEGORY_KEY),
+    }
+
+
+def _records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    # Missing cells become None so the result is valid JSON.
+    return frame.astype(object).where(frame.notna(), None).to_dict(orient="records")
+
+
+class RetailAnalyticsTool(BaseTool[RetailAnalyticsInput]):
+    """Base class of the analytics tools.
+
+    Subclasses implement :meth:`compute`. Its result is cached per store
+    version, so the frame is scanned once per mutation rather than once per
+    call.
+
+    Args:
+        store: Inventory store to analyse; the process-wide one by default.
+    """
+
+    def __init__(self, store: Optional[InventoryStore] = None) -> None:
+        self.store = store if store is not None else get_inventory_store()
+        self._result: Optional[Tuple[int, pd.DataFrame]] = None
+
+    @abstractmethod
+    def compute(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Derive this tool's rows from the inventory frame."""
+
+    @property
+    def input_schema(self) -> Dict[str, Any]:
+        return RetailAnalyticsInput.model_json_schema()
+
+    def result(self) -> pd.DataFrame:
+        """Return the rows for the current store version."""
+        self.store.load()
+        # Read before the frame: a concurrent mutation then only makes the
+        # cached entry look older than it is.
+        version = self.store.version
+        cached = self._result
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        result = self.compute(self.store.frame())
+        self._result = (version, result)
+        return result
+
+    def _page(self, query: RetailAnalyticsInput) -> Dict[str, Any]:
+        self.store.load()
+        version = self.store.version
+        result = self.result()
+        if query.category is not None:
+            result = result[(result["category"] == query.category).to_numpy()]
+        return paginate(
+            lambda start, stop: _records(result.iloc[start:stop]),
+            len(result),
+            self.name,
+            query.limit,
+            query.cursor,
+            version,
+        )
+
+    async def execute(
+        self, input_data: Union[RetailAnalyticsInput, Dict[str, Any]], *args: Any
+    ) -> Any:
+        if not isinstance(input_data, RetailAnalyticsInput):
+            input_data = RetailAnalyticsInput.model_validate(input_data)
+        page = await run_blocking(self._page, input_data)
+        log_event(f"retail.{self.name}", items=len(page["items"]), total=page["total"])
+        return page
+
+
+class ForecastedDemandTool(RetailAnalyticsTool):
+    """Forecasted demand against the stock on hand across the warehouses."""
+
+    @property
+    def name(self) -> str:
+        return "forecasted_demand"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Forecasted demand per item with the total on-hand inventory of "
+            "WH1-WH3 and the shortfall (demand not covered by stock on hand)."
+        )
+
+    def compute(self, frame: pd.DataFrame) -> pd.DataFrame:
+        on_hand = _numeric(frame, ON_HAND_COLUMNS).sum(axis=1, min_count=1)
+        demand = _numeric(frame, [DEMAND_KEY])[DEMAND_KEY]
+        return pd.DataFrame(
             {
-                "product_id": item["product_id"],
-                "location": item["location"],
-                "forecasted_demand": str(item["forecasted_demand"])
-            }
-            for item in inventory
-        ]
-
-
-class ExpectedInventoryTool:
-    async def execute(self, _: NoInput) -> List[Dict[str, str]]:
-        with open("data/retails-mockdata.json", "r") as f:
-            inventory = json.load(f)
-        logger.info("Calculating expected inventory")
-        return [
+                **_identity(frame),
+                "forecasted_demand": demand,
+                "on_hand_inventory": on_hand,
+                "shortfall": (demand - on_hand).clip(lower=0),
+            },
+            index=frame.index,
+        )
+
+
+class ExpectedInventoryTool(RetailAnalyticsTool):
+    """Expected inventory per warehouse and the balance left after demand."""
+
+    @property
+    def name(self) -> str:
+        return "expected_inventory"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Expected inventory per item for WH1-WH3, its total, the "
+            "forecasted demand and the projected balance (expected total "
+            "minus demand; negative means a stock-out is expected)."
+        )
+
+    def compute(self, frame: pd.DataFrame) -> pd.DataFrame:
+        expected = _numeric(frame, EXPECTED_COLUMNS)
+        total = expected.sum(axis=1, min_count=1)
+        demand = _numeric(frame, [DEMAND_KEY])[DEMAND_KEY]
+        return pd.DataFrame(
             {
-                "product_id": item["product_id"],
-                "location": item["location"],
-                "expected_inventory": str(item["current_inventory"] - item["forecasted_demand"])
-            }
-            for item in inventory
-        ]
-
-
-class PromotionCandidateTool:
-    async def execute(self, _: NoInput) -> List[Dict[str, str]]:
-        with open("data/retails-mockdata.json", "r") as f:
-            inventory = json.load(f)
-        logger.info("Identifying promotion candidates")
-        return [
+                **_identity(frame),
+                **{
+                    f"expected_{wh.lower()}": expected[column]
+                    for wh, column in zip(WAREHOUSES, EXPECTED_COLUMNS)
+                },
+                "expected_inventory": total,
+                "forecasted_demand": demand,
+                "projected_balance": total - demand,
+            },
+            index=frame.index,
+        )
+
+
+class PromotionCandidateTool(RetailAnalyticsTool):
+    """Items recommended for promotion, with their discount."""
+
+    @property
+    def name(self) -> str:
+        return "promotion_candidates"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Items whose 'Recommended for Promotion' flag is Yes, with regular "
+            "and promotional price, the discount in percent and the overstock "
+            "and supplier deal flags that support the recommendation."
+        )
+
+    def compute(self, frame: pd.DataFrame) -> pd.DataFrame:
+        candidates = frame[(_text(frame, PROMOTION_KEY) == "Yes").to_numpy()]
+        prices = _numeric(candidates, ["Reg Price", "Promotional Price"])
+        regular = prices["Reg Price"]
+        discount = (regular - prices["Promotional Price"]) / regular.where(regular > 0)
+        return pd.DataFrame(
             {
-                "product_id": item["product_id"],
-                "location": item["location"],
-                "promotion_candidate": "Yes" if item.get("promotion_flag", False) else "No"
-            }
-            for item in inventory
-        ]
+                **_identity(candidates),
+                "reg_price": regular,
+                "promotional_price": prices["Promotional Price"],
+                "discount_pct": np.round(discount * 100, 1),
+                "overstock": _text(candidates, "Overstock"),
+                "supplier_deal": _text(candidates, "Supplier Deal"),
+            },
+            index=candidates.index,
+        )
@@ -5,7 +5,12 @@ to be compatible with the MCP server.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, TypeVar, Union, Generic
+from typing import Dict, Any, Optional, TypeVar, Union, Generic
+
+from pydantic import BaseModel
+
+from src.core.config import settings
+from src.tools.meta.response_cache import ResponseCache, make_cache_key
 
 T = TypeVar("T")
 
@@ -19,8 +24,14 @@ class BaseTool(Generic[T], ABC):
     Args:
         Generic[T]: Enables the class to work with any input type T
         ABC: Marks this class as an abstract base class
+
+    Attributes:
+        response_cache: Set on a subclass to cache its results; shared by
+            all instances of that tool. ``None`` (the default) disables it.
     """
 
+    response_cache: Optional[ResponseCache[Any]] = None
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -40,6 +51,29 @@ class BaseTool(Generic[T], ABC):
     async def execute(self, input_data: Union[T, Dict[str, Any]], *args: Any) -> Any:
         """Execute the tool with the given input."""
 
+    def cache_key(
+        self, input_data: Union[T, Dict[str, Any]], request_headers: Dict[str, str]
+    ) -> str:
+        """Return the response cache key for a call to this tool.
+
+        Raises:
+            TypeError: If ``input_data`` is neither a model nor a dict.
+        """
+        data: Dict[str, Any]
+        if isinstance(input_data, BaseModel):
+            data = input_data.model_dump()
+        elif isinstance(input_data, dict):
+            data = input_data
+        else:
+            raise TypeError(f"{self.name} takes a model or a dict, not {type(input_data)}")
+        return make_cache_key(
+            self.name, data, request_headers, settings.enterprise_llm_headers
+        )
+
+    def is_cacheable(self, result: Any) -> bool:  # pylint: disable=unused-argument
+        """Return whether ``result`` may be stored in the response cache."""
+        return True
+
     def to_mcp_schema(self) -> Dict[str, Any]:
         """Convert the tool to MCP schema format."""
         return {
@@ -0,0 +1,212 @@
+"""Per-tool concurrency limits (bulkheads).
+
+A tool declared with :func:`bulkhead` runs at most ``max_concurrent`` calls
+at once. Up to ``max_queue`` more calls wait for a slot, each for at most
+``queue_timeout`` seconds. Calls beyond that are rejected at once with a
+:class:`ToolOverloadedError`, so a burst against a slow tool cannot take
+the worker's memory, threads or upstream connections away from the other
+tools.
+
+Limits declared at registration can be overridden per tool with the
+``TOOL_BULKHEADS`` setting, e.g.
+``{"example_tool": {"max_concurrent": 64, "max_queue": 128}}``.
+"""
+
+import asyncio
+import functools
+import json
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from fastmcp.exceptions import ToolError
+
+from src.core.config import settings
+from src.core.logger import logger
+from src.core.request_log import log_event
+from src.utils.metrics import TOOL_QUEUE_DEPTH, TOOL_QUEUE_WAIT, TOOL_REJECTED
+
+R = TypeVar("R")
+
+# Weight of the newest call in the moving average of call durations.
+_DURATION_SMOOTHING = 0.2
+
+
+class ToolOverloadedError(ToolError):
+    """A tool call was shed because the tool's bulkhead is full.
+
+    The message is a JSON object with ``"retryable": true`` and a
+    ``retry_after`` hint in seconds, so clients can back off and retry.
+    """
+
+    def __init__(self, tool: str, reason: str, retry_after: float) -> None:
+        self.tool = tool
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(
+            json.dumps(
+                {
+                    "error": "overloaded",
+                    "tool": tool,
+                    "reason": reason,
+                    "retryable": True,
+                    "retry_after": retry_after,
+                }
+            )
+        )
+
+
+class Bulkhead:
+    """Concurrency limit with a bounded, timed wait queue.
+
+    Args:
+        name: Tool name, used in errors, metrics and stats.
+        max_concurrent: Calls allowed to run at once.
+        max_queue: Calls allowed to wait for a slot; ``0`` rejects as soon
+            as every slot is taken.
+        queue_timeout: Seconds a call may wait before it is rejected.
+    """
+
+    def __init__(
+        self, name: str, max_concurrent: int, max_queue: int = 0, queue_timeout: float = 1.0
+    ) -> None:
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        if max_queue < 0 or queue_timeout < 0:
+            raise ValueError("max_queue and queue_timeout must not be negative")
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        # Semaphores bind to the loop they are first awaited on.
+        self._slots: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+        self._queue_depth = TOOL_QUEUE_DEPTH.labels(name)
+        self._active = 0
+        self._waiting = 0
+        self._completed = 0
+        self._rejected = {"queue_full": 0, "queue_timeout": 0}
+        self._avg_duration = 0.0
+
+    def _slot(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._slots.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._slots[loop] = semaphore
+        return semaphore
+
+    def _reject(self, reason: str) -> ToolOverloadedError:
+        self._rejected[reason] += 1
+        TOOL_REJECTED.labels(self.name, reason).inc()
+        log_event("tool.rejected", tool=self.name, reason=reason)
+        # Roughly when the calls ahead of a retry will have drained.
+        backlog = (self._waiting + 1) / self.max_concurrent
+        retry_after = round(min(max(self._avg_duration * backlog, 0.1), 30.0), 3)
+        return ToolOverloadedError(self.name, reason, retry_after)
+
+    async def _acquire(self, slot: asyncio.Semaphore) -> None:
+        if not slot.locked():
+            await slot.acquire()
+            return
+        if self._waiting >= self.max_queue:
+            raise self._reject("queue_full")
+        self._waiting += 1
+        self._queue_depth.inc()
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(slot.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise self._reject("queue_timeout") from None
+        finally:
+            waited = time.perf_counter() - started
+            self._waiting -= 1
+            self._queue_depth.dec()
+            TOOL_QUEUE_WAIT.labels(self.name).observe(waited)
+        log_event("tool.queued", tool=self.name, wait_ms=round(waited * 1000, 3))
+
+    async def call(self, fn: Callable[..., Awaitable[R]], *args: Any, **kwargs: Any) -> R:
+        """Await ``fn(*args, **kwargs)`` once a slot is free.
+
+        Raises:
+            ToolOverloadedError: When the queue is full or the wait times out.
+        """
+        slot = self._slot()
+        await self._acquire(slot)
+        self._active += 1
+        started = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            self._active -= 1
+            self._completed += 1
+            self._avg_duration += _DURATION_SMOOTHING * (
+                time.perf_counter() - started - self._avg_duration
+            )
+            slot.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return limits, current occupancy and rejection counters."""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "queue_timeout": self.queue_timeout,
+            "active": self._active,
+            "waiting": self._waiting,
+            "completed": self._completed,
+            "rejected_queue_full": self._rejected["queue_full"],
+            "rejected_queue_timeout": self._rejected["queue_timeout"],
+        }
+
+
+_bulkheads: Dict[str, Bulkhead] = {}
+
+
+def bulkhead(
+    max_concurrent: int, max_queue: int = 0, queue_timeout: float = 1.0
+) -> Callable[[Callable[..., Awaitable[R]]], Callable[..., Awaitable[R]]]:
+    """Limit the concurrency of an async MCP tool function.
+
+    Place it below ``@instrument_tool`` so shed calls are still counted and
+    traced. Values in ``settings.tool_bulkheads`` for the tool's name take
+    precedence over the arguments.
+    """
+
+    def decorate(fn: Callable[..., Awaitable[R]]) -> Callable[..., Awaitable[R]]:
+        name = fn.__name__
+        limits: Dict[str, Any] = {
+            "max_concurrent": max_concurrent,
+            "max_queue": max_queue,
+            "queue_timeout": queue_timeout,
+        }
+        overrides = settings.tool_bulkheads.get(name, {})
+        unknown = set(overrides) - set(limits)
+        if unknown:
+            logger.warning(f"Ignoring unknown bulkhead settings for {name}: {sorted(unknown)}")
+        for key in limits.keys() & overrides.keys():
+            limits[key] = type(limits[key])(overrides[key])
+        limiter = Bulkhead(name, **limits)
+        _bulkheads[name] = limiter
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> R:
+            return await limiter.call(fn, *args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def get_bulkhead(tool: str) -> Bulkhead:
+    """Return the bulkhead most recently declared for ``tool``.
+
+    Raises:
+        KeyError: When the tool has no bulkhead.
+    """
+    return _bulkheads[tool]
+
+
+def bulkhead_stats() -> Dict[str, Dict[str, Any]]:
+    """Return :meth:`Bulkhead.stats` for every tool with a bulkhead."""
+    return {name: limiter.stats() for name, limiter in _bulkheads.items()}
@@ -0,0 +1,102 @@
+"""Per-tool deadlines.
+
+Each call gets ``settings.tool_timeouts[tool]``, or ``settings.tool_timeout``
+for tools without an entry. A client can shorten (never extend) that budget
+by sending ``settings.request_timeout_header`` in milliseconds.
+
+:func:`execute_tool` runs its tools through :func:`run_with_deadline`; tool
+functions that call their implementation directly use :func:`with_deadline`.
+"""
+
+import asyncio
+import functools
+import json
+from typing import Any, Awaitable, Callable, Mapping, Optional, TypeVar
+
+from fastmcp.exceptions import ToolError
+from fastmcp.server.dependencies import get_http_headers
+
+from src.core.config import settings
+from src.utils.deadline import deadline_scope, parse_timeout_header
+from src.utils.metrics import TOOL_TIMEOUTS
+
+R = TypeVar("R")
+
+
+class ToolTimeoutError(ToolError):
+    """A tool call ran past its deadline and was cancelled.
+
+    Like :class:`ToolOverloadedError`, the message is a JSON object marked
+    ``"retryable": true``.
+    """
+
+    def __init__(self, tool: str, timeout: Optional[float]) -> None:
+        self.tool = tool
+        self.timeout = timeout
+        super().__init__(
+            json.dumps(
+                {
+                    "error": "deadline_exceeded",
+                    "tool": tool,
+                    "timeout": timeout,
+                    "retryable": True,
+                }
+            )
+        )
+
+
+def tool_timeout(tool_name: str, request_headers: Mapping[str, str]) -> Optional[float]:
+    """Return the budget in seconds for one call, or ``None`` for no deadline."""
+    configured = settings.tool_timeouts.get(tool_name, settings.tool_timeout)
+    timeouts = [t for t in (configured or None, _client_timeout(request_headers)) if t]
+    return min(timeouts) if timeouts else None
+
+
+def _client_timeout(request_headers: Mapping[str, str]) -> Optional[float]:
+    name = settings.request_timeout_header.lower()
+    for key, value in request_headers.items():
+        if key.lower() == name:
+            return parse_timeout_header(value)
+    return None
+
+
+async def run_with_deadline(
+    tool_name: str,
+    request_headers: Mapping[str, str],
+    call: Callable[[], Awaitable[R]],
+) -> R:
+    """Await ``call()`` under the deadline of one call to ``tool_name``.
+
+    Raises:
+        ToolTimeoutError: When the call runs past its deadline; it is
+            cancelled, and upstream requests and executor work it started
+            are bounded by the same deadline. A ``TimeoutError`` the call
+            raises itself, e.g. from an upstream socket, propagates as is.
+    """
+    timeout = tool_timeout(tool_name, request_headers)
+    with deadline_scope(timeout) as budget:
+        scope = asyncio.timeout(budget)
+        try:
+            async with scope:
+                return await call()
+        except TimeoutError:
+            if not scope.expired():
+                raise
+            TOOL_TIMEOUTS.labels(tool_name).inc()
+            raise ToolTimeoutError(tool_name, timeout) from None
+
+
+def with_deadline(fn: Callable[..., Awaitable[R]]) -> Callable[..., Awaitable[R]]:
+    """Run an async MCP tool function under its deadline.
+
+    Place it below ``@instrument_tool`` and above ``@bulkhead`` so timeouts
+    are counted and time spent queueing counts against the budget.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> R:
+        return await run_with_deadline(
+            fn.__name__, get_http_headers(), lambda: fn(*args, **kwargs)
+        )
+
+    return wrapper
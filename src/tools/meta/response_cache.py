@@ -0,0 +1,168 @@
+"""Opt-in response cache for tools.
+
+Results are cached per tool under a key derived from the normalized input,
+the caller's token and the enterprise headers that scope the request. While
+a result is being computed, identical concurrent calls wait for the same
+upstream call instead of issuing their own (single-flight). The shared call
+runs without the deadline of the caller that started it: every caller waits
+for it under its own deadline, and it is cancelled once all of them gave up.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from src.utils.auth import get_authorization_token
+from src.utils.deadline import remaining, without_deadline
+
+T = TypeVar("T")
+
+# traceparent changes on every request and does not affect the result.
+UNCACHEABLE_HEADERS = frozenset({"traceparent"})
+
+
+def make_cache_key(
+    tool_name: str,
+    input_data: Dict[str, Any],
+    request_headers: Dict[str, str],
+    header_names: Iterable[str],
+) -> str:
+    """Return a stable key for a tool call.
+
+    Args:
+        tool_name: Name of the tool.
+        input_data: The tool input as a plain dict.
+        request_headers: Incoming request headers.
+        header_names: Headers whose values scope the cached result.
+    """
+    headers_lower = {k.lower(): v for k, v in request_headers.items()}
+    token = get_authorization_token(request_headers) if request_headers else None
+    scope = {
+        "tool": tool_name,
+        "input": input_data,
+        "headers": {
+            name: headers_lower.get(name.lower())
+            for name in sorted(header_names)
+            if name.lower() not in UNCACHEABLE_HEADERS
+        },
+        # Never share results across callers.
+        "token": hashlib.sha256(token.encode("utf-8")).hexdigest() if token else None,
+    }
+    canonical = json.dumps(scope, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache(Generic[T]):
+    """Size-bounded LRU cache with TTL and single-flight coalescing.
+
+    Args:
+        ttl: Seconds a result stays fresh; ``0`` disables caching but keeps
+            request coalescing.
+        max_entries: Maximum number of cached results.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 1024) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, T]]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Task[T]"] = {}
+        self._waiters: Dict["asyncio.Task[T]", int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def _lookup(self, key: str) -> Optional[Tuple[float, T]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, value: T) -> None:
+        if self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[T]],
+        cacheable: Callable[[T], bool] = lambda _: True,
+    ) -> T:
+        """Return the cached result for ``key`` or compute it once.
+
+        Args:
+            key: Cache key, see :func:`make_cache_key`.
+            compute: Produces the result on a miss.
+            cacheable: Decides whether a computed result may be stored, e.g.
+                to skip error responses.
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            self.hits += 1
+            return entry[1]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+
+            async def run() -> T:
+                try:
+                    value = await compute()
+                    if cacheable(value):
+                        self._store(key, value)
+                    return value
+                finally:
+                    self._inflight.pop(key, None)
+
+            task = asyncio.get_running_loop().create_task(run(), context=without_deadline())
+            self._inflight[key] = task
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            # Shielded so one caller giving up does not cancel the shared call.
+            return await asyncio.wait_for(asyncio.shield(task), remaining())
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if not task.done():
+                    # Nobody is waiting for the result any more.
+                    task.cancel()
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss, coalescing and eviction counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "in_flight": len(self._inflight),
+        }
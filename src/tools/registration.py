@@ -12,37 +12,69 @@ from pydantic.error_wrappers import ValidationError
 
 from src.schemas.example_tool import ExampleToolInput
 from src.tools.impl.example_tool import ExampleTool
-from src.core.config import settings
+from src.core.config import get_build_info
 from src.schemas.version import VersionResponse
 from src.core.logger import logger
+from src.core.request_log import log_event
+from src.utils.metrics import instrument_tool
 
 from src.tools.impl.inventory_tools import LoadInventoryTool
 
 
 from src.tools.impl.CRUD_tools import MockInventoryTool
+from src.tools.meta.base import BaseTool
+from src.tools.meta.bulkhead import bulkhead
+from src.tools.meta.deadline import run_with_deadline, with_deadline
 
-from src.schemas.inventory import NoInput
+from src.schemas.inventory import (
+    BulkInventoryInput,
+    InventoryImportInput,
+    InventoryQueryInput,
+    InventoryViewCheckInput,
+    InventoryViewInput,
+    ListInventoryInput,
+    RetailAnalyticsInput,
+)
+from src.tools.impl.inventory_query import InventoryQueryTool
+from src.tools.impl.retail_tools import (
+    ExpectedInventoryTool,
+    ForecastedDemandTool,
+    PromotionCandidateTool,
+)
 
 
 def register_tools(mcp: FastMCP[Any]) -> None:
 
     inventory_tool = MockInventoryTool()
+    # Shared so each caches its result until the next inventory mutation.
+    forecast_tool = ForecastedDemandTool()
+    expected_tool = ExpectedInventoryTool()
+    promotion_tool = PromotionCandidateTool()
     logger.info("Starting tool registration...")
     """Register tools with the MCP server."""
 
-    @mcp.resource("config://app-version")
-    def get_app_version() -> VersionResponse:
+    build_info = get_build_info()
+    # Serialized once; reads of the resource do no I/O or model validation.
+    app_version_json = VersionResponse(
+        name=build_info.name,
+        version=build_info.version,
+        commit=build_info.commit,
+        branch=build_info.branch,
+        buildTime=build_info.build_time,
+        tag=build_info.tag,
+    ).model_dump_json()
+
+    @mcp.resource("config://app-version", mime_type="application/json")
+    def get_app_version() -> str:
         """Returns the application version details."""
-        return VersionResponse(
-            name=settings.app["name"],
-            version=settings.app["version"],
-            commit=settings.commit_id,
-            branch=settings.branch_name,
-            buildTime=settings.build_time,
-            tag=settings.tag,
-        )
+        return app_version_json
 
+    # Bulkheads keep slow tools from crowding out the cheap ones: every
+    # upstream call holds a pooled connection and every Excel page parses
+    # in the blocking-I/O pool.
     @mcp.tool()
+    @instrument_tool
+    @bulkhead(max_concurrent=32, max_queue=64, queue_timeout=2.0)
     async def example_tool(
         input_data: ExampleToolInput,
     ) -> List[Dict[str, str]]:
@@ -58,36 +90,79 @@ def register_tools(mcp: FastMCP[Any]) -> None:
    
 
     @mcp.tool()
-    async def list_inventory_excel(input_data: NoInput) -> List[Dict[str, str]]:
-        logger.info("list_inventory excel called.")
-       
+    @instrument_tool
+    @bulkhead(max_concurrent=4, max_queue=16, queue_timeout=5.0)
+    async def list_inventory_excel(input_data: ListInventoryInput) -> str:
+        """List Excel inventory records a page at a time (see next_cursor).
 
+        Returns the page as a JSON object with ``data``, ``next_cursor`` and
+        ``total``.
+        """
         return await execute_tool(
             LoadInventoryTool(),
             input_data,
-            "load_inventory"
+            "list_inventory_excel"
         )
 
    
     # @mcp.tool() registers the function as an MCP tool endpoint.
 
     @mcp.tool()
-    async def list_inventory_json(input_data: NoInput) -> List[Dict]:
-        logger.info("list_inventory json called.")
+    @instrument_tool
+    @with_deadline
+    async def list_inventory_json(input_data: ListInventoryInput) -> Dict[str, Any]:
+        """List JSON inventory records a page at a time (see next_cursor)."""
+        log_event("tool.start", tool="list_inventory_json")
         try:
-            return await inventory_tool.list_items()
+            return await inventory_tool.list_page(input_data)
         except ValidationError as e:
+            log_event("tool.error", failed=True, tool="list_inventory_json")
             logger.error(f"Validation error in list_inventory: {e.json()}")
             raise
         except Exception as e:
+            log_event("tool.error", failed=True, tool="list_inventory_json")
             logger.error(f"Unexpected error in list_inventory: {str(e)}")
             raise
 
     @mcp.tool()
+    @instrument_tool
+    async def query_inventory(input_data: InventoryQueryInput) -> Dict[str, Any]:
+        """Filter, project and sort inventory records on the server.
+
+        Prefer this over list_inventory_json when only matching records or a
+        few columns are needed.
+        """
+        return await execute_tool(
+            InventoryQueryTool(), input_data, "query_inventory"
+        )
+
+    @mcp.tool()
+    @instrument_tool
+    async def forecasted_demand(input_data: RetailAnalyticsInput) -> Dict[str, Any]:
+        """Forecasted demand per item against on-hand stock in WH1-WH3, with the shortfall."""
+        return await execute_tool(forecast_tool, input_data, "forecasted_demand")
+
+    @mcp.tool()
+    @instrument_tool
+    async def expected_inventory(input_data: RetailAnalyticsInput) -> Dict[str, Any]:
+        """Expected inventory per item and warehouse, and the balance left after demand."""
+        return await execute_tool(expected_tool, input_data, "expected_inventory")
+
+    @mcp.tool()
+    @instrument_tool
+    async def promotion_candidates(input_data: RetailAnalyticsInput) -> Dict[str, Any]:
+        """Items recommended for promotion, with prices, discount and supporting flags."""
+        return await execute_tool(promotion_tool, input_data, "promotion_candidates")
+
+    @mcp.tool()
+    @instrument_tool
+    @with_deadline
     async def add_inventory_item(input_data: Dict) -> Dict:
         return await inventory_tool.add_item(input_data)
 
     @mcp.tool()
+    @instrument_tool
+    @with_deadline
     async def update_inventory_item(input_data: Dict) -> Dict:
         item_id = input_data.get("item_id")
         item = input_data.get("item")
@@ -97,6 +172,8 @@ def register_tools(mcp: FastMCP[Any]) -> None:
         return result
 
     @mcp.tool()
+    @instrument_tool
+    @with_deadline
     async def delete_inventory_item(input_data: Dict) -> Dict:
         item_id = input_data.get("item_id")
         result = await inventory_tool.delete_item(item_id)
@@ -104,6 +181,49 @@ def register_tools(mcp: FastMCP[Any]) -> None:
             raise ValueError("Item not found")
         return result
 
+    @mcp.tool()
+    @instrument_tool
+    @with_deadline
+    async def bulk_mutate_inventory(input_data: BulkInventoryInput) -> Dict[str, Any]:
+        """Add, update and delete many inventory items in one atomic commit.
+
+        Prefer this over repeated add/update/delete_inventory_item calls when
+        changing more than a few items. Returns a result per operation.
+        """
+        return await inventory_tool.apply_batch(input_data)
+
+    @mcp.tool()
+    @instrument_tool
+    @with_deadline
+    @bulkhead(max_concurrent=1)
+    async def import_inventory(input_data: InventoryImportInput) -> Dict[str, Any]:
+        """Import inventory records from a CSV, JSON Lines or xlsx file on the server.
+
+        Rows are validated and added in batches; invalid rows are skipped and
+        reported. Use dry_run to check a file first.
+        """
+        return await inventory_tool.import_file(input_data)
+
+    @mcp.tool()
+    @instrument_tool
+    @with_deadline
+    async def inventory_view(input_data: InventoryViewInput) -> Dict[str, Any]:
+        """Read a precomputed list of items: promotion_candidates, overstock, high_dsi
+        or seasonal_high_demand.
+
+        The lists are kept up to date on every change to the inventory, so this
+        is the cheapest way to answer "which items are overstocked" and similar.
+        """
+        return await inventory_tool.view_page(input_data)
+
+    @mcp.tool()
+    @instrument_tool
+    @with_deadline
+    @bulkhead(max_concurrent=1)
+    async def check_inventory_views(input_data: InventoryViewCheckInput) -> Dict[str, Any]:
+        """Verify the precomputed inventory views against a full recompute."""
+        return await inventory_tool.check_views(input_data)
+
     logger.info("Finished tool registration.")
 
 async def execute_tool(
@@ -111,11 +231,42 @@ async def execute_tool(
     input_data: Any,
     tool_name: str,
     request_headers: Optional[Dict[str, str]] = None,
-) -> List[Dict[str, str]]:
-    logger.info(f"Executing {tool_name} with input: {input_data}")
+) -> Any:
+    """Run a tool under its deadline, through its response cache if it has one.
 
-    
-    if request_headers:
-        return await tool_instance.execute(input_data, request_headers)
+    Returns:
+        Whatever the tool's ``execute`` returns; the calling tool function
+        declares its type.
+
+    Raises:
+        ToolTimeoutError: When the call runs past its deadline; it is
+            cancelled, and upstream requests and executor work it started
+            are bounded by the same deadline.
+    """
+    log_event("tool.start", tool=tool_name)
+    # Formatted only when a DEBUG sink is active.
+    logger.debug("Executing {} with input: {}", tool_name, input_data)
 
-    return await tool_instance.execute(input_data)
+    async def call() -> Any:
+        if request_headers:
+            return await tool_instance.execute(input_data, request_headers)
+        return await tool_instance.execute(input_data)
+
+    async def cached_call() -> Any:
+        if isinstance(tool_instance, BaseTool) and tool_instance.response_cache is not None:
+            return await tool_instance.response_cache.get_or_compute(
+                tool_instance.cache_key(input_data, request_headers or {}),
+                call,
+                tool_instance.is_cacheable,
+            )
+        return await call()
+
+    try:
+        result = await run_with_deadline(
+            tool_name, request_headers or get_http_headers(), cached_call
+        )
+    except Exception as e:
+        log_event("tool.error", failed=True, tool=tool_name, error=str(e))
+        raise
+    log_event("tool.end", tool=tool_name)
+    return result
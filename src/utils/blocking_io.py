@@ -0,0 +1,153 @@
+"""Bounded executor for blocking file I/O called from async tools."""
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, TypeVar
+
+from src.core.config import settings
+from src.utils.deadline import check_deadline, remaining
+
+R = TypeVar("R")
+
+
+class BlockingIOExecutor:
+    """Thread pool that keeps blocking calls off the event loop.
+
+    At most ``max_workers`` calls run at once and at most ``max_queue`` more
+    wait for a thread. Further callers wait on the event loop (not on a
+    thread) until a slot frees up, so a burst of slow reads cannot grow the
+    executor queue without bound.
+
+    Args:
+        max_workers: Number of worker threads.
+        max_queue: Number of calls allowed to wait for a free worker.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="blocking-io"
+        )
+        # Semaphores bind to the loop they are first awaited on.
+        self._slots: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._waiting = 0
+        self._completed = 0
+
+    def _slot(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._slots.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_workers + self.max_queue)
+            self._slots[loop] = semaphore
+        return semaphore
+
+    def _track(self, fn: Callable[[], R]) -> R:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        try:
+            return fn()
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+
+    async def run(self, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        """Run ``fn(*args, **kwargs)`` on the pool and await its result.
+
+        The call runs in a copy of the caller's context, so spans and request
+        log events it creates attach to the calling request. Under a
+        deadline (see :mod:`src.utils.deadline`), waiting for a slot is
+        bounded by the remaining budget and the call is skipped if the
+        deadline passes before a thread picks it up.
+
+        The slot is held until ``fn`` returns, not until the caller stops
+        waiting: a cancelled caller cannot stop a call that already runs, so
+        its slot only frees up once the thread does.
+
+        Raises:
+            TimeoutError: When the deadline passes before ``fn`` starts.
+        """
+        call = functools.partial(
+            contextvars.copy_context().run, _unless_expired, fn, *args, **kwargs
+        )
+        slot = self._slot()
+        self._waiting += 1
+        try:
+            async with asyncio.timeout(remaining()):
+                await slot.acquire()
+        finally:
+            self._waiting -= 1
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._queued += 1
+        try:
+            future = self._executor.submit(self._track, call)
+        except BaseException:
+            with self._lock:
+                self._queued -= 1
+            slot.release()
+            raise
+        future.add_done_callback(functools.partial(self._finished, loop, slot))
+        # Cancelling the caller cancels the call only if no thread took it yet.
+        return await asyncio.wrap_future(future)
+
+    def _finished(
+        self, loop: asyncio.AbstractEventLoop, slot: asyncio.Semaphore, future: "Future[Any]"
+    ) -> None:
+        if future.cancelled():
+            # Dropped from the queue; _track never ran.
+            with self._lock:
+                self._queued -= 1
+        try:
+            loop.call_soon_threadsafe(slot.release)
+        except RuntimeError:
+            pass  # The loop is closed, and its semaphore with it.
+
+    def stats(self) -> Dict[str, int]:
+        """Return pool sizing and current queue depth."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queued": self._queued,
+                "waiting": self._waiting,
+                "completed": self._completed,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads once pending calls finish."""
+        self._executor.shutdown(wait=True)
+
+
+def _unless_expired(fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+    # Nobody waits for work whose deadline passed while it was queued.
+    check_deadline()
+    return fn(*args, **kwargs)
+
+
+@lru_cache
+def get_io_executor() -> BlockingIOExecutor:
+    """Return the process-wide blocking I/O executor."""
+    return BlockingIOExecutor(
+        max_workers=settings.io_pool_size or min(32, (os.cpu_count() or 1) + 4),
+        max_queue=settings.io_queue_size,
+    )
+
+
+async def run_blocking(fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+    """Run a blocking callable on the shared I/O executor."""
+    return await get_io_executor().run(fn, *args, **kwargs)
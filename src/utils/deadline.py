@@ -0,0 +1,88 @@
+"""Deadlines for tool calls.
+
+A deadline is an absolute ``time.monotonic()`` value held in a context
+variable, so it follows the call into spawned tasks and (through
+:meth:`BlockingIOExecutor.run`) into executor threads. Upstream requests
+clamp their httpx timeouts to the remaining budget and pass it on in the
+``settings.request_timeout_header`` header; executor work whose deadline
+has passed before a thread picks it up is skipped.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import Context, ContextVar, copy_context
+from typing import Dict, Iterator, Mapping, Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+def remaining() -> Optional[float]:
+    """Return the seconds left before the current deadline, or ``None``."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def check_deadline() -> None:
+    """Raise :class:`TimeoutError` if the current deadline has passed.
+
+    Long-running loops in executor threads can call this between steps.
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise TimeoutError("Deadline exceeded")
+
+
+@contextmanager
+def deadline_scope(timeout: Optional[float]) -> Iterator[Optional[float]]:
+    """Run the block under a deadline ``timeout`` seconds from now.
+
+    An enclosing, earlier deadline is kept. Yields the remaining budget in
+    seconds (``None`` when there is no deadline at all).
+    """
+    deadline = _deadline.get()
+    if timeout is not None and timeout > 0:
+        own = time.monotonic() + timeout
+        deadline = own if deadline is None else min(deadline, own)
+    token = _deadline.set(deadline)
+    try:
+        yield remaining()
+    finally:
+        _deadline.reset(token)
+
+
+def without_deadline() -> Context:
+    """Return a copy of the current context with no deadline.
+
+    For work shared between callers with different budgets, such as a
+    coalesced tool call; each caller bounds its own wait instead.
+    """
+    context = copy_context()
+    context.run(_deadline.set, None)
+    return context
+
+
+def parse_timeout_header(value: Optional[str]) -> Optional[float]:
+    """Return a client timeout given in milliseconds as seconds.
+
+    Missing, malformed and non-positive values mean no client deadline.
+    """
+    if not value:
+        return None
+    try:
+        millis = float(value)
+    except ValueError:
+        return None
+    return millis / 1000 if millis > 0 else None
+
+
+def clamp_timeouts(timeouts: Mapping[str, Optional[float]]) -> Dict[str, Optional[float]]:
+    """Cap httpx's per-phase timeouts at the remaining budget."""
+    left = remaining()
+    if left is None:
+        return dict(timeouts)
+    return {
+        phase: left if value is None else min(value, left)
+        for phase, value in timeouts.items()
+    }
@@ -0,0 +1,193 @@
+"""Shared, pooled HTTP clients for tools that call upstream services."""
+
+import importlib.util
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from opentelemetry import propagate
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from src.core.config import settings
+from src.core.logger import logger
+from src.utils.deadline import clamp_timeouts, remaining
+from src.utils.metrics import UPSTREAM_LATENCY
+from src.utils.tracing import tracer
+
+Origin = Tuple[str, str, Optional[int]]
+
+
+class _CountingTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper that counts, times and traces upstream requests.
+
+    Each request gets a client span whose context is injected as
+    ``traceparent``, replacing one forwarded from the incoming request.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, origin: str = "") -> None:
+        self.transport = transport
+        self.origin = origin
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        self.in_flight += 1
+        started = time.perf_counter()
+        outcome = "error"
+        with tracer.start_as_current_span(
+            request.method,
+            kind=SpanKind.CLIENT,
+            attributes={
+                "http.request.method": request.method,
+                "server.address": request.url.host,
+                "url.path": request.url.path,
+            },
+        ) as span:
+            propagate.inject(request.headers)
+            left = remaining()
+            if left is not None:
+                request.extensions["timeout"] = clamp_timeouts(
+                    request.extensions.get("timeout", {})
+                )
+                request.headers[settings.request_timeout_header] = str(
+                    max(1, int(left * 1000))
+                )
+            try:
+                response = await self.transport.handle_async_request(request)
+                outcome = f"{response.status_code // 100}xx"
+                span.set_attribute("http.response.status_code", response.status_code)
+                if response.status_code >= 500:
+                    span.set_status(Status(StatusCode.ERROR))
+                return response
+            except httpx.TransportError:
+                self.errors += 1
+                raise
+            finally:
+                self.in_flight -= 1
+                # Time to response headers; the body is streamed by the caller.
+                UPSTREAM_LATENCY.labels(self.origin, outcome).observe(
+                    time.perf_counter() - started
+                )
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class UpstreamClientRegistry:
+    """One keep-alive ``httpx.AsyncClient`` per upstream origin.
+
+    Clients are created on first use and shared by every tool for the
+    lifetime of the application; :meth:`aclose` is called from the app
+    lifespan on shutdown.
+
+    Args:
+        limits: Connection pool limits applied to each origin.
+        timeout: Default timeout in seconds.
+        connect_timeout: Connect timeout in seconds.
+        host_timeouts: Per-host overrides of ``timeout``.
+        http2: Negotiate HTTP/2 when the ``h2`` package is installed.
+    """
+
+    def __init__(
+        self,
+        limits: httpx.Limits,
+        timeout: float,
+        connect_timeout: float,
+        host_timeouts: Optional[Dict[str, float]] = None,
+        http2: bool = True,
+    ) -> None:
+        self.limits = limits
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.host_timeouts = host_timeouts or {}
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        if http2 and not self.http2:
+            logger.warning("h2 is not installed; upstream clients use HTTP/1.1")
+        self._clients: Dict[Origin, httpx.AsyncClient] = {}
+        self._transports: Dict[Origin, _CountingTransport] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "UpstreamClientRegistry":
+        """Build a registry from the ``upstream_*`` settings."""
+        return cls(
+            limits=httpx.Limits(
+                max_connections=settings.upstream_max_connections,
+                max_keepalive_connections=settings.upstream_max_keepalive_connections,
+                keepalive_expiry=settings.upstream_keepalive_expiry,
+            ),
+            timeout=settings.upstream_timeout,
+            connect_timeout=settings.upstream_connect_timeout,
+            host_timeouts=settings.upstream_host_timeouts,
+            http2=settings.upstream_http2,
+        )
+
+    @staticmethod
+    def _origin(url: str) -> Origin:
+        parsed = httpx.URL(url)
+        return (parsed.scheme, parsed.host, parsed.port)
+
+    @staticmethod
+    def _origin_key(origin: Origin) -> str:
+        scheme, host, port = origin
+        return f"{scheme}://{host}" + (f":{port}" if port else "")
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        """Return the shared client for the origin of ``url``."""
+        origin = self._origin(url)
+        client = self._clients.get(origin)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(origin)
+            if client is None:
+                transport = _CountingTransport(
+                    httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2),
+                    origin=self._origin_key(origin),
+                )
+                timeout = self.host_timeouts.get(origin[1], self.timeout)
+                client = httpx.AsyncClient(
+                    transport=transport,
+                    timeout=httpx.Timeout(timeout, connect=self.connect_timeout),
+                )
+                self._transports[origin] = transport
+                self._clients[origin] = client
+        return client
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return request counters and pool utilization per origin."""
+        result: Dict[str, Dict[str, Any]] = {}
+        for origin, transport in list(self._transports.items()):
+            key = self._origin_key(origin)
+            # httpx does not expose its pool publicly; degrade to zeros.
+            pool = getattr(transport.transport, "_pool", None)
+            connections = list(getattr(pool, "connections", []))
+            idle = sum(1 for connection in connections if connection.is_idle())
+            result[key] = {
+                "requests": transport.requests,
+                "errors": transport.errors,
+                "in_flight": transport.in_flight,
+                "connections": len(connections),
+                "idle_connections": idle,
+                "max_connections": self.limits.max_connections,
+            }
+        return result
+
+    async def aclose(self) -> None:
+        """Close every client and drop them from the registry."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._transports.clear()
+        for client in clients:
+            await client.aclose()
+
+
+@lru_cache
+def get_upstream_clients() -> UpstreamClientRegistry:
+    """Return the application-wide upstream client registry."""
+    return UpstreamClientRegistry.from_settings()
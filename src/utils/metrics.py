@@ -0,0 +1,262 @@
+"""Prometheus metrics.
+
+Hot-path instruments are plain ``prometheus_client`` counters, gauges and
+histograms: one uncontended lock per update and no I/O. Components that
+already keep their own counters (executor, upstream pools, caches, log
+sinks, inventory store, JWKS) are read only when ``/metrics`` is scraped.
+
+With several worker processes, set ``PROMETHEUS_MULTIPROC_DIR`` before
+start-up. Every worker then writes its samples to memory-mapped files in
+that directory and a scrape served by any worker aggregates all of them.
+"""
+
+import asyncio
+import functools
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, Optional, Tuple, TypeVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+from src.core.logger import logger
+from src.utils.tracing import tool_span
+
+R = TypeVar("R")
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+TOOL_CALLS = Counter("mcp_tool_calls_total", "MCP tool calls.", ["tool"])
+TOOL_ERRORS = Counter("mcp_tool_errors_total", "MCP tool calls that raised.", ["tool"])
+TOOL_IN_FLIGHT = Gauge(
+    "mcp_tool_in_flight", "MCP tool calls in progress.", ["tool"], multiprocess_mode="livesum"
+)
+TOOL_LATENCY = Histogram(
+    "mcp_tool_duration_seconds", "MCP tool call latency.", ["tool"], buckets=LATENCY_BUCKETS
+)
+TOOL_QUEUE_DEPTH = Gauge(
+    "mcp_tool_queue_depth",
+    "MCP tool calls waiting for a bulkhead slot.",
+    ["tool"],
+    multiprocess_mode="livesum",
+)
+TOOL_QUEUE_WAIT = Histogram(
+    "mcp_tool_queue_wait_seconds",
+    "Time MCP tool calls waited for a bulkhead slot.",
+    ["tool"],
+    buckets=LATENCY_BUCKETS,
+)
+TOOL_REJECTED = Counter(
+    "mcp_tool_rejected_total", "MCP tool calls shed by a bulkhead.", ["tool", "reason"]
+)
+TOOL_TIMEOUTS = Counter(
+    "mcp_tool_timeouts_total", "MCP tool calls that ran past their deadline.", ["tool"]
+)
+UPSTREAM_LATENCY = Histogram(
+    "upstream_request_duration_seconds",
+    "Latency of requests to upstream services.",
+    ["origin", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay of a periodic event-loop wake-up beyond its schedule.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+
+INSTRUMENTS = (
+    TOOL_CALLS,
+    TOOL_ERRORS,
+    TOOL_IN_FLIGHT,
+    TOOL_LATENCY,
+    TOOL_QUEUE_DEPTH,
+    TOOL_QUEUE_WAIT,
+    TOOL_REJECTED,
+    TOOL_TIMEOUTS,
+    UPSTREAM_LATENCY,
+    EVENT_LOOP_LAG,
+)
+
+
+@contextmanager
+def track_tool(tool: str) -> Iterator[None]:
+    """Count, time and track the in-flight state of one tool call."""
+    TOOL_CALLS.labels(tool).inc()
+    in_flight = TOOL_IN_FLIGHT.labels(tool)
+    in_flight.inc()
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        TOOL_ERRORS.labels(tool).inc()
+        raise
+    finally:
+        TOOL_LATENCY.labels(tool).observe(time.perf_counter() - started)
+        in_flight.dec()
+
+
+def instrument_tool(fn: Callable[..., Awaitable[R]]) -> Callable[..., Awaitable[R]]:
+    """Decorate an async MCP tool function with a span and :func:`track_tool`."""
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> R:
+        with tool_span(fn.__name__), track_tool(fn.__name__):
+            return await fn(*args, **kwargs)
+
+    return wrapper
+
+
+class EventLoopLagMonitor:
+    """Measure how late the event loop runs a periodic wake-up.
+
+    Args:
+        interval: Seconds between samples.
+    """
+
+    def __init__(self, interval: float = 0.5) -> None:
+        self.interval = interval
+        self.last_lag = 0.0
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    async def _run(self) -> None:
+        while True:
+            scheduled = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.last_lag = max(0.0, time.perf_counter() - scheduled)
+            EVENT_LOOP_LAG.observe(self.last_lag)
+
+    def start(self) -> None:
+        """Start sampling on the running loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+StatsSource = Callable[[], Dict[str, Any]]
+
+
+class StatsCollector(Collector):
+    """Expose the ``stats()`` dictionaries of runtime components as gauges.
+
+    Each source maps to ``<prefix>_<key>`` gauges. Nested dictionaries (one
+    entry per upstream origin or log file) become a label named by
+    ``label``. Values come from the process answering the scrape and carry a
+    ``pid`` label so per-worker values stay distinct.
+    """
+
+    def __init__(self) -> None:
+        self._sources: Dict[str, Tuple[StatsSource, Optional[str]]] = {}
+
+    def register(self, prefix: str, source: StatsSource, label: Optional[str] = None) -> None:
+        """Add a ``stats()`` callable under the metric name ``prefix``."""
+        self._sources[prefix] = (source, label)
+
+    def collect(self) -> Iterable[GaugeMetricFamily]:
+        pid = str(os.getpid())
+        for prefix, (source, label) in list(self._sources.items()):
+            try:
+                stats = source()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning(f"Metrics source {prefix} failed: {str(e)}")
+                continue
+            families: Dict[str, GaugeMetricFamily] = {}
+
+            def add(key: str, value: Any, labels: Dict[str, str]) -> None:
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    return
+                name = f"{prefix}_{key}"
+                family = families.get(name)
+                if family is None:
+                    family = GaugeMetricFamily(name, f"{prefix} {key}", labels=["pid", *labels])
+                    families[name] = family
+                family.add_metric([pid, *labels.values()], value)
+
+            for key, value in stats.items():
+                if label is not None and isinstance(value, dict):
+                    for inner_key, inner_value in value.items():
+                        add(inner_key, inner_value, {label: key})
+                else:
+                    add(key, value, {})
+            yield from families.values()
+
+
+stats_collector = StatsCollector()
+
+
+def build_registry() -> CollectorRegistry:
+    """Return the registry served by ``/metrics``.
+
+    In multiprocess mode the instrument values are read from every worker's
+    files; otherwise they are this process's own.
+    """
+    registry = CollectorRegistry()
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        multiprocess.MultiProcessCollector(registry)  # type: ignore[no-untyped-call]
+    else:
+        for collector in INSTRUMENTS:
+            registry.register(collector)
+    registry.register(stats_collector)
+    return registry
+
+
+def render_metrics(registry: CollectorRegistry) -> bytes:
+    """Return the text exposition of ``registry``."""
+    return generate_latest(registry)
+
+
+def clear_multiprocess_dir() -> None:
+    """Remove metric files left by a previous run."""
+    directory = os.environ.get(MULTIPROC_DIR_ENV)
+    if not directory:
+        return
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name.endswith(".db"):
+            os.remove(os.path.join(directory, name))
+
+
+def mark_worker_dead(pid: int) -> None:
+    """Drop the live gauges of an exited worker process."""
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        multiprocess.mark_process_dead(pid)  # type: ignore[no-untyped-call]
+
+
+__all__ = [
+    "CONTENT_TYPE_LATEST",
+    "EventLoopLagMonitor",
+    "TOOL_QUEUE_DEPTH",
+    "TOOL_QUEUE_WAIT",
+    "TOOL_REJECTED",
+    "TOOL_TIMEOUTS",
+    "UPSTREAM_LATENCY",
+    "build_registry",
+    "clear_multiprocess_dir",
+    "instrument_tool",
+    "mark_worker_dead",
+    "render_metrics",
+    "stats_collector",
+    "track_tool",
+]
@@ -0,0 +1,137 @@
+"""Cursor pagination and chunked streaming for list tools.
+
+A cursor is an offset into a collection, so it only stays meaningful while
+the collection is unchanged: an add or delete between two pages would make
+the client skip or repeat records. Callers pass a ``version`` of the
+collection (the store version, a file digest) that is bound into every
+cursor, and a cursor issued for another version is rejected as stale.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from fastmcp.server.dependencies import get_context
+
+from src.core.config import settings
+
+Fetch = Callable[[int, int], List[Dict[str, Any]]]
+Version = Union[int, str, None]
+
+STREAM_LOGGER = "inventory.stream"
+
+
+class StaleCursorError(ValueError):
+    """The collection changed since the cursor was issued."""
+
+
+def encode_cursor(offset: int, source: str, version: Version = None) -> str:
+    """Return an opaque continuation token for ``offset`` within ``source``."""
+    raw = json.dumps({"o": offset, "s": source, "v": version}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], source: str, version: Version = None) -> int:
+    """Return the offset encoded in ``cursor``; ``0`` when there is none.
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued by another tool.
+        StaleCursorError: If it was issued for another ``version``.
+    """
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        offset = int(payload["o"])
+        issued_by = payload["s"]
+        issued_for = payload.get("v")
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if issued_by != source or offset < 0:
+        raise ValueError("Invalid cursor")
+    if issued_for != version:
+        raise StaleCursorError(
+            "Stale cursor: the inventory changed since this page was returned; "
+            "list again without a cursor"
+        )
+    return offset
+
+
+def resolve_limit(limit: Optional[int]) -> int:
+    """Clamp a requested page size to the configured bounds."""
+    if limit is None:
+        return settings.inventory_page_size
+    return max(1, min(limit, settings.inventory_max_page_size))
+
+
+def paginate(
+    fetch: Fetch,
+    total: int,
+    source: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    version: Version = None,
+) -> Dict[str, Any]:
+    """Build one page of results.
+
+    Args:
+        fetch: Returns the records in ``[start, stop)`` in stable order.
+        total: Number of records available.
+        source: Name of the paginated collection, bound into the cursor.
+        limit: Requested page size.
+        cursor: Continuation token from a previous page.
+        version: Version of the collection, bound into the cursor. Read it
+            before ``total`` so a concurrent change makes the next cursor
+            stale rather than wrong.
+
+    Returns:
+        ``{"items", "next_cursor", "total"}``; ``next_cursor`` is ``None`` on
+        the last page.
+    """
+    start = min(decode_cursor(cursor, source, version), total)
+    stop = min(start + resolve_limit(limit), total)
+    return {
+        "items": fetch(start, stop),
+        "next_cursor": encode_cursor(stop, source, version) if stop < total else None,
+        "total": total,
+    }
+
+
+async def stream_records(
+    fetch: Fetch,
+    total: int,
+    source: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    version: Version = None,
+) -> Dict[str, Any]:
+    """Send every record from ``cursor`` onwards as MCP notifications.
+
+    Each chunk of ``limit`` records goes out as a log notification on the
+    ``inventory.stream`` logger (its data is a JSON object with ``offset``
+    and ``items``) followed by a progress notification, so only one chunk is
+    materialized at a time. Outside an MCP request this falls back to
+    :func:`paginate`.
+
+    Returns:
+        A summary ``{"items": [], "streamed", "next_cursor": None, "total"}``.
+    """
+    try:
+        ctx = get_context()
+    except RuntimeError:
+        return paginate(fetch, total, source, limit, cursor, version)
+
+    chunk_size = resolve_limit(limit)
+    start = min(decode_cursor(cursor, source, version), total)
+    streamed = 0
+    for offset in range(start, total, chunk_size):
+        chunk = fetch(offset, min(offset + chunk_size, total))
+        await ctx.log(
+            json.dumps({"source": source, "offset": offset, "items": chunk}),
+            logger_name=STREAM_LOGGER,
+        )
+        streamed += len(chunk)
+        await ctx.report_progress(start + streamed, total)
+    return {"items": [], "streamed": streamed, "next_cursor": None, "total": total}
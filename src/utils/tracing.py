@@ -0,0 +1,159 @@
+"""OpenTelemetry tracing.
+
+Spans are created through the module-level :data:`tracer`. Until
+:func:`configure_tracing` installs an SDK provider (``tracing_exporter`` is
+not ``"none"``) it is the API's no-op tracer: spans are not recorded, but
+an incoming ``traceparent`` is still passed on to upstream calls.
+
+Exporters:
+
+* ``otlp``: OTLP over HTTP; needs the ``tracing`` extra. The endpoint comes
+  from ``tracing_otlp_endpoint`` or the standard ``OTEL_EXPORTER_OTLP_*``
+  environment variables.
+* ``file``: one JSON object per span appended to ``tracing_file``.
+* ``console``: spans printed to stdout.
+
+New traces are sampled at ``tracing_sample_ratio``; requests that arrive
+with a sampled parent are always recorded.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator, Optional, Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+from src.core.config import get_build_info, settings
+from src.core.logger import logger
+from src.core.request_log import mcp_request_state
+
+tracer = trace.get_tracer("src")
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Append finished spans to a file, one JSON object per line.
+
+    Args:
+        path: File to append to; parent directories are created.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError as e:
+            logger.warning(f"Could not write spans to {self.path}: {str(e)}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+
+def make_exporter(kind: str) -> Optional[SpanExporter]:
+    """Return the span exporter named by ``kind``, or None to disable tracing.
+
+    Raises:
+        ValueError: If ``kind`` is not a known exporter.
+    """
+    if kind == "none":
+        return None
+    if kind == "console":
+        return ConsoleSpanExporter()
+    if kind == "file":
+        return JsonLinesSpanExporter(settings.tracing_file)
+    if kind == "otlp":
+        try:
+            # pylint: disable=import-outside-toplevel
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+                OTLPSpanExporter,
+            )
+        except ImportError:
+            logger.warning(
+                "opentelemetry-exporter-otlp-proto-http is not installed; "
+                "tracing is disabled (install the 'tracing' extra)"
+            )
+            return None
+        return OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint or None)
+    raise ValueError(f"Unknown tracing exporter: {kind!r}")
+
+
+def build_tracer_provider(exporter: SpanExporter, sample_ratio: float) -> TracerProvider:
+    """Return a provider that batches spans to ``exporter``."""
+    build_info = get_build_info()
+    provider = TracerProvider(
+        resource=Resource.create(
+            {"service.name": build_info.name, "service.version": build_info.version}
+        ),
+        sampler=ParentBased(TraceIdRatioBased(sample_ratio)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    return provider
+
+
+@lru_cache
+def configure_tracing() -> Optional[TracerProvider]:
+    """Install the globally used tracer provider from the ``tracing_*`` settings.
+
+    Returns None, leaving the no-op provider in place, when tracing is off.
+    """
+    exporter = make_exporter(settings.tracing_exporter)
+    if exporter is None:
+        return None
+    provider = build_tracer_provider(exporter, settings.tracing_sample_ratio)
+    trace.set_tracer_provider(provider)
+    logger.info(
+        f"Tracing to {settings.tracing_exporter} at sample ratio "
+        f"{settings.tracing_sample_ratio}"
+    )
+    return provider
+
+
+def flush_tracing() -> None:
+    """Export spans still buffered by the provider, if tracing is on."""
+    provider = configure_tracing()
+    if provider is not None:
+        provider.force_flush()
+
+
+@contextmanager
+def tool_span(tool: str) -> Iterator[trace.Span]:
+    """Open the span of one MCP tool call.
+
+    MCP tools run on the session's task, whose context belongs to the
+    request that opened the session, so the parent is taken from the HTTP
+    request carrying the tool call when there is one.
+    """
+    state = mcp_request_state()
+    parent = state.get("otel_context") if state is not None else None
+    with tracer.start_as_current_span(
+        f"tool {tool}", context=parent, attributes={"mcp.tool.name": tool}
+    ) as span:
+        yield span
+
+
+__all__ = [
+    "JsonLinesSpanExporter",
+    "build_tracer_provider",
+    "configure_tracing",
+    "flush_tracing",
+    "make_exporter",
+    "tool_span",
+    "tracer",
+]
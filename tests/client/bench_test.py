@@ -0,0 +1,189 @@
+"""Tests for the MCP load generator."""
+
+import asyncio
+import json
+import random
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+from src.client.bench import (
+    BenchConfig,
+    BenchState,
+    LoadGenerator,
+    parse_mix,
+    percentile,
+    run_benchmark,
+    summarize,
+)
+
+
+class FakeClient:
+    """Stands in for a connected fastmcp client."""
+
+    def __init__(self, delay: float = 0.0, fail: str = "") -> None:
+        self.delay = delay
+        self.fail = fail
+        self.calls: List[str] = []
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> List[Any]:
+        self.calls.append(name)
+        await asyncio.sleep(self.delay)
+        if name == self.fail:
+            raise RuntimeError("Item not found\ntraceback")
+        if name == "example_tool":
+            return [SimpleNamespace(text=json.dumps({"error": "upstream down"}))]
+        return [SimpleNamespace(text=json.dumps(arguments))]
+
+
+class PositionalInventory:
+    """Applies CRUD calls to a positional list after a random delay."""
+
+    def __init__(self, records: int) -> None:
+        self.records = list(range(records))
+        self.rng = random.Random(3)
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> List[Any]:
+        await asyncio.sleep(self.rng.random() * 0.002)
+        data = arguments["input_data"]
+        if name == "add_inventory_item":
+            self.records.append(-1)
+        elif name == "update_inventory_item":
+            self.records[data["item_id"]] = -1
+        elif name == "delete_inventory_item":
+            del self.records[data["item_id"]]
+        elif name == "bulk_mutate_inventory":
+            for operation in data["operations"]:
+                self.records[operation["item_id"]] = -1
+        return [SimpleNamespace(text="{}")]
+
+
+def test_parse_mix() -> None:
+    """Weights are normalized and crud expands to three tools."""
+    weights = parse_mix("list_inventory_json=3, crud=3")
+    assert weights == pytest.approx(
+        {
+            "list_inventory_json": 0.5,
+            "add_inventory_item": 1 / 6,
+            "update_inventory_item": 1 / 6,
+            "delete_inventory_item": 1 / 6,
+        }
+    )
+    assert parse_mix("example_tool") == {"example_tool": 1.0}
+    for spec in ("", "nope=1", "example_tool=0"):
+        with pytest.raises(ValueError):
+            parse_mix(spec)
+
+
+def test_summarize_uses_nearest_rank_percentiles() -> None:
+    """Percentiles come from the recorded latencies, reported in ms."""
+    latencies = [i / 1000 for i in range(1, 101)]  # 1..100 ms
+    assert percentile(sorted(latencies), 0.99) == 0.099
+    summary = summarize(latencies, errors=5, elapsed=2.0)
+    assert summary["calls"] == 100
+    assert summary["error_rate"] == 0.05
+    assert summary["throughput_rps"] == 50
+    assert summary["latency_ms"]["p50"] == pytest.approx(50)
+    assert summary["latency_ms"]["max"] == pytest.approx(100)
+    assert summarize([], 0, 1.0)["latency_ms"]["p99"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_closed_loop_reports_errors_per_tool() -> None:
+    """Exceptions and error payloads both count as failed calls."""
+    client = FakeClient(fail="delete_inventory_item")
+    generator = LoadGenerator(
+        [client],  # type: ignore[list-item]
+        parse_mix("list_inventory_json,delete_inventory_item,example_tool"),
+        BenchState(records=10),
+        seed=7,
+    )
+    start = time.perf_counter()
+    await generator.run_closed(concurrency=4, until=start + 0.05)
+    report = generator.report(start, 0.05)
+
+    tools = report["tools"]
+    assert tools["list_inventory_json"]["errors"] == 0
+    assert tools["delete_inventory_item"]["error_rate"] == 1.0
+    assert tools["example_tool"]["error_rate"] == 1.0
+    assert report["errors"]["RuntimeError: Item not found"] > 0
+    assert report["errors"]["error payload: upstream down"] > 0
+    assert report["total"]["calls"] == len(client.calls)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_crud_targets_existing_items() -> None:
+    """Ids stay valid whatever order concurrent mutations land in."""
+    inventory = PositionalInventory(40)
+    state = BenchState(records=40, batch_size=5)
+    generator = LoadGenerator(
+        [inventory],  # type: ignore[list-item]
+        parse_mix("crud=3,bulk_mutate_inventory=1"),
+        state,
+        seed=11,
+    )
+    start = time.perf_counter()
+    await generator.run_closed(concurrency=16, until=start + 0.2)
+    report = generator.report(start, 0.2)
+
+    assert report["total"]["calls"] > 100
+    assert report["total"]["errors"] == 0
+    assert state.records == len(inventory.records)
+    assert state.deletes_in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_open_loop_measures_from_the_schedule() -> None:
+    """Arrivals keep their rate and latency includes time spent waiting."""
+    client = FakeClient(delay=0.02)
+    generator = LoadGenerator(
+        [client], {"list_inventory_json": 1.0}, BenchState(), seed=1  # type: ignore[list-item]
+    )
+    start = time.perf_counter()
+    await generator.run_open(rate=200, until=start + 0.1, max_in_flight=2)
+    report = generator.report(start, 0.1)
+
+    assert report["total"]["calls"] + report["skipped_arrivals"] == 20
+    assert report["skipped_arrivals"] > 0
+    assert report["total"]["latency_ms"]["p50"] >= 20
+
+
+@pytest.mark.asyncio
+async def test_in_process_run_produces_json_results() -> None:
+    """A short run against the real tools yields serializable results."""
+    results = await run_benchmark(
+        BenchConfig(
+            mix="list_inventory_json,query_inventory",
+            concurrency=2,
+            duration=0.3,
+            warmup=0.05,
+            seed=3,
+        )
+    )
+    json.dumps(results)
+    assert results["mode"] == "closed"
+    assert results["total"]["calls"] > 0
+    assert results["total"]["errors"] == 0
+    assert set(results["tools"]) <= {"list_inventory_json", "query_inventory"}
+
+
+@pytest.mark.asyncio
+async def test_upstream_simulator_serves_example_tool() -> None:
+    """With upstream_sim, example_tool calls reach a local simulator."""
+    results = await run_benchmark(
+        BenchConfig(
+            mix="example_tool",
+            concurrency=4,
+            duration=0.3,
+            warmup=0.0,
+            distinct_queries=10_000,
+            upstream_sim="latency=fixed,latency_ms=2,seed=1",
+        )
+    )
+    assert results["total"]["errors"] == 0
+    assert results["upstream"]["stats"]["requests"] > 0
+    assert results["upstream"]["config"]["latency_ms"] == 2.0
+    with pytest.raises(ValueError):
+        await run_benchmark(BenchConfig(target="http://x/mcp/", upstream_sim=""))
@@ -0,0 +1,168 @@
+"""Tests for the batched, queue-backed log sink."""
+
+import gzip
+import json
+import os
+import re
+import threading
+from pathlib import Path
+
+import pytest
+from loguru import logger
+
+from src.core.log_sink import BatchingFileSink
+
+
+def _add(sink: BatchingFileSink) -> int:
+    return logger.add(sink, format="{message}", filter=lambda r: bool(r["extra"].get("sink_test")))
+
+
+def test_records_are_written_as_serialized_json(tmp_path: Path) -> None:
+    """Records keep loguru's serialize=True layout, including exceptions."""
+    sink = BatchingFileSink(str(tmp_path / "info.log"))
+    handler_id = _add(sink)
+    log = logger.bind(sink_test=True)
+    try:
+        log.info("hello {}", "world")
+        try:
+            raise ZeroDivisionError("division by zero")
+        except ZeroDivisionError:
+            log.exception("boom")
+        sink.drain()
+    finally:
+        logger.remove(handler_id)
+
+    lines = [json.loads(line) for line in (tmp_path / "info.log").read_text().splitlines()]
+    assert [line["record"]["message"] for line in lines] == ["hello world", "boom"]
+    assert lines[0]["record"]["level"]["name"] == "INFO"
+    assert lines[0]["record"]["extra"] == {"sink_test": True}
+    assert lines[0]["text"].endswith("- hello world\n")
+    assert lines[1]["record"]["exception"]["type"] == "ZeroDivisionError"
+    assert "ZeroDivisionError: division by zero" in lines[1]["text"]
+    assert sink.stats()["written"] == 2
+
+
+def test_writes_are_batched(tmp_path: Path) -> None:
+    """Records queued while the writer is busy go out in a single write."""
+    sink = BatchingFileSink(str(tmp_path / "info.log"), batch_size=500, flush_interval=0.01)
+    handler_id = _add(sink)
+    log = logger.bind(sink_test=True)
+    try:
+        # Hold the writer so everything below lands in the queue first.
+        gate = threading.Event()
+        original = sink._write_batch  # pylint: disable=protected-access
+
+        def slow_write(batch):  # type: ignore
+            gate.wait(2)
+            original(batch)
+
+        sink._write_batch = slow_write  # type: ignore  # pylint: disable=protected-access
+        log.info("first")
+        for i in range(100):
+            log.info("record {}", i)
+        gate.set()
+        sink.drain()
+    finally:
+        logger.remove(handler_id)
+
+    assert sink.stats()["written"] == 101
+    assert sink.stats()["batches"] <= 3
+
+
+def test_full_queue_drops_and_counts(tmp_path: Path) -> None:
+    """With the drop policy, callers never wait on a full queue."""
+    sink = BatchingFileSink(str(tmp_path / "info.log"), queue_size=5)
+    gate = threading.Event()
+    original = sink._write_batch  # pylint: disable=protected-access
+
+    def blocked_write(batch):  # type: ignore
+        gate.wait(2)
+        original(batch)
+
+    sink._write_batch = blocked_write  # type: ignore  # pylint: disable=protected-access
+    handler_id = _add(sink)
+    log = logger.bind(sink_test=True)
+    try:
+        for i in range(50):
+            log.info("record {}", i)
+        stats = sink.stats()
+        assert stats["dropped"] > 0
+        assert stats["queued"] <= 5
+        gate.set()
+        sink.drain()
+    finally:
+        logger.remove(handler_id)
+    assert sink.stats()["written"] + sink.stats()["dropped"] == 50
+
+
+def test_size_rotation_compresses_in_background(tmp_path: Path) -> None:
+    """Files are rotated by size, gzipped and pruned to backup_count."""
+    path = tmp_path / "info.log"
+    sink = BatchingFileSink(str(path), max_bytes=2_000, backup_count=2, batch_size=1)
+    handler_id = _add(sink)
+    log = logger.bind(sink_test=True)
+    try:
+        for i in range(40):
+            log.info("record {} {}", i, "x" * 100)
+        sink.drain()
+    finally:
+        logger.remove(handler_id)  # stops the sink and waits for compression
+
+    backups = sorted(name for name in os.listdir(tmp_path) if name.endswith(".log.gz"))
+    assert sink.stats()["rotations"] >= 3
+    assert len(backups) == 2
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".log") and name != "info.log"]
+    assert path.stat().st_size <= 2_000
+    with gzip.open(tmp_path / backups[-1], "rt") as rotated:
+        assert json.loads(rotated.readline())["record"]["message"].startswith("record")
+
+
+def test_invalid_overflow_policy(tmp_path: Path) -> None:
+    """Only the documented overflow policies are accepted."""
+    with pytest.raises(ValueError):
+        BatchingFileSink(str(tmp_path / "info.log"), overflow="spill")
+
+
+def test_exceptions_keep_backtrace_and_diagnose(tmp_path: Path) -> None:
+    """Tracebacks are rendered with the handler's diagnose option."""
+    sink = BatchingFileSink(str(tmp_path / "error.log"))
+    handler_id = logger.add(
+        sink,
+        format="{message}",
+        filter=lambda r: bool(r["extra"].get("sink_test")),
+        backtrace=True,
+        diagnose=True,
+    )
+    log = logger.bind(sink_test=True)
+
+    def divide(numerator: int, denominator: int) -> float:
+        return numerator / denominator
+
+    try:
+        try:
+            divide(7, 0)
+        except ZeroDivisionError:
+            log.exception("boom")
+        sink.drain()
+    finally:
+        logger.remove(handler_id)
+
+    text = json.loads((tmp_path / "error.log").read_text())["text"]
+    assert "- boom\n" in text
+    # diagnose annotates the failing line with the values of its variables.
+    assert re.search(r"(└|->) 0\n", text) and re.search(r"(└|->) 7\n", text)
+
+
+def test_fork_replaces_the_compression_lock(tmp_path: Path) -> None:
+    """A child forked while a compression holds the lock can still rotate."""
+    sink = BatchingFileSink(str(tmp_path / "info.log"))
+    try:
+        with sink._compress_lock:  # pylint: disable=protected-access
+            pid = os.fork()
+            if pid == 0:  # pragma: no cover - child
+                lock = sink._compress_lock  # pylint: disable=protected-access
+                os._exit(0 if lock.acquire(timeout=1) else 1)  # pylint: disable=protected-access
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+    finally:
+        sink.stop()
@@ -0,0 +1,149 @@
+"""Tests for request-scoped log aggregation and sampling."""
+
+from typing import Any, Dict, Iterator, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from loguru import logger
+from mcp.server.lowlevel.server import request_ctx
+from mcp.shared.context import RequestContext
+from starlette.requests import Request
+
+from src.core.request_log import (
+    RequestLog,
+    RequestLogMiddleware,
+    current_request_log,
+    log_event,
+    sample_rate,
+)
+
+
+@pytest.fixture
+def records() -> Iterator[List[Dict[str, Any]]]:
+    """Capture the request summary records emitted by the middleware."""
+    captured: List[Dict[str, Any]] = []
+    handler_id = logger.add(
+        lambda message: captured.append(dict(message.record)),
+        filter=lambda record: "request" in record["extra"],
+        level="DEBUG",
+    )
+    yield captured
+    logger.remove(handler_id)
+
+
+@pytest.fixture
+def client() -> TestClient:
+    """App whose endpoints record phase events."""
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items() -> Dict[str, int]:
+        log_event("auth.verified", cached=True)
+        log_event("inventory.page", items=3)
+        return {"items": 3}
+
+    @app.get("/missing")
+    async def missing() -> None:
+        raise HTTPException(status_code=404, detail="nope")
+
+    @app.get("/tool-error")
+    async def tool_error() -> Dict[str, str]:
+        log_event("tool.error", failed=True, tool="x")
+        return {"ok": "but failed"}
+
+    app.add_middleware(RequestLogMiddleware)
+    return TestClient(app)
+
+
+def test_one_record_per_request(client: TestClient, records: List[Dict[str, Any]]) -> None:
+    """All phase events of a request end up in a single record."""
+    with patch("src.core.request_log.settings.log_sample_rate", 1.0):
+        assert client.get("/items").status_code == 200
+
+    assert len(records) == 1
+    summary = records[0]["extra"]["request"]
+    assert records[0]["level"].name == "INFO"
+    assert summary["path"] == "/items"
+    assert summary["status"] == 200
+    assert [event["phase"] for event in summary["events"]] == ["auth.verified", "inventory.page"]
+    assert summary["events"][1]["items"] == 3
+    assert summary["events"][0]["ms"] <= summary["events"][1]["ms"] <= summary["duration_ms"]
+
+
+def test_successful_requests_are_sampled(
+    client: TestClient, records: List[Dict[str, Any]]
+) -> None:
+    """With a zero rate, successful requests produce no record at all."""
+    with patch("src.core.request_log.settings.log_sample_rate", 0.0):
+        for _ in range(5):
+            client.get("/items")
+    assert records == []
+
+
+def test_errors_are_never_sampled_out(
+    client: TestClient, records: List[Dict[str, Any]]
+) -> None:
+    """Rejected and failed requests keep their full detail."""
+    with patch("src.core.request_log.settings.log_sample_rate", 0.0):
+        client.get("/missing")
+        client.get("/tool-error")
+
+    assert [record["level"].name for record in records] == ["WARNING", "ERROR"]
+    assert records[0]["extra"]["request"]["status"] == 404
+    assert records[1]["extra"]["request"]["events"][0]["tool"] == "x"
+
+
+def test_slow_requests_are_always_logged(
+    client: TestClient, records: List[Dict[str, Any]]
+) -> None:
+    """Requests over the slow threshold bypass sampling."""
+    with patch("src.core.request_log.settings.log_sample_rate", 0.0), patch(
+        "src.core.request_log.settings.log_slow_request_ms", 0.0
+    ):
+        client.get("/items")
+    assert len(records) == 1
+
+
+def test_per_route_sample_rates() -> None:
+    """The longest matching prefix decides the rate."""
+    rates = {"/mcp": 0.01, "/mcp/admin": 1.0}
+    with patch("src.core.request_log.settings.log_sample_rates", rates), patch(
+        "src.core.request_log.settings.log_sample_rate", 0.5
+    ):
+        assert sample_rate("/mcp/") == 0.01
+        assert sample_rate("/mcp/admin/x") == 1.0
+        assert sample_rate("/docs") == 0.5
+
+
+def test_events_outside_a_request_are_lazy_debug_logs() -> None:
+    """Without a request, events go to DEBUG and are not formatted eagerly."""
+    captured: List[str] = []
+    handler_id = logger.add(captured.append, level="DEBUG", format="{message}")
+    try:
+        log_event("store.loaded", records=10)
+    finally:
+        logger.remove(handler_id)
+    assert captured == ["store.loaded {'records': 10}\n"]
+
+
+def test_mcp_request_context_takes_precedence() -> None:
+    """Tool events attach to the request carried by the MCP request context."""
+    request_log = RequestLog("POST", "/mcp/")
+    request = Request({"type": "http", "state": {"request_log": request_log}})
+    token = request_ctx.set(
+        RequestContext(
+            request_id=1,
+            meta=None,
+            session=MagicMock(),
+            lifespan_context=None,
+            request=request,
+        )
+    )
+    try:
+        assert current_request_log() is request_log
+        log_event("tool.start", tool="list_inventory_json")
+    finally:
+        request_ctx.reset(token)
+    assert request_log.events[0]["tool"] == "list_inventory_json"
@@ -0,0 +1,196 @@
+"""Tests for the JWKS key provider and its use by the JWT middleware."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+from unittest.mock import patch
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.middleware.jwks import JWKSKeyProvider
+from src.middleware.jwt_bearer import (  # type: ignore[attr-defined]
+    JWTMiddleware,
+    token_cache,
+)
+
+
+def _keypair(kid: str) -> Tuple[rsa.RSAPrivateKey, Dict[str, Any]]:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update(kid=kid, use="sig", alg="RS256")
+    return private_key, jwk
+
+
+@pytest.fixture(scope="module")
+def keys() -> Dict[str, Tuple[rsa.RSAPrivateKey, Dict[str, Any]]]:
+    """Two signing keys, generated once for the module."""
+    return {"k1": _keypair("k1"), "k2": _keypair("k2")}
+
+
+@pytest.fixture
+def jwks_server() -> Iterator[Tuple[str, Dict[str, Any], List[float]]]:
+    """Local stub serving a mutable JWKS document and recording fetches."""
+    document: Dict[str, Any] = {"keys": []}
+    fetches: List[float] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # pylint: disable=invalid-name
+            fetches.append(time.monotonic())
+            body = json.dumps(document).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/jwks.json", document, fetches
+    server.shutdown()
+    server.server_close()
+
+
+def _wait_for(condition: Any, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def test_file_source_indexes_keys_by_kid(tmp_path: Path, keys: Dict[str, Any]) -> None:
+    """Keys from a JWKS file are parsed once and looked up by kid."""
+    path = tmp_path / "jwks.json"
+    path.write_text(
+        json.dumps(
+            {"keys": [keys["k1"][1], keys["k2"][1], {**keys["k2"][1], "kid": "enc", "use": "enc"}]}
+        )
+    )
+    provider = JWKSKeyProvider(str(path))
+    provider.start()
+    try:
+        assert provider.stats()["keys"] == 2
+        assert provider.get_key("k1") is not None
+        assert provider.get_key("enc") is None
+        # Ambiguous without a kid once there is more than one key.
+        assert provider.get_key(None) is None
+    finally:
+        provider.close()
+
+
+def test_unknown_kid_triggers_one_rate_limited_refresh(
+    jwks_server: Tuple[str, Dict[str, Any], List[float]], keys: Dict[str, Any]
+) -> None:
+    """Concurrent lookups of a new kid cause a single background fetch."""
+    url, document, fetches = jwks_server
+    document["keys"] = [keys["k1"][1]]
+    provider = JWKSKeyProvider(url, refresh_interval=3600, min_refresh_interval=60)
+    provider.start()
+    try:
+        assert len(fetches) == 1
+        document["keys"] = [keys["k1"][1], keys["k2"][1]]
+
+        results: List[Any] = []
+        threads = [
+            threading.Thread(target=lambda: results.append(provider.get_key("k2")))
+            for _ in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # The lookups never wait for the network.
+        assert results == [None] * 20
+        _wait_for(lambda: provider.get_key("k2") is not None)
+        assert len(fetches) == 2
+
+        # Within the rate limit, unknown kids do not fetch again.
+        assert provider.get_key("forged") is None
+        time.sleep(0.1)
+        assert len(fetches) == 2
+        assert provider.stats()["forced_refreshes"] == 1
+    finally:
+        provider.close()
+
+
+def test_failed_refresh_keeps_previous_keys(tmp_path: Path, keys: Dict[str, Any]) -> None:
+    """A broken document does not drop the keys already loaded."""
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps({"keys": [keys["k1"][1]]}))
+    provider = JWKSKeyProvider(str(path))
+    assert provider.refresh()
+    path.write_text("{not json")
+    assert not provider.refresh()
+    assert provider.get_key("k1") is not None
+    assert provider.stats()["failures"] == 1
+
+
+def test_background_refresh_picks_up_rotation(
+    jwks_server: Tuple[str, Dict[str, Any], List[float]], keys: Dict[str, Any]
+) -> None:
+    """The periodic refresh replaces the key index without any request."""
+    url, document, _ = jwks_server
+    document["keys"] = [keys["k1"][1]]
+    provider = JWKSKeyProvider(url, refresh_interval=0.05, jitter=0.5)
+    provider.start()
+    try:
+        document["keys"] = [keys["k2"][1]]
+        _wait_for(lambda: "k2" in provider._keys)  # pylint: disable=protected-access
+        assert provider.get_key("k1") is None
+    finally:
+        provider.close()
+
+
+def test_middleware_verifies_tokens_with_jwks(
+    tmp_path: Path, keys: Dict[str, Any]
+) -> None:
+    """Tokens are verified with the key named by their kid header."""
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps({"keys": [keys["k1"][1], keys["k2"][1]]}))
+    provider = JWKSKeyProvider(str(path))
+    provider.start()
+    token_cache.clear()
+
+    app = FastAPI()
+
+    @app.get("/secure")
+    async def secure(request: Request) -> Dict[str, Any]:
+        return {"user_info": request.state.user_info}
+
+    app.add_middleware(JWTMiddleware)
+    client = TestClient(app)
+    claims = {"UserInfo": {"id": "jwks"}}
+
+    def token(kid: str, signer: str) -> str:
+        return jwt.encode(claims, keys[signer][0], algorithm="RS256", headers={"kid": kid})
+
+    try:
+        with patch("src.middleware.jwt_bearer.get_jwks_provider", return_value=provider):
+            ok = client.get("/secure", headers={"Authorization": f"Bearer {token('k2', 'k2')}"})
+            assert ok.status_code == 200
+            assert ok.json() == {"user_info": claims["UserInfo"]}
+
+            wrong_key = client.get(
+                "/secure", headers={"Authorization": f"Bearer {token('k1', 'k2')}"}
+            )
+            assert wrong_key.status_code == 401
+
+            unknown = client.get(
+                "/secure", headers={"Authorization": f"Bearer {token('k9', 'k1')}"}
+            )
+            assert unknown.status_code == 401
+            assert "unknown signing key" in unknown.json()["detail"]
+    finally:
+        provider.close()
+        token_cache.clear()
@@ -5,18 +5,23 @@ Tests for JWTMiddleware.
 """
 
 from unittest.mock import patch
-from typing import Dict, Any
+from typing import Any, AsyncIterator, Dict
 
 import pytest
 from fastapi import FastAPI, Request
 from fastapi.testclient import TestClient
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials
 import jwt
 from httpx import RequestError
 from starlette import status
 
-from src.middleware.jwt_bearer import JWTMiddleware  # type: ignore[attr-defined]
+from src.middleware.jwt_bearer import (  # type: ignore[attr-defined]
+    JWTMiddleware,
+    TokenCache,
+    get_verification_key,
+    token_cache,
+)
 from src.core.config import settings
 
 app = FastAPI()
@@ -31,6 +36,12 @@ async def secure_endpoint(request: Request) -> Dict[str, Any]:
 app.add_middleware(JWTMiddleware)
 
 
+@pytest.fixture(autouse=True)
+def clear_token_cache() -> None:
+    """Start every test with a cold verified-token cache."""
+    token_cache.clear()
+
+
 @pytest.fixture
 def client() -> TestClient:
     """Fixture to provide a test client for the FastAPI app."""
@@ -156,23 +167,79 @@ def test_request_error_in_middleware() -> None:
     test_app.add_middleware(JWTMiddleware)
     test_client = TestClient(test_app)
 
-    with patch.object(JWTMiddleware, "dispatch") as mock_dispatch:
-        # pylint: disable=unused-argument
-        async def side_effect(request, call_next):  # type: ignore
-            try:
-                raise RequestError("Network error")
-            except RequestError:
-                return JSONResponse(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    content={"detail": "Internal server error"},
-                )
-
-        mock_dispatch.side_effect = side_effect
+    with patch(
+        "src.middleware.jwt_bearer.JWTBearer.__call__",
+        side_effect=RequestError("Network error"),
+    ):
         response = test_client.get("/test")
         assert response.status_code == 500
         assert "Internal server error" in response.json()["detail"]
 
 
+def test_streamed_response_passes_through(
+    valid_token_payload: Dict[str, Dict[str, str]]
+) -> None:
+    """Streamed bodies reach the client chunk by chunk, unbuffered."""
+    test_app = FastAPI()
+
+    @test_app.get("/stream")
+    async def stream_endpoint() -> StreamingResponse:
+        async def events() -> AsyncIterator[bytes]:
+            for i in range(3):
+                yield f"data: {i}\n\n".encode()
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    test_app.add_middleware(JWTMiddleware)
+    test_client = TestClient(test_app)
+
+    with patch("jwt.decode", return_value=valid_token_payload):
+        with test_client.stream(
+            "GET", "/stream", headers={"Authorization": "Bearer stream.token"}
+        ) as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/event-stream")
+            chunks = list(response.iter_bytes())
+    assert b"".join(chunks) == b"data: 0\n\ndata: 1\n\ndata: 2\n\n"
+
+
+@pytest.mark.asyncio
+async def test_middleware_hands_send_to_app_unwrapped(
+    valid_token_payload: Dict[str, Dict[str, str]]
+) -> None:
+    """The wrapped app receives the server's own receive/send callables."""
+    seen: Dict[str, Any] = {}
+
+    async def inner_app(scope, receive, send):  # type: ignore
+        seen.update(scope=scope, receive=receive, send=send)
+
+    async def receive():  # type: ignore
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):  # type: ignore
+        pass
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/secure",
+        "raw_path": b"/secure",
+        "query_string": b"",
+        "headers": [(b"cookie", b"Authorization=cookie.token")],
+        "state": {},
+    }
+    middleware = JWTMiddleware(inner_app)
+    with patch("jwt.decode", return_value=valid_token_payload):
+        await middleware(scope, receive, send)
+
+    assert seen["receive"] is receive
+    assert seen["send"] is send
+    assert (b"authorization", b"Bearer cookie.token") in seen["scope"]["headers"]
+    # The caller's scope is left as it was.
+    assert scope["headers"] == [(b"cookie", b"Authorization=cookie.token")]
+    assert seen["scope"]["state"]["user_info"] == valid_token_payload["UserInfo"]
+
+
 def test_header_injection_logic(
     client: TestClient, valid_token_payload: Dict[str, Dict[str, str]]
 ) -> None:
@@ -295,3 +362,72 @@ def test_empty_token() -> None:
         response = test_client.get("/test", headers={"Authorization": "Bearer "})
         assert response.status_code == 401
         assert "Invalid authorization code" in response.json()["detail"]
+
+
+def test_warm_token_skips_verification(
+    client: TestClient, valid_token_payload: Dict[str, Dict[str, str]]
+) -> None:
+    """A verified token is served from the cache on later requests."""
+    with patch("jwt.decode", return_value=valid_token_payload) as mock_decode:
+        for _ in range(3):
+            response = client.get(
+                "/secure", headers={"Authorization": "Bearer warm.token.here"}
+            )
+            assert response.status_code == 200
+            assert response.json() == {"user_info": valid_token_payload["UserInfo"]}
+        mock_decode.assert_called_once()
+
+
+def test_rejected_tokens_are_not_cached(client: TestClient) -> None:
+    """Tokens failing the user info check are verified again next time."""
+    with patch("jwt.decode", return_value={}) as mock_decode:
+        for _ in range(2):
+            response = client.get(
+                "/secure", headers={"Authorization": "Bearer no.userinfo"}
+            )
+            assert response.status_code == 401
+        assert mock_decode.call_count == 2
+
+
+def test_token_cache_respects_exp_and_size() -> None:
+    """Entries expire at exp and the cache evicts least recently used tokens."""
+    cache = TokenCache(max_entries=2, max_ttl=60)
+    cache.put("expired", {"UserInfo": {}, "exp": 1})
+    assert cache.get("expired") is None
+
+    cache.put("a", {"UserInfo": {"id": "a"}})
+    cache.put("b", {"UserInfo": {"id": "b"}})
+    assert cache.get("a") is not None
+    cache.put("c", {"UserInfo": {"id": "c"}})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_real_rs256_token_with_parsed_key() -> None:
+    """A PEM public key is parsed once and verifies real RS256 tokens."""
+    # pylint: disable=import-outside-toplevel
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_pem = (
+        private_key.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+    token = jwt.encode({"UserInfo": {"id": "rsa"}}, private_key, algorithm="RS256")
+
+    key = get_verification_key(public_pem, "RS256")
+    assert not isinstance(key, str)
+    assert get_verification_key(public_pem, "RS256") is key
+
+    with patch.object(settings, "enterprise_auth_public_key", public_pem):
+        response = TestClient(app).get(
+            "/secure", headers={"Authorization": f"Bearer {token}"}
+        )
+    assert response.status_code == 200
+    assert response.json() == {"user_info": {"id": "rsa"}}
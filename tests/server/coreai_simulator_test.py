@@ -0,0 +1,135 @@
+# pylint: disable=redefined-outer-name
+"""Tests for the local CoreAI upstream simulator."""
+
+import json
+import random
+import statistics
+from typing import Any, Dict, Iterator
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.schemas.example_tool import ExampleToolInput
+from src.server.coreai_simulator import (
+    SERVICE_PATH,
+    CoreAISimulator,
+    SimulatorConfig,
+    SimulatorServer,
+)
+from src.tools.impl.example_tool import ExampleTool
+from src.utils.http_client import UpstreamClientRegistry, get_upstream_clients
+
+
+@pytest.fixture
+def upstream() -> Iterator[SimulatorServer]:
+    """Simulator listening on a free local port."""
+    with SimulatorServer() as server:
+        yield server
+
+
+def _client(simulator: CoreAISimulator) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=simulator.app), base_url="http://sim"
+    )
+
+
+def test_config_spec_and_validation() -> None:
+    """Specs are parsed by field type; bad values are rejected."""
+    config = SimulatorConfig.from_spec("latency=lognormal, latency_ms=50, error_rate=0.1,seed=3")
+    assert (config.latency, config.latency_ms, config.error_rate, config.seed) == (
+        "lognormal", 50.0, 0.1, 3
+    )
+    for spec in ("latency=pareto", "error_rate=1.5", "bogus=1"):
+        with pytest.raises(ValueError):
+            SimulatorConfig.from_spec(spec)
+
+
+def test_latency_distributions() -> None:
+    """Samples follow the configured distribution, capped at latency_max_ms."""
+    rng = random.Random(1)
+    lognormal = SimulatorConfig(latency="lognormal", latency_ms=50, latency_sigma=1.0)
+    samples = sorted(lognormal.sample_latency(rng) for _ in range(5000))
+    assert statistics.median(samples) == pytest.approx(0.05, rel=0.1)
+    assert samples[int(len(samples) * 0.99)] > 0.4  # a heavy tail
+
+    uniform = SimulatorConfig(latency="uniform", latency_ms=10, latency_max_ms=20)
+    assert all(0.01 <= uniform.sample_latency(rng) <= 0.02 for _ in range(100))
+    capped = SimulatorConfig(latency="exponential", latency_ms=100, latency_max_ms=5)
+    assert max(capped.sample_latency(rng) for _ in range(100)) == 0.005
+    assert SimulatorConfig(latency_ms=7).sample_latency(rng) == 0.007
+
+
+@pytest.mark.asyncio
+async def test_payload_size_and_query_echo() -> None:
+    """Successful bodies have the configured size and echo the query."""
+    simulator = CoreAISimulator(SimulatorConfig(payload_bytes=4096))
+    async with _client(simulator) as client:
+        response = await client.get(SERVICE_PATH, params={"query": "socks"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["query"] == "socks"
+    assert abs(len(response.content) - 4096) < 300
+    assert simulator.stats()["requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_injected_errors_and_runtime_config() -> None:
+    """Error injection and reconfiguration work through the control routes."""
+    simulator = CoreAISimulator()
+    async with _client(simulator) as client:
+        response = await client.post("/_simulator/config", json={"error_rate": 1.0})
+        assert response.json()["error_rate"] == 1.0
+        assert (await client.get(SERVICE_PATH)).status_code == 503
+
+        response = await client.post("/_simulator/config", json={"nope": 1})
+        assert response.status_code == 400
+        stats = (await client.get("/_simulator/stats")).json()
+    assert stats["requests"] == 1
+    assert stats["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hanging_upstream_trips_the_read_timeout(upstream: SimulatorServer) -> None:
+    """Hanging requests surface as read timeouts in the shared clients."""
+    upstream.simulator.configure(timeout_rate=1.0, hang_seconds=5.0)
+    registry = UpstreamClientRegistry(
+        limits=httpx.Limits(max_connections=2), timeout=0.2, connect_timeout=1.0, http2=False
+    )
+    url = f"{upstream.url}{SERVICE_PATH}"
+    with pytest.raises(httpx.ReadTimeout):
+        await registry.client_for(url).get(url)
+    assert registry.stats()[upstream.url]["errors"] == 1
+    assert upstream.simulator.stats()["timeouts"] == 1
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_example_tool_against_the_simulator(upstream: SimulatorServer) -> None:
+    """ExampleTool reaches the simulator; repeated calls are served from cache."""
+    upstream.simulator.configure(latency_ms=5)
+    ExampleTool.response_cache.clear()
+    tool = ExampleTool()
+    headers = {"authorization": "Bearer token"}
+
+    async def cached_call(query: str) -> Dict[str, Any]:
+        input_data = ExampleToolInput(query=query, workspace_id="w1", workflow_id=None)
+        result = await tool.response_cache.get_or_compute(
+            tool.cache_key(input_data, headers),
+            lambda: tool.execute(input_data, headers),
+            tool.is_cacheable,
+        )
+        return json.loads(result)
+
+    with patch("src.tools.impl.example_tool.settings.enterprise_base_url", upstream.url):
+        first = await cached_call("socks")
+        await cached_call("socks")
+        upstream.simulator.configure(error_rate=1.0)
+        failed = await cached_call("shoes")
+
+    assert first["data"]["results"]["query"] == "socks"
+    assert "error" in failed
+    assert upstream.simulator.stats()["requests"] == 2
+    ExampleTool.response_cache.clear()
+    # The shared clients are bound to this test's event loop.
+    await get_upstream_clients().aclose()
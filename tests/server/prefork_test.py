@@ -0,0 +1,121 @@
+"""Tests for the pre-fork production server."""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+from typing import Iterator, Set, Tuple
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.server.prefork import resolve_workers
+
+SERVER_SCRIPT = textwrap.dedent(
+    """
+    import gc, os, sys
+    import uvicorn
+    from src.server.prefork import PreforkServer
+
+    state = {}
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        body = f"{os.getpid()} {state['warm']} {gc.get_freeze_count() > 0}".encode()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": body})
+
+    def warm_up():
+        state["warm"] = os.getpid()
+
+    def on_worker_stop():
+        with open(sys.argv[2], "a") as f:
+            f.write(f"{os.getpid()}\\n")
+
+    PreforkServer(
+        uvicorn.Config(app, host="127.0.0.1", port=int(sys.argv[1]), log_level="warning"),
+        workers=2,
+        max_requests=3,
+        warm_up=warm_up,
+        on_worker_stop=on_worker_stop,
+    ).run()
+    """
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def prefork_server(
+    tmp_path: Path,
+) -> Iterator[Tuple[str, subprocess.Popen[bytes]]]:
+    """Run a two-worker server with a tiny ASGI app in a subprocess.
+
+    Workers append their pid to ``stopped.txt`` in ``tmp_path`` on the way out.
+    """
+    port = _free_port()
+    process = subprocess.Popen(  # pylint: disable=consider-using-with
+        [sys.executable, "-c", SERVER_SCRIPT, str(port), str(tmp_path / "stopped.txt")],
+        cwd=os.getcwd(),
+    )
+    url = f"http://127.0.0.1:{port}/"
+    deadline = time.monotonic() + 20
+    while True:
+        try:
+            httpx.get(url, timeout=1)
+            break
+        except httpx.TransportError:
+            assert process.poll() is None, "server exited during startup"
+            assert time.monotonic() < deadline, "server did not start"
+            time.sleep(0.1)
+    yield url, process
+    if process.poll() is None:
+        process.kill()
+        process.wait()
+
+
+def test_resolve_workers() -> None:
+    """Zero means one worker per available CPU."""
+    assert resolve_workers(3) == 3
+    with patch("src.server.prefork.os.sched_getaffinity", return_value={0, 1, 2, 3}):
+        assert resolve_workers(0) == 4
+
+
+def test_workers_share_preloaded_state_and_recycle(
+    prefork_server: Tuple[str, subprocess.Popen[bytes]], tmp_path: Path
+) -> None:
+    """Workers fork after warm-up with a frozen heap and are replaced after max_requests."""
+    url, process = prefork_server
+    pids: Set[str] = set()
+    for _ in range(20):
+        # New connection per request so both workers get traffic. A worker
+        # leaving at max_requests drops connections it accepted but did not
+        # read yet; clients retry those like any idempotent request.
+        try:
+            response = httpx.get(url, headers={"Connection": "close"}, timeout=5)
+        except (httpx.RemoteProtocolError, httpx.ReadError):
+            response = httpx.get(url, headers={"Connection": "close"}, timeout=5)
+        pid, warmed_by, frozen = response.text.split()
+        assert pid != warmed_by
+        assert warmed_by == str(process.pid)
+        assert frozen == "True"
+        pids.add(pid)
+
+    # Each worker serves at most 3 requests, so 20 requests need several.
+    assert len(pids) >= 4
+
+    process.send_signal(signal.SIGTERM)
+    assert process.wait(timeout=10) == 0
+    # Recycled and terminated workers alike ran the stop hook.
+    stopped = set((tmp_path / "stopped.txt").read_text().split())
+    assert pids <= stopped
@@ -0,0 +1,119 @@
+"""Tests for per-tool bulkheads."""
+
+import asyncio
+import json
+import time
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from fastmcp import Client, FastMCP
+from fastmcp.exceptions import ToolError
+
+from src.tools.meta.bulkhead import (
+    Bulkhead,
+    ToolOverloadedError,
+    bulkhead,
+    bulkhead_stats,
+    get_bulkhead,
+)
+from src.utils.metrics import TOOL_REJECTED, instrument_tool
+
+
+async def _sleep(seconds: float) -> float:
+    await asyncio.sleep(seconds)
+    return seconds
+
+
+@pytest.mark.asyncio
+async def test_queue_full_is_rejected_at_once() -> None:
+    """Calls beyond the slots and the queue fail fast with a retryable error."""
+    limiter = Bulkhead("slow_tool", max_concurrent=1, max_queue=1, queue_timeout=5.0)
+    before = TOOL_REJECTED.labels("slow_tool", "queue_full")._value.get()
+    calls = [asyncio.ensure_future(limiter.call(_sleep, 0.1)) for _ in range(4)]
+    started = time.perf_counter()
+    results = await asyncio.gather(*calls, return_exceptions=True)
+
+    assert results[:2] == [0.1, 0.1]
+    rejected = [r for r in results if isinstance(r, ToolOverloadedError)]
+    assert len(rejected) == 2
+    assert json.loads(str(rejected[0]))["retryable"] is True
+    assert rejected[0].reason == "queue_full"
+    assert time.perf_counter() - started < 0.5
+    assert TOOL_REJECTED.labels("slow_tool", "queue_full")._value.get() == before + 2
+    stats = limiter.stats()
+    assert (stats["completed"], stats["rejected_queue_full"], stats["waiting"]) == (2, 2, 0)
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_rejects_waiting_calls() -> None:
+    """A queued call gives up after queue_timeout and releases nothing."""
+    limiter = Bulkhead("timed_tool", max_concurrent=1, max_queue=5, queue_timeout=0.05)
+    running = asyncio.ensure_future(limiter.call(_sleep, 0.2))
+    await asyncio.sleep(0)
+    with pytest.raises(ToolOverloadedError) as excinfo:
+        await limiter.call(_sleep, 0)
+    assert excinfo.value.reason == "queue_timeout"
+    assert await running == 0.2
+    assert await limiter.call(_sleep, 0) == 0
+    assert limiter.stats()["active"] == 0
+
+
+def test_invalid_limits() -> None:
+    """Limits must leave room for at least one call."""
+    with pytest.raises(ValueError):
+        Bulkhead("tool", max_concurrent=0)
+    with pytest.raises(ValueError):
+        Bulkhead("tool", max_concurrent=1, max_queue=-1)
+
+
+def test_settings_override_declared_limits() -> None:
+    """tool_bulkheads replaces the limits declared in code."""
+    overrides = {"tuned_tool": {"max_concurrent": 7, "queue_timeout": 0.5}}
+    with patch("src.tools.meta.bulkhead.settings.tool_bulkheads", overrides):
+
+        @bulkhead(max_concurrent=2, max_queue=3)
+        async def tuned_tool() -> None:
+            """A tool."""
+
+    limiter = get_bulkhead("tuned_tool")
+    assert (limiter.max_concurrent, limiter.max_queue, limiter.queue_timeout) == (7, 3, 0.5)
+    assert bulkhead_stats()["tuned_tool"]["max_concurrent"] == 7
+
+
+@pytest.mark.asyncio
+async def test_saturated_tool_does_not_slow_other_tools() -> None:
+    """Through MCP, shed calls are tool errors and cheap tools stay fast."""
+    mcp: FastMCP[Any] = FastMCP("bulkhead-test")
+    release = asyncio.Event()
+
+    @mcp.tool()
+    @instrument_tool
+    @bulkhead(max_concurrent=2, max_queue=2, queue_timeout=10.0)
+    async def expensive_tool() -> str:
+        await release.wait()
+        return "done"
+
+    @mcp.tool()
+    async def cheap_tool() -> str:
+        return "fast"
+
+    async with Client(mcp) as client:
+        slow = [
+            asyncio.ensure_future(client.call_tool("expensive_tool", {})) for _ in range(8)
+        ]
+        limiter = get_bulkhead("expensive_tool")
+        while limiter.stats()["rejected_queue_full"] < 4:
+            await asyncio.sleep(0.01)
+        assert (limiter.stats()["active"], limiter.stats()["waiting"]) == (2, 2)
+        started = time.perf_counter()
+        assert (await client.call_tool("cheap_tool", {}))[0].text == "fast"
+        cheap_latency = time.perf_counter() - started
+        release.set()
+        results = await asyncio.gather(*slow, return_exceptions=True)
+
+    assert cheap_latency < 0.25
+    errors = [r for r in results if isinstance(r, ToolError)]
+    assert len(errors) == 4
+    assert json.loads(str(errors[0]))["error"] == "overloaded"
+    assert sum(1 for r in results if not isinstance(r, Exception)) == 4
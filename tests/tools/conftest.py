@@ -0,0 +1,39 @@
+# pylint: disable=redefined-outer-name
+"""Shared fixtures for the inventory tool tests.
+
+Modules tailor the ``store`` fixture by overriding ``records`` (the initial
+contents of the data file) and ``store_options`` (extra keyword arguments
+for :class:`InventoryStore`).
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from src.tools.impl.inventory_store import InventoryStore
+
+
+@pytest.fixture
+def records() -> List[Dict[str, Any]]:
+    """Initial contents of the store's data file."""
+    return []
+
+
+@pytest.fixture
+def store_options() -> Dict[str, Any]:
+    """Keyword arguments for the store."""
+    return {}
+
+
+@pytest.fixture
+def store(
+    tmp_path: Path, records: List[Dict[str, Any]], store_options: Dict[str, Any]
+) -> Iterator[InventoryStore]:
+    """Store backed by ``tmp_path / "inventory.json"``."""
+    data_file = tmp_path / "inventory.json"
+    data_file.write_text(json.dumps(records), encoding="utf-8")
+    inventory_store = InventoryStore(str(data_file), **store_options)
+    yield inventory_store
+    inventory_store.close()
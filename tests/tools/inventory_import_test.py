@@ -0,0 +1,128 @@
+# pylint: disable=redefined-outer-name
+"""Tests for the streaming inventory import."""
+
+import csv
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import pytest
+from openpyxl import Workbook
+
+from src.schemas.inventory import InventoryImportInput
+from src.tools.impl.CRUD_tools import MockInventoryTool
+from src.tools.impl.inventory_import import InventoryImport, detect_format, iter_rows
+from src.tools.impl.inventory_store import InventoryStore
+
+DATA = Path(__file__).parents[2] / "src" / "tools" / "impl" / "data" / "retails-mockdata.json"
+
+
+@pytest.fixture
+def rows() -> List[Dict[str, Any]]:
+    """Valid records from the bundled dataset."""
+    return json.loads(DATA.read_text(encoding="utf-8"))[:5]
+
+
+@pytest.fixture
+def store_options() -> Dict[str, Any]:
+    """Leave flushing to close()."""
+    return {"fsync_interval": 3600}
+
+
+def _write_csv(path: Path, rows: List[Dict[str, Any]]) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def test_detect_format() -> None:
+    """Formats come from the suffix unless given."""
+    assert detect_format("a.CSV") == "csv"
+    assert detect_format("a.ndjson") == "jsonl"
+    assert detect_format("a.txt", "xlsx") == "xlsx"
+    with pytest.raises(ValueError):
+        detect_format("a.xls")
+
+
+def test_csv_import_in_batches(
+    tmp_path: Path, store: InventoryStore, rows: List[Dict[str, Any]]
+) -> None:
+    """Valid rows are committed a batch at a time; bad rows are reported."""
+    bad = dict(rows[0], **{"Reg Price": "cheap", "Overstock": ""})
+    path = tmp_path / "items.csv"
+    _write_csv(path, [*rows, bad])
+
+    with InventoryImport(str(path), store, batch_size=2) as importer:
+        assert importer.step()
+        # Only the first batch has been read so far.
+        assert (importer.report.rows, len(store)) == (2, 2)
+        report = importer.run()
+
+    assert (report.rows, report.imported, report.rejected, report.batches) == (6, 5, 1, 3)
+    assert report.errors[0]["row"] == 7
+    assert "Reg Price" in report.errors[0]["error"]
+    assert "Overstock: Field required" in report.errors[0]["error"]
+    assert store.list_items() == rows
+    assert store.version == 3
+
+
+def test_jsonl_import_rejects_malformed_lines(
+    tmp_path: Path, store: InventoryStore, rows: List[Dict[str, Any]]
+) -> None:
+    """Each JSON line is validated on its own; blank lines are skipped."""
+    path = tmp_path / "items.jsonl"
+    lines = [json.dumps(row) for row in rows[:2]] + ["", "{not json", "[1, 2]"]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    with InventoryImport(str(path), store) as importer:
+        report = importer.run()
+
+    assert (report.imported, report.rejected) == (2, 2)
+    assert [error["row"] for error in report.errors] == [4, 5]
+
+
+def test_xlsx_import_and_dry_run(
+    tmp_path: Path, store: InventoryStore, rows: List[Dict[str, Any]]
+) -> None:
+    """Workbooks stream through openpyxl; a dry run changes nothing."""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(list(rows[0]))
+    for row in rows:
+        sheet.append(list(row.values()))
+    sheet.append([None] * len(rows[0]))
+    path = tmp_path / "items.xlsx"
+    workbook.save(path)
+
+    assert [number for number, _ in iter_rows(str(path))] == [2, 3, 4, 5, 6]
+    with InventoryImport(str(path), store, dry_run=True) as importer:
+        report = importer.run()
+    assert (report.imported, len(store)) == (5, 0)
+
+    with InventoryImport(str(path), store) as importer:
+        importer.run()
+    assert store.list_items() == rows
+
+
+@pytest.mark.asyncio
+async def test_import_tool_is_confined_to_the_import_dir(
+    tmp_path: Path, store: InventoryStore, rows: List[Dict[str, Any]]
+) -> None:
+    """The MCP tool reads only files in inventory_import_dir."""
+    imports = tmp_path / "imports"
+    imports.mkdir()
+    _write_csv(imports / "items.csv", rows)
+    tool = MockInventoryTool(store)
+
+    with patch("src.tools.impl.CRUD_tools.settings.inventory_import_dir", ""):
+        with pytest.raises(ValueError, match="disabled"):
+            await tool.import_file(InventoryImportInput(path="items.csv"))
+    with patch("src.tools.impl.CRUD_tools.settings.inventory_import_dir", str(imports)):
+        with pytest.raises(ValueError, match="outside"):
+            await tool.import_file(InventoryImportInput(path="../inventory.json"))
+        report = await tool.import_file(InventoryImportInput(path="items.csv", batch_size=2))
+
+    assert (report["imported"], report["batches"]) == (5, 3)
+    assert len(store) == 5
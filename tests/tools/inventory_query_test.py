@@ -0,0 +1,156 @@
+# pylint: disable=redefined-outer-name
+"""Tests for the inventory query engine."""
+
+import json
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.schemas.inventory import InventoryQueryInput
+from src.tools.impl.inventory_query import InventoryQueryTool, run_query
+from src.tools.impl.inventory_store import InventoryStore
+
+RECORDS: List[Dict[str, Any]] = [
+    {"Item": "Speaker", "Product Category": "Electronics", "Forecasted Demand": 250},
+    {"Item": "Mower", "Product Category": "Home & Garden", "Forecasted Demand": 80},
+    {"Item": "Laptop", "Product Category": "Electronics", "Forecasted Demand": 300},
+    {"Item": "Kettle", "Product Category": "Kitchen", "Forecasted Demand": None},
+]
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    """Sample inventory as a DataFrame."""
+    return pd.DataFrame.from_records(RECORDS)
+
+
+def _query(**kwargs: Any) -> InventoryQueryInput:
+    return InventoryQueryInput.model_validate(kwargs)
+
+
+def test_filter_sort_project_limit(frame: pd.DataFrame) -> None:
+    """Predicates are AND-ed, then sorted, limited and projected."""
+    result = run_query(
+        frame,
+        _query(
+            where=[
+                {"column": "Product Category", "op": "==", "value": "Electronics"},
+                {"column": "Forecasted Demand", "op": ">", "value": 200},
+            ],
+            select=["Item"],
+            order_by=[{"column": "Forecasted Demand", "descending": True}],
+            limit=1,
+        ),
+    )
+    assert result["items"] == [{"Item": "Laptop"}]
+    assert result["matched"] == 2
+    assert result["next_cursor"] is not None
+
+
+def test_pages_follow_the_sort_order(frame: pd.DataFrame) -> None:
+    """Pages continue the same query and are bounded by the page size."""
+    query = {"order_by": [{"column": "Forecasted Demand"}], "select": ["Item"]}
+    items: List[str] = []
+    cursor = None
+    while True:
+        page = run_query(frame, _query(**query, limit=2, cursor=cursor), version=1)
+        items.extend(row["Item"] for row in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert items == ["Mower", "Speaker", "Laptop", "Kettle"]
+
+    first = run_query(frame, _query(**query, limit=2), version=1)
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        run_query(frame, _query(limit=2, cursor=first["next_cursor"]), version=1)
+    with pytest.raises(ValueError, match="Stale cursor"):
+        run_query(frame, _query(**query, cursor=first["next_cursor"]), version=2)
+
+
+def test_default_and_maximum_page_size(frame: pd.DataFrame) -> None:
+    """Unbounded queries are served a page at a time."""
+    with pytest.MonkeyPatch.context() as patch_settings:
+        patch_settings.setattr("src.utils.pagination.settings.inventory_page_size", 3)
+        patch_settings.setattr(
+            "src.utils.pagination.settings.inventory_max_page_size", 2
+        )
+        assert len(run_query(frame, _query())["items"]) == 3
+        assert len(run_query(frame, _query(limit=100))["items"]) == 2
+
+
+@pytest.mark.parametrize(
+    "predicate, expected",
+    [
+        ({"op": "in", "value": ["Mower", "Kettle"]}, ["Mower", "Kettle"]),
+        ({"op": "contains", "value": "TOP"}, ["Laptop"]),
+        ({"op": "!=", "value": "Speaker"}, ["Mower", "Laptop", "Kettle"]),
+    ],
+)
+def test_string_operators(
+    frame: pd.DataFrame, predicate: Dict[str, Any], expected: List[str]
+) -> None:
+    """Set membership, substring and inequality filters."""
+    result = run_query(frame, _query(where=[{"column": "Item", **predicate}]))
+    assert [row["Item"] for row in result["items"]] == expected
+
+
+def test_missing_values_serialize_as_none(frame: pd.DataFrame) -> None:
+    """NaN cells come back as None."""
+    result = run_query(frame, _query(where=[{"column": "Item", "op": "==", "value": "Kettle"}]))
+    assert result["items"][0]["Forecasted Demand"] is None
+    json.dumps(result)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        {"where": [{"column": "Nope", "op": "==", "value": 1}]},
+        {"select": ["Nope"]},
+        {"order_by": [{"column": "Nope"}]},
+        {"where": [{"column": "Item", "op": ">", "value": 3}]},
+        {"where": [{"column": "Item", "op": "==", "value": ["a"]}]},
+    ],
+)
+def test_invalid_queries(frame: pd.DataFrame, query: Dict[str, Any]) -> None:
+    """Unknown columns and incompatible comparisons raise ValueError."""
+    with pytest.raises(ValueError):
+        run_query(frame, _query(**query))
+
+
+@pytest.fixture
+def records() -> List[Dict[str, Any]]:
+    """Sample inventory for the store."""
+    return RECORDS
+
+
+def test_store_frame_tracks_mutations(store: InventoryStore) -> None:
+    """The columnar copy is cached and rebuilt after a mutation."""
+    first = store.frame()
+    assert store.frame() is first
+    store.add({"Item": "Tent", "Product Category": "Outdoor"})
+    assert len(store.frame()) == 5
+
+
+@pytest.mark.asyncio
+async def test_query_tool_against_store(store: InventoryStore) -> None:
+    """The tool queries the JSON inventory store by default."""
+    with patch("src.tools.impl.inventory_query.get_inventory_store", return_value=store):
+        result = await InventoryQueryTool().execute(
+            {"where": [{"column": "Product Category", "op": "==", "value": "Kitchen"}]}
+        )
+    assert result["matched"] == 1
+    assert InventoryQueryTool().name == "query_inventory"
+    assert "where" in InventoryQueryTool().input_schema["properties"]
+
+
+@pytest.mark.asyncio
+async def test_query_tool_against_excel(frame: pd.DataFrame) -> None:
+    """source='excel' queries the cached workbook."""
+    with patch("src.tools.impl.inventory_query.load_inventory", return_value=frame):
+        result = await InventoryQueryTool().execute(
+            InventoryQueryInput(source="excel", limit=2)
+        )
+    assert len(result["items"]) == 2
+    assert result["matched"] == 4
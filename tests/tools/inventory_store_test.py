@@ -0,0 +1,196 @@
+# pylint: disable=redefined-outer-name
+"""Tests for the process-resident inventory store."""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+from pydantic import ValidationError
+
+from src.schemas.inventory import BulkInventoryInput, ListInventoryInput
+from src.tools.impl.CRUD_tools import MockInventoryTool
+from src.tools.impl.inventory_store import BatchValidationError, InventoryStore
+from src.utils.pagination import StaleCursorError
+
+
+@pytest.fixture
+def records() -> List[Dict[str, Any]]:
+    """Small inventory sample."""
+    return [
+        {"Item": "Speaker", "Product Category": "Electronics", "Forecasted Demand": 250},
+        {"Item": "Mower", "Product Category": "Home & Garden", "Forecasted Demand": 80},
+        {"Item": "Laptop", "Product Category": "Electronics", "Forecasted Demand": 300},
+    ]
+
+
+@pytest.fixture
+def store_options() -> Dict[str, Any]:
+    """Flush the log often enough for the tests to observe it."""
+    return {"fsync_interval": 0.01}
+
+
+def test_load_once(store: InventoryStore, tmp_path: Path) -> None:
+    """The backing file is parsed once; later file edits are not re-read."""
+    assert len(store.list_items()) == 3
+    (tmp_path / "inventory.json").write_text("[]", encoding="utf-8")
+    assert len(store.list_items()) == 3
+
+
+def test_missing_and_invalid_file(tmp_path: Path) -> None:
+    """Missing or undecodable files load as an empty inventory."""
+    assert InventoryStore(str(tmp_path / "missing.json")).list_items() == []
+    bad_file = tmp_path / "bad.json"
+    bad_file.write_text("{not json", encoding="utf-8")
+    assert InventoryStore(str(bad_file)).list_items() == []
+
+
+def test_indexes_follow_mutations(store: InventoryStore) -> None:
+    """Item and category indexes reflect add, update and delete."""
+    assert [r["Item"] for r in store.find_by_category("Electronics")] == [
+        "Speaker",
+        "Laptop",
+    ]
+
+    store.add({"Item": "Tent", "Product Category": "Outdoor"})
+    assert store.find_by_item("Tent")[0]["Product Category"] == "Outdoor"
+
+    store.update(0, {"Item": "Speaker", "Product Category": "Audio"})
+    assert [r["Item"] for r in store.find_by_category("Electronics")] == ["Laptop"]
+    assert store.find_by_category("Audio")[0]["Item"] == "Speaker"
+
+    removed = store.delete(1)
+    assert removed is not None and removed["Item"] == "Mower"
+    assert store.find_by_item("Mower") == []
+    assert "Home & Garden" not in store.categories()
+    record = store.get(1)
+    assert record is not None and record["Item"] == "Laptop"
+
+
+def test_out_of_range_mutations(store: InventoryStore) -> None:
+    """Out-of-range ids leave the store untouched."""
+    version = store.version
+    assert store.update(10, {}) is None
+    assert store.delete(-1) is None
+    assert store.get(10) is None
+    assert store.version == version
+
+
+def test_close_persists_changes(store: InventoryStore, tmp_path: Path) -> None:
+    """Pending mutations are written to the backing file."""
+    store.add({"Item": "Tent", "Product Category": "Outdoor"})
+    store.close()
+
+    snapshot = json.loads((tmp_path / "inventory.json").read_text(encoding="utf-8"))
+    persisted = snapshot["records"]
+    assert persisted[-1]["Item"] == "Tent"
+    assert len(persisted) == 4
+
+
+@pytest.mark.asyncio
+async def test_mock_inventory_tool_uses_store(store: InventoryStore) -> None:
+    """MockInventoryTool serves CRUD calls from the store."""
+    tool = MockInventoryTool(store)
+
+    assert len(await tool.list_items()) == 3
+    assert await tool.add_item({"Item": "Tent"}) == {"Item": "Tent"}
+    assert await tool.update_item(0, {"Item": "Radio"}) == {"Item": "Radio"}
+    assert (await tool.delete_item(0)) == {"Item": "Radio"}
+    assert await tool.update_item(99, {}) is None
+    assert await tool.delete_item(99) is None
+    assert len(await tool.list_items()) == 3
+
+
+@pytest.mark.asyncio
+async def test_mock_inventory_tool_list_page(store: InventoryStore) -> None:
+    """list_page returns stable pages linked by next_cursor."""
+    tool = MockInventoryTool(store)
+
+    first = await tool.list_page(ListInventoryInput(limit=2))
+    assert [r["Item"] for r in first["items"]] == ["Speaker", "Mower"]
+    second = await tool.list_page(ListInventoryInput(limit=2, cursor=first["next_cursor"]))
+    assert [r["Item"] for r in second["items"]] == ["Laptop"]
+    assert second["next_cursor"] is None
+    assert second["total"] == 3
+
+    await tool.delete_item(0)
+    with pytest.raises(StaleCursorError):
+        await tool.list_page(ListInventoryInput(limit=2, cursor=first["next_cursor"]))
+
+
+def test_apply_batch_is_all_or_nothing(store: InventoryStore) -> None:
+    """A batch applies in order, and one invalid operation rejects it all."""
+    applied = store.apply_batch(
+        [
+            {"op": "add", "item": {"Item": "Tent", "Product Category": "Outdoor"}},
+            {"op": "delete", "id": 0},
+            {"op": "update", "id": 2, "item": {"Item": "Lantern"}},
+        ]
+    )
+    assert [position for position, _ in applied] == [3, 0, 2]
+    assert applied[1][1]["Item"] == "Speaker"
+    assert [r["Item"] for r in store.list_items()] == ["Mower", "Laptop", "Lantern"]
+    assert store.find_by_category("Outdoor") == []
+    assert store.version == 1
+
+    with pytest.raises(BatchValidationError) as excinfo:
+        store.apply_batch(
+            [
+                {"op": "delete", "id": 2},
+                {"op": "update", "id": 2, "item": {}},  # gone after the delete
+                {"op": "add"},
+                {"op": "move", "id": 0},
+            ]
+        )
+    assert sorted(excinfo.value.errors) == [1, 2, 3]
+    assert [r["Item"] for r in store.list_items()] == ["Mower", "Laptop", "Lantern"]
+    assert store.version == 1
+
+
+@pytest.mark.asyncio
+async def test_mock_inventory_tool_bulk_results(store: InventoryStore) -> None:
+    """apply_batch reports every operation, committed or not."""
+    tool = MockInventoryTool(store)
+    result = await tool.apply_batch(
+        BulkInventoryInput.model_validate(
+            {
+                "operations": [
+                    {"op": "add", "item": {"Item": "Tent"}},
+                    {"op": "delete", "item_id": 1},
+                ]
+            }
+        )
+    )
+    assert result["committed"] is True
+    assert result["results"][0] == {"index": 0, "op": "add", "ok": True, "item_id": 3}
+    assert result["results"][1]["item"]["Item"] == "Mower"
+
+    rejected = await tool.apply_batch(
+        BulkInventoryInput.model_validate(
+            {
+                "operations": [
+                    {"op": "update", "item_id": 0, "item": {}},
+                    {"op": "delete", "item_id": 42},
+                ]
+            }
+        )
+    )
+    assert rejected["committed"] is False
+    assert [r["ok"] for r in rejected["results"]] == [True, False]
+    assert rejected["results"][1]["error"] == "No item at index 42"
+    assert len(store) == 3
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        {"op": "add", "item_id": 0, "item": {"Item": "Tent"}},
+        {"op": "delete", "item_id": 0, "item": {"Item": "Speaker"}},
+    ],
+)
+def test_bulk_input_rejects_ignored_fields(operation: Dict[str, Any]) -> None:
+    """Fields an operation would ignore fail validation instead."""
+    with pytest.raises(ValidationError):
+        BulkInventoryInput.model_validate(
+            {"operations": [{"op": "add", "item": {}}, operation]}
+        )
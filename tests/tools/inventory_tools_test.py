@@ -0,0 +1,84 @@
+"""Tests for the Excel inventory loader and tool."""
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.schemas.inventory import ListInventoryInput
+from src.tools.impl.inventory_tools import ExcelInventoryCache, LoadInventoryTool
+
+
+@pytest.fixture
+def workbook(tmp_path: Path) -> Path:
+    """Small workbook written to a temporary directory."""
+    path = tmp_path / "inventory.xlsx"
+    pd.DataFrame({"Item": ["Speaker", "Mower"], "Forecasted Demand": [250, 80]}).to_excel(
+        path, index=False
+    )
+    return path
+
+
+def test_parses_once_while_unchanged(workbook: Path) -> None:
+    """Repeated loads are served from memory."""
+    cache = ExcelInventoryCache(str(workbook))
+    with patch("src.tools.impl.inventory_tools.pd.read_excel", wraps=pd.read_excel) as read:
+        first = cache.load()
+        second = cache.load()
+    assert read.call_count == 1
+    assert first is second
+    assert list(first["Item"]) == ["Speaker", "Mower"]
+
+
+def test_cold_start_uses_sidecar(workbook: Path) -> None:
+    """A new cache instance loads the pickled sidecar instead of the workbook."""
+    ExcelInventoryCache(str(workbook)).load()
+    assert os.path.exists(f"{workbook}.cache.pkl")
+
+    with patch("src.tools.impl.inventory_tools.pd.read_excel") as read:
+        frame = ExcelInventoryCache(str(workbook)).load()
+    read.assert_not_called()
+    assert list(frame["Forecasted Demand"]) == [250, 80]
+
+
+def test_touch_without_change_skips_parse(workbook: Path) -> None:
+    """A new mtime with identical content is detected by hash."""
+    cache = ExcelInventoryCache(str(workbook))
+    cache.load()
+    stat = workbook.stat()
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    with patch("src.tools.impl.inventory_tools.pd.read_excel") as read:
+        cache.load()
+    read.assert_not_called()
+
+
+def test_changed_file_is_reparsed(workbook: Path) -> None:
+    """Content changes trigger a fresh parse and refresh the sidecar."""
+    cache = ExcelInventoryCache(str(workbook))
+    cache.load()
+    pd.DataFrame({"Item": ["Tent"], "Forecasted Demand": [5]}).to_excel(
+        workbook, index=False
+    )
+
+    assert list(cache.load()["Item"]) == ["Tent"]
+    assert list(ExcelInventoryCache(str(workbook)).load()["Item"]) == ["Tent"]
+
+
+def test_corrupt_sidecar_is_ignored(workbook: Path) -> None:
+    """An unreadable sidecar falls back to parsing the workbook."""
+    Path(f"{workbook}.cache.pkl").write_bytes(b"not a pickle")
+    assert len(ExcelInventoryCache(str(workbook)).load()) == 2
+
+
+@pytest.mark.asyncio
+async def test_load_inventory_tool(workbook: Path) -> None:
+    """The tool returns the workbook rows as JSON."""
+    cache = ExcelInventoryCache(str(workbook))
+    with patch("src.tools.impl.inventory_tools._inventory_cache", cache):
+        payload = json.loads(await LoadInventoryTool().execute(ListInventoryInput()))
+    assert payload["function"] == "load_inventory"
+    assert payload["data"][0] == {"Item": "Speaker", "Forecasted Demand": 250}
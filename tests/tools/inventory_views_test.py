@@ -0,0 +1,142 @@
+# pylint: disable=redefined-outer-name
+"""Tests for the materialized inventory views."""
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from src.schemas.inventory import InventoryViewCheckInput, InventoryViewInput
+from src.tools.impl.CRUD_tools import MockInventoryTool
+from src.tools.impl.inventory_store import InventoryStore
+from src.tools.impl.inventory_views import VIEWS, MaterializedView, ViewDefinition
+
+
+def _record(item: str, **flags: str) -> Dict[str, Any]:
+    record: Dict[str, Any] = {"Item": item, "Product Category": "Toys"}
+    for view in VIEWS:
+        record[view.column] = flags.get(view.name, "No")
+    return record
+
+
+@pytest.fixture
+def records() -> List[Dict[str, Any]]:
+    """Inventory sample covering every view."""
+    return [
+        _record("Kite", promotion_candidates="Yes", overstock="Yes"),
+        _record("Sled", seasonal_high_demand="Yes", high_dsi="Yes"),
+        _record("Ball"),
+        _record("Yo-yo", promotion_candidates="Yes"),
+    ]
+
+
+@pytest.fixture
+def store_options() -> Dict[str, Any]:
+    """Flush the log often enough for the tests to observe it."""
+    return {"fsync_interval": 0.01}
+
+
+def _items(store: InventoryStore, view: str) -> List[str]:
+    return [record["Item"] for record in store.view(view)]
+
+
+def _consistent(store: InventoryStore) -> bool:
+    return all(report["consistent"] for report in store.check_views().values())
+
+
+def test_views_follow_mutations(store: InventoryStore) -> None:
+    """Adds, updates, deletes and batches keep every view current."""
+    assert _items(store, "promotion_candidates") == ["Kite", "Yo-yo"]
+    assert _items(store, "overstock") == ["Kite"]
+    assert _items(store, "high_dsi") == ["Sled"]
+    assert _items(store, "seasonal_high_demand") == ["Sled"]
+
+    store.add(_record("Drone", overstock="Yes"))
+    store.update(0, _record("Kite"))
+    store.delete(1)
+    assert _items(store, "promotion_candidates") == ["Yo-yo"]
+    assert _items(store, "overstock") == ["Drone"]
+    assert store.view("high_dsi") == []
+
+    store.apply_batch(
+        [
+            {"op": "add", "item": _record("Puzzle", high_dsi="Yes")},
+            {"op": "update", "id": 1, "item": _record("Ball", promotion_candidates="Yes")},
+            {"op": "delete", "id": 2},
+        ]
+    )
+    assert _items(store, "promotion_candidates") == ["Ball"]
+    assert _items(store, "high_dsi") == ["Puzzle"]
+    assert _consistent(store)
+
+
+def test_views_survive_recovery(tmp_path: Path, store: InventoryStore) -> None:
+    """Views are rebuilt from the snapshot and the replayed log."""
+    store.add(_record("Drone", overstock="Yes"))
+    store.flush()
+    recovered = InventoryStore(store.data_file, read_only=True)
+    try:
+        assert _items(recovered, "overstock") == ["Kite", "Drone"]
+        assert _consistent(recovered)
+    finally:
+        recovered.close()
+
+
+def test_check_detects_and_repairs_drift(store: InventoryStore) -> None:
+    """Records changed in place are reported and fixed by a repair."""
+    drifted, cleared = store.get(2), store.get(0)
+    assert drifted is not None and cleared is not None
+    drifted["Overstock"] = "Yes"
+    cleared["Overstock"] = "No"
+    report = store.check_views()["overstock"]
+    assert report == {
+        "size": 1,
+        "expected": 1,
+        "missing": 1,
+        "unexpected": 1,
+        "consistent": False,
+    }
+    assert store.check_views()["promotion_candidates"]["consistent"]
+
+    store.check_views(repair=True)
+    assert _items(store, "overstock") == ["Ball"]
+    assert _consistent(store)
+
+
+def test_same_record_at_several_positions() -> None:
+    """A record object held twice is counted twice and removed one at a time."""
+    view = MaterializedView(ViewDefinition("flagged", "Flagged", "Flag"))
+    record = {"Flag": "Yes"}
+    view.add(record)
+    view.add(record)
+    view.add({"Flag": "No"})
+    assert len(view) == 2 and view.items() == [record, record]
+    view.remove(record)
+    assert view.items() == [record]
+    assert view.check([record])["consistent"]
+
+
+def test_unknown_view(store: InventoryStore) -> None:
+    """Reading a view that does not exist names the available ones."""
+    with pytest.raises(ValueError, match="overstock"):
+        store.view("bestsellers")
+
+
+@pytest.mark.asyncio
+async def test_tool_pages_and_checks_views(store: InventoryStore) -> None:
+    """The CRUD tool pages through a view and reports the check."""
+    tool = MockInventoryTool(store)
+    first = await tool.view_page(InventoryViewInput(view="promotion_candidates", limit=1))
+    assert first["total"] == 2 and first["items"][0]["Item"] == "Kite"
+    second = await tool.view_page(
+        InventoryViewInput(view="promotion_candidates", limit=1, cursor=first["next_cursor"])
+    )
+    assert second["items"][0]["Item"] == "Yo-yo" and second["next_cursor"] is None
+
+    await tool.add_item(_record("Drone", promotion_candidates="Yes"))
+    page = await tool.view_page(InventoryViewInput(view="promotion_candidates"))
+    assert [r["Item"] for r in page["items"]] == ["Kite", "Yo-yo", "Drone"]
+
+    result = await tool.check_views(InventoryViewCheckInput())
+    assert result["consistent"] is True
+    assert set(result["views"]) == {view.name for view in VIEWS}
@@ -0,0 +1,211 @@
+"""Tests for the inventory mutation log and its recovery."""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from src.tools.impl.inventory_store import InventoryStore
+from src.tools.impl.inventory_wal import (
+    LogLockedError,
+    MutationLog,
+    SnapshotMismatchError,
+    apply_mutation,
+)
+
+
+def _write_snapshot(path: Path, items: List[Dict[str, Any]]) -> None:
+    path.write_text(json.dumps(items), encoding="utf-8")
+
+
+def _read_snapshot(path: Path) -> Dict[str, Any]:
+    snapshot: Dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    return snapshot
+
+
+def _crash(store: InventoryStore) -> None:
+    """Release the writer lock as the kernel does when a process dies."""
+    log = store._log  # pylint: disable=protected-access
+    assert log._writer_lock is not None  # pylint: disable=protected-access
+    log._writer_lock.close()  # pylint: disable=protected-access
+    log._writer_lock = None  # pylint: disable=protected-access
+
+
+def test_apply_mutation_rejects_unknown_op() -> None:
+    """Unknown operations are refused rather than silently ignored."""
+    with pytest.raises(ValueError):
+        apply_mutation([], {"op": "truncate"})
+
+
+def test_mutations_are_logged_not_rewritten(tmp_path: Path) -> None:
+    """Mutations append to a log segment and leave the snapshot untouched."""
+    data_file = tmp_path / "inventory.json"
+    _write_snapshot(data_file, [{"Item": "A"}])
+    store = InventoryStore(str(data_file), fsync_interval=3600)
+
+    store.add({"Item": "B"})
+    store.update(0, {"Item": "A2"})
+    store.flush()
+
+    # The seed file is stamped with its generation before the first append.
+    snapshot = _read_snapshot(data_file)
+    assert snapshot["records"] == [{"Item": "A"}]
+    assert snapshot["generation"] == 1
+    lines = (tmp_path / "inventory.json.wal.1").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["op"] for line in lines] == ["add", "update"]
+
+
+def test_replay_after_crash(tmp_path: Path) -> None:
+    """A store that was never closed is rebuilt from snapshot plus log."""
+    data_file = tmp_path / "inventory.json"
+    _write_snapshot(data_file, [{"Item": "A"}, {"Item": "B"}])
+    crashed = InventoryStore(str(data_file), fsync_interval=3600)
+    crashed.add({"Item": "C"})
+    crashed.delete(0)
+    crashed.update(0, {"Item": "B2"})
+    crashed.flush()
+    _crash(crashed)
+
+    recovered = InventoryStore(str(data_file))
+    assert recovered.list_items() == [{"Item": "B2"}, {"Item": "C"}]
+    # Recovery folds the log into a fresh snapshot.
+    assert _read_snapshot(data_file)["records"] == [{"Item": "B2"}, {"Item": "C"}]
+    recovered.close()
+
+
+def test_torn_tail_is_ignored(tmp_path: Path) -> None:
+    """A partially written last record does not break recovery."""
+    data_file = tmp_path / "inventory.json"
+    MutationLog(str(data_file)).write_snapshot([], 1)
+    (tmp_path / "inventory.json.wal.1").write_bytes(
+        b'{"op":"add","item":{"Item":"A"}}\n{"op":"add","it'
+    )
+
+    records, replayed = MutationLog(str(data_file)).recover()
+    assert records == [{"Item": "A"}]
+    assert replayed == 1
+
+
+def test_snapshot_generation_skips_compacted_segments(tmp_path: Path) -> None:
+    """Segments older than the snapshot generation are not replayed again."""
+    data_file = tmp_path / "inventory.json"
+    log = MutationLog(str(data_file))
+    log.write_snapshot([], 1)
+    log.append({"op": "add", "item": {"Item": "A"}})
+    generation = log.rotate()
+    log.append({"op": "add", "item": {"Item": "B"}})
+    log.close()
+    # Crash after the compacted snapshot replaced the file, before the
+    # segment it folded in was deleted.
+    records = [{"Item": "A"}]
+    digest = hashlib.sha256(
+        json.dumps(records, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+    snapshot = {"generation": generation, "records_sha256": digest, "records": records}
+    data_file.write_text(json.dumps(snapshot), encoding="utf-8")
+    assert generation == 2
+
+    recovered, replayed = MutationLog(str(data_file)).recover()
+    assert recovered == [{"Item": "A"}, {"Item": "B"}]
+    assert replayed == 1
+
+
+@pytest.mark.parametrize(
+    "replacement",
+    [
+        [{"Item": "B"}, {"Item": "A"}],
+        {"generation": 1, "records_sha256": "0" * 64, "records": [{"Item": "B"}]},
+    ],
+)
+def test_replaced_snapshot_is_refused(tmp_path: Path, replacement: Any) -> None:
+    """A swapped or hand-edited data file with pending segments is refused."""
+    data_file = tmp_path / "inventory.json"
+    _write_snapshot(data_file, [{"Item": "A"}, {"Item": "B"}])
+    crashed = InventoryStore(str(data_file), fsync_interval=3600)
+    crashed.delete(0)
+    crashed.flush()
+    _crash(crashed)
+    data_file.write_text(json.dumps(replacement), encoding="utf-8")
+
+    with pytest.raises(SnapshotMismatchError):
+        InventoryStore(str(data_file)).load()
+    with pytest.raises(SnapshotMismatchError):
+        InventoryStore(str(data_file), read_only=True).load()
+
+
+def test_compaction_threshold_truncates_log(tmp_path: Path) -> None:
+    """Reaching the threshold compacts the log into the snapshot."""
+    data_file = tmp_path / "inventory.json"
+    _write_snapshot(data_file, [])
+    store = InventoryStore(str(data_file), fsync_interval=0.01, compact_threshold=3)
+    for index in range(3):
+        store.add({"Item": str(index)})
+
+    deadline = time.monotonic() + 5
+    while (tmp_path / "inventory.json.wal.1").exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not (tmp_path / "inventory.json.wal.1").exists()
+    assert len(_read_snapshot(data_file)["records"]) == 3
+    store.close()
+    reopened = InventoryStore(str(data_file))
+    assert len(reopened.list_items()) == 3
+
+
+def test_batch_is_one_log_record(tmp_path: Path) -> None:
+    """A batch is logged as a single line and replayed as a whole."""
+    data_file = tmp_path / "inventory.json"
+    _write_snapshot(data_file, [{"Item": "A"}])
+    crashed = InventoryStore(str(data_file), fsync_interval=3600)
+    crashed.apply_batch([{"op": "add", "item": {"Item": f"B{i}"}} for i in range(100)])
+    crashed.apply_batch(
+        [{"op": "delete", "id": 0}, {"op": "update", "id": 0, "item": {"Item": "C"}}]
+    )
+    crashed.flush()
+
+    _crash(crashed)
+
+    lines = (tmp_path / "inventory.json.wal.1").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    recovered = InventoryStore(str(data_file))
+    items = recovered.list_items()
+    assert len(items) == 100
+    assert items[0] == {"Item": "C"}
+    recovered.close()
+
+
+def test_single_writer(tmp_path: Path) -> None:
+    """A second writable store on the same file is refused until the first closes."""
+    data_file = tmp_path / "inventory.json"
+    _write_snapshot(data_file, [{"Item": "A"}])
+    writer = InventoryStore(str(data_file))
+    writer.add({"Item": "B"})
+
+    with pytest.raises(LogLockedError):
+        InventoryStore(str(data_file)).load()
+    writer.close()
+
+    successor = InventoryStore(str(data_file))
+    assert successor.list_items() == [{"Item": "A"}, {"Item": "B"}]
+    successor.close()
+
+
+def test_read_only_store(tmp_path: Path) -> None:
+    """Read-only stores replay the log next to a writer but never write."""
+    data_file = tmp_path / "inventory.json"
+    _write_snapshot(data_file, [{"Item": "A"}])
+    writer = InventoryStore(str(data_file), fsync_interval=3600)
+    writer.add({"Item": "B"})
+    writer.flush()
+    files = sorted(path.name for path in tmp_path.iterdir())
+
+    reader = InventoryStore(str(data_file), read_only=True)
+    assert reader.list_items() == [{"Item": "A"}, {"Item": "B"}]
+    with pytest.raises(PermissionError):
+        reader.add({"Item": "C"})
+    reader.close()
+    assert sorted(path.name for path in tmp_path.iterdir()) == files
+    assert _read_snapshot(data_file)["records"] == [{"Item": "A"}]
+    writer.close()
@@ -1,15 +1,18 @@
 # pylint: disable=redefined-outer-name
 """Test the registration of tools in the FastMCP instance."""
 
+import asyncio
 import json
-from typing import Iterable, Dict, Any
-from unittest.mock import AsyncMock
+from typing import Iterable, Dict, Any, List
+from unittest.mock import AsyncMock, patch
 import pytest
 
 from mcp.server.fastmcp import FastMCP
 
 from src.tools.registration import register_tools
 from src.tools.registration import execute_tool
+from src.tools.meta.deadline import ToolTimeoutError, with_deadline
+from src.utils.deadline import remaining
 
 
 @pytest.fixture
@@ -60,6 +63,21 @@ async def test_get_app_version(
         assert content_dict["buildTime"] == ""
 
 
+@pytest.mark.asyncio
+async def test_get_app_version_does_no_file_io(
+    setup_registration: None,  # pylint: disable=unused-argument
+    mock_mcp: FastMCP,
+) -> None:
+    """Version reads serve the response serialized at registration."""
+    with patch("src.core.config.toml.load") as mock_load:
+        first = list(await mock_mcp.read_resource("config://app-version"))
+        second = list(await mock_mcp.read_resource("config://app-version"))
+
+    mock_load.assert_not_called()
+    assert first[0].content == second[0].content
+    assert first[0].mime_type == "application/json"
+
+
 @pytest.mark.asyncio
 async def test_execute_tool_with_auth() -> None:
     """Test execute_tool function with authentication required."""
@@ -98,3 +116,83 @@ async def test_execute_tool_without_auth() -> None:
 
     assert result == [{"result": "no auth data"}]
     mock_tool.execute.assert_called_once_with(mock_input)
+
+
+@pytest.mark.asyncio
+async def test_execute_tool_cancels_calls_past_the_deadline() -> None:
+    """A slow tool is cancelled at its configured timeout."""
+    cancelled = asyncio.Event()
+
+    async def slow_execute(*_args: Any) -> None:
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    mock_tool = AsyncMock()
+    mock_tool.execute = slow_execute
+
+    with patch("src.tools.meta.deadline.settings.tool_timeouts", {"slow_tool": 0.05}):
+        with pytest.raises(ToolTimeoutError) as excinfo:
+            await execute_tool(mock_tool, {}, "slow_tool")
+
+    assert cancelled.is_set()
+    assert json.loads(str(excinfo.value))["error"] == "deadline_exceeded"
+
+
+@pytest.mark.asyncio
+async def test_client_deadline_shortens_the_budget() -> None:
+    """The request timeout header lowers the deadline seen by the tool."""
+    budgets: List[float] = []
+
+    async def execute(*_args: Any) -> None:
+        budget = remaining()
+        assert budget is not None
+        budgets.append(budget)
+
+    mock_tool = AsyncMock()
+    mock_tool.execute = execute
+
+    await execute_tool(mock_tool, {}, "test_tool", {"X-Request-Timeout-Ms": "250"})
+    await execute_tool(mock_tool, {}, "test_tool", {"X-Request-Timeout-Ms": "99999999"})
+
+    assert 0.2 < budgets[0] <= 0.25
+    assert 29 < budgets[1] <= 30
+
+
+@pytest.mark.asyncio
+async def test_with_deadline_bounds_direct_tool_functions() -> None:
+    """Tool functions that skip execute_tool get the same deadline by name."""
+
+    @with_deadline
+    async def direct_tool(delay: float) -> float:
+        await asyncio.sleep(delay)
+        budget = remaining()
+        assert budget is not None
+        return budget
+
+    with patch("src.tools.meta.deadline.settings.tool_timeouts", {"direct_tool": 0.05}):
+        assert await direct_tool(0) <= 0.05
+        with pytest.raises(ToolTimeoutError) as excinfo:
+            await direct_tool(5)
+
+    assert json.loads(str(excinfo.value))["tool"] == "direct_tool"
+
+
+@pytest.mark.asyncio
+async def test_tool_timeouts_are_not_relabelled() -> None:
+    """A TimeoutError raised by the tool itself is not a deadline overrun."""
+
+    async def execute(*_args: Any) -> None:
+        raise TimeoutError("upstream read timed out")
+
+    mock_tool = AsyncMock()
+    mock_tool.execute = execute
+
+    with patch("src.tools.meta.deadline.TOOL_TIMEOUTS") as tool_timeouts:
+        with pytest.raises(TimeoutError, match="upstream read timed out") as excinfo:
+            await execute_tool(mock_tool, {}, "test_tool")
+
+    assert not isinstance(excinfo.value, ToolTimeoutError)
+    tool_timeouts.labels.assert_not_called()
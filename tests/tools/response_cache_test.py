@@ -0,0 +1,197 @@
+"""Tests for the opt-in tool response cache."""
+
+import asyncio
+from functools import partial
+from typing import Any, Dict, Union
+from unittest.mock import patch
+
+import pytest
+
+from src.tools.impl.example_tool import ExampleTool
+from src.tools.meta.base import BaseTool
+from src.tools.meta.response_cache import ResponseCache, make_cache_key
+from src.tools.registration import execute_tool
+from src.utils.deadline import deadline_scope, remaining
+
+
+class CountingTool(BaseTool[Any]):
+    """Tool that counts executions and opts into caching."""
+
+    response_cache: ResponseCache[Any] = ResponseCache(ttl=60)
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    @property
+    def name(self) -> str:
+        return "counting_tool"
+
+    @property
+    def description(self) -> str:
+        return "Counts calls"
+
+    @property
+    def input_schema(self) -> Dict[str, Any]:
+        return {"type": "object"}
+
+    async def execute(self, input_data: Union[Any, Dict[str, Any]], *args: Any) -> Any:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"echo": input_data, "calls": self.calls}
+
+
+def test_cache_key_scoping() -> None:
+    """Keys ignore traceparent but separate callers and scoped headers."""
+    headers = {"Authorization": "Bearer a", "x-workspace-id": "w1", "traceparent": "1"}
+    names = ["traceparent", "x-workspace-id"]
+    key = make_cache_key("tool", {"q": 1}, headers, names)
+
+    assert key == make_cache_key("tool", {"q": 1}, {**headers, "traceparent": "2"}, names)
+    assert key != make_cache_key("tool", {"q": 1}, {**headers, "Authorization": "Bearer b"}, names)
+    assert key != make_cache_key("tool", {"q": 1}, {**headers, "x-workspace-id": "w2"}, names)
+    assert key != make_cache_key("tool", {"q": 2}, headers, names)
+
+
+@pytest.mark.asyncio
+async def test_hits_misses_and_ttl() -> None:
+    """Fresh entries are served from cache until they expire."""
+    cache: ResponseCache[int] = ResponseCache(ttl=60)
+    calls = 0
+
+    async def compute() -> int:
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await cache.get_or_compute("k", compute) == 1
+    assert await cache.get_or_compute("k", compute) == 1
+    with patch("src.tools.meta.response_cache.time.monotonic", return_value=10**9):
+        assert await cache.get_or_compute("k", compute) == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_and_uncacheable_results() -> None:
+    """The cache is size bounded and skips results rejected by cacheable()."""
+    cache: ResponseCache[str] = ResponseCache(ttl=60, max_entries=2)
+
+    async def value_of(key: str) -> str:
+        return key
+
+    for key in ("a", "b", "a", "c"):
+        await cache.get_or_compute(key, partial(value_of, key))
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size"] == 2
+
+    await cache.get_or_compute("err", lambda: value_of("err"), cacheable=lambda _: False)
+    assert cache.stats()["size"] == 2
+    cache.clear()
+    assert cache.stats()["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_coalesce() -> None:
+    """N concurrent identical requests produce one computation."""
+    cache: ResponseCache[int] = ResponseCache(ttl=0)
+    calls = 0
+
+    async def compute() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return 42
+
+    results = await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(10)))
+    assert results == [42] * 10
+    assert calls == 1
+    assert cache.stats()["coalesced"] == 9
+    # ttl=0 coalesces but does not keep results.
+    assert cache.stats()["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_coalesced_callers_keep_their_own_deadlines() -> None:
+    """The first caller's short deadline neither bounds the shared call nor the others."""
+    cache: ResponseCache[int] = ResponseCache(ttl=0)
+    budgets = []
+
+    async def compute() -> int:
+        budgets.append(remaining())
+        await asyncio.sleep(0.1)
+        return 42
+
+    async def call(timeout: float) -> int:
+        with deadline_scope(timeout):
+            return await cache.get_or_compute("k", compute)
+
+    hasty = asyncio.create_task(call(0.02))
+    await asyncio.sleep(0)
+    patient = asyncio.create_task(call(5))
+    with pytest.raises(TimeoutError):
+        await hasty
+    assert await patient == 42
+    assert budgets == [None]
+
+
+@pytest.mark.asyncio
+async def test_shared_call_is_cancelled_when_every_caller_gives_up() -> None:
+    """Nobody left waiting means the computation stops."""
+    cache: ResponseCache[int] = ResponseCache(ttl=60)
+    cancelled = asyncio.Event()
+
+    async def compute() -> int:
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return 42
+
+    async def call() -> int:
+        with deadline_scope(0.02):
+            return await cache.get_or_compute("k", compute)
+
+    results = await asyncio.gather(call(), call(), return_exceptions=True)
+    assert all(isinstance(result, TimeoutError) for result in results)
+    await asyncio.wait_for(cancelled.wait(), 1)
+    assert cache.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_and_are_not_cached() -> None:
+    """A failing computation raises for every waiter and is retried later."""
+    cache: ResponseCache[int] = ResponseCache(ttl=60)
+
+    async def fail() -> int:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(
+        cache.get_or_compute("k", fail), cache.get_or_compute("k", fail), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert cache.stats()["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_execute_tool_uses_tool_cache() -> None:
+    """execute_tool serves repeated calls of a caching tool from its cache."""
+    CountingTool.response_cache = ResponseCache(ttl=60)
+    tool = CountingTool()
+    headers = {"Authorization": "Bearer t"}
+
+    first = await execute_tool(tool, {"q": 1}, "counting_tool", headers)
+    second = await execute_tool(tool, {"q": 1}, "counting_tool", headers)
+    await execute_tool(tool, {"q": 2}, "counting_tool", headers)
+
+    assert first == second
+    assert tool.calls == 2
+
+
+def test_example_tool_opts_in_and_skips_errors() -> None:
+    """ExampleTool caches successful payloads only."""
+    tool = ExampleTool()
+    assert tool.response_cache is not None
+    assert tool.is_cacheable('{"function": "example_tool", "data": {}}')
+    assert not tool.is_cacheable('{"error": "Exception during example_tool tool call"}')
@@ -0,0 +1,104 @@
+# pylint: disable=redefined-outer-name
+"""Tests for the vectorized retail analytics tools."""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import pytest
+
+from src.schemas.inventory import RetailAnalyticsInput
+from src.tools.impl.inventory_store import DATA_FILE, InventoryStore
+from src.tools.impl.retail_tools import (
+    ExpectedInventoryTool,
+    ForecastedDemandTool,
+    PromotionCandidateTool,
+)
+
+
+@pytest.fixture
+def records() -> List[Dict[str, Any]]:
+    """The bundled dataset."""
+    return json.loads(Path(DATA_FILE).read_text(encoding="utf-8"))
+
+
+@pytest.fixture
+def store_options() -> Dict[str, Any]:
+    """Leave flushing to close()."""
+    return {"fsync_interval": 3600}
+
+
+@pytest.mark.asyncio
+async def test_forecasted_demand_uses_dataset_columns(store: InventoryStore) -> None:
+    """Demand is compared with the on-hand stock of all three warehouses."""
+    page = await ForecastedDemandTool(store).execute(RetailAnalyticsInput(limit=2))
+    first = store.get(0)
+    assert first is not None
+    on_hand = sum(first[f"On hand Inventory WH{n}"] for n in (1, 2, 3))
+    assert page["items"][0] == {
+        "item_id": 0,
+        "item": first["Item"],
+        "category": first["Product Category"],
+        "forecasted_demand": first["Forecasted Demand"],
+        "on_hand_inventory": on_hand,
+        "shortfall": max(first["Forecasted Demand"] - on_hand, 0),
+    }
+    assert page["total"] == len(store)
+    json.dumps(page)
+
+
+@pytest.mark.asyncio
+async def test_expected_inventory_and_category_filter(store: InventoryStore) -> None:
+    """Expected stock is reported per warehouse and filtered by category."""
+    tool = ExpectedInventoryTool(store)
+    page = await tool.execute(RetailAnalyticsInput(category="Electronics", limit=100))
+    electronics = [r for r in store.list_items() if r["Product Category"] == "Electronics"]
+    assert page["total"] == len(electronics)
+    row = page["items"][0]
+    expected = [electronics[0][f"Expected Inventory WH{n}"] for n in (1, 2, 3)]
+    assert [row["expected_wh1"], row["expected_wh2"], row["expected_wh3"]] == expected
+    assert row["projected_balance"] == sum(expected) - electronics[0]["Forecasted Demand"]
+
+    second = await tool.execute(
+        RetailAnalyticsInput(category="Electronics", limit=2, cursor=None)
+    )
+    follow = await tool.execute(
+        {"category": "Electronics", "limit": 2, "cursor": second["next_cursor"]}
+    )
+    assert follow["items"][0]["item_id"] == page["items"][2]["item_id"]
+
+
+@pytest.mark.asyncio
+async def test_promotion_candidates_follow_mutations(store: InventoryStore) -> None:
+    """Only flagged items are returned; results are recomputed per version."""
+    tool = PromotionCandidateTool(store)
+    flagged = [r for r in store.list_items() if r["Recommended for Promotion"] == "Yes"]
+    with patch.object(tool, "compute", wraps=tool.compute) as compute:
+        page = await tool.execute(RetailAnalyticsInput(limit=1000))
+        await tool.execute(RetailAnalyticsInput(limit=5))
+        assert compute.call_count == 1
+
+        store.add(dict(flagged[0], Item="New Promo", **{"Reg Price": 0.0}))
+        after = await tool.execute(RetailAnalyticsInput(limit=1000))
+        assert compute.call_count == 2
+
+    assert page["total"] == len(flagged)
+    reg, promo = flagged[0]["Reg Price"], flagged[0]["Promotional Price"]
+    assert page["items"][0]["discount_pct"] == round((reg - promo) / reg * 100, 1)
+    assert after["total"] == len(flagged) + 1
+    # No discount can be computed from a zero regular price.
+    assert after["items"][-1]["discount_pct"] is None
+
+
+@pytest.mark.asyncio
+async def test_tolerates_sparse_records(tmp_path: Path) -> None:
+    """Records missing columns or holding text in numeric ones yield nulls."""
+    data_file = tmp_path / "inventory.json"
+    data_file.write_text(json.dumps([{"Item": "Odd", "Forecasted Demand": "lots"}]))
+    sparse = InventoryStore(str(data_file))
+    page = await ForecastedDemandTool(sparse).execute(RetailAnalyticsInput())
+    assert page["items"][0]["forecasted_demand"] is None
+    assert page["items"][0]["on_hand_inventory"] is None
+    assert (await PromotionCandidateTool(sparse).execute(RetailAnalyticsInput()))["total"] == 0
+    sparse.close()
@@ -0,0 +1,98 @@
+"""Tests for the bounded blocking I/O executor."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.utils.blocking_io import BlockingIOExecutor, get_io_executor, run_blocking
+
+
+@pytest.mark.asyncio
+async def test_run_executes_off_the_event_loop() -> None:
+    """Blocking calls run on a worker thread and return their result."""
+    executor = BlockingIOExecutor(max_workers=2, max_queue=2)
+    loop_thread = threading.get_ident()
+
+    thread_id = await executor.run(threading.get_ident)
+    assert thread_id != loop_thread
+    assert await executor.run(lambda a, b=0: a + b, 1, b=2) == 3
+    assert executor.stats()["completed"] == 2
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive() -> None:
+    """Concurrent slow reads do not stall other coroutines."""
+    executor = BlockingIOExecutor(max_workers=4, max_queue=4)
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    tick_task = asyncio.create_task(ticker())
+    await asyncio.gather(*(executor.run(time.sleep, 0.1) for _ in range(4)))
+    tick_task.cancel()
+
+    assert ticks >= 5
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_queue_is_bounded() -> None:
+    """Callers beyond workers plus queue wait on the loop, not in the pool."""
+    executor = BlockingIOExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    tasks = [asyncio.create_task(executor.run(release.wait)) for _ in range(4)]
+    await asyncio.sleep(0.05)
+    stats = executor.stats()
+    assert stats["active"] == 1
+    assert stats["queued"] == 1
+    assert stats["waiting"] == 2
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert executor.stats()["completed"] == 4
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_callers_free_slots_when_the_work_does() -> None:
+    """A running call keeps its slot past cancellation; a queued one frees it."""
+    executor = BlockingIOExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    try:
+        running = asyncio.create_task(executor.run(release.wait))
+        queued = asyncio.create_task(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        running.cancel()
+        queued.cancel()
+        await asyncio.sleep(0.05)
+        stats = executor.stats()
+        assert stats["active"] == 1
+        assert stats["queued"] == 0
+
+        # The running call still holds its slot, so only one more fits.
+        waiting = [asyncio.create_task(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        assert executor.stats()["waiting"] == 1
+    finally:
+        release.set()
+
+    await asyncio.gather(*waiting)
+    stats = executor.stats()
+    assert (stats["active"], stats["queued"], stats["waiting"]) == (0, 0, 0)
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_uses_shared_executor() -> None:
+    """run_blocking delegates to the process-wide executor."""
+    assert await run_blocking(sum, [1, 2, 3]) == 6
+    assert get_io_executor() is get_io_executor()
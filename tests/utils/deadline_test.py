@@ -0,0 +1,94 @@
+"""Tests for deadline propagation."""
+
+import asyncio
+import time
+from typing import List
+
+import httpx
+import pytest
+
+from src.utils.blocking_io import BlockingIOExecutor
+from src.utils.deadline import (
+    check_deadline,
+    clamp_timeouts,
+    deadline_scope,
+    parse_timeout_header,
+    remaining,
+)
+from src.utils.http_client import _CountingTransport
+
+
+def test_scopes_keep_the_earlier_deadline() -> None:
+    """Nested scopes can shorten the budget but never extend it."""
+    assert remaining() is None
+    with deadline_scope(1.0) as outer:
+        assert outer is not None and 0.9 < outer <= 1.0
+        with deadline_scope(10.0) as inner:
+            assert inner is not None and inner <= 1.0
+        with deadline_scope(0.1):
+            assert remaining() <= 0.1  # type: ignore[operator]
+        with deadline_scope(None):
+            assert remaining() is not None
+    assert remaining() is None
+
+
+def test_expired_deadline_and_clamping() -> None:
+    """Past deadlines raise and cap every httpx timeout phase."""
+    timeouts = {"connect": 5.0, "read": 30.0, "write": None, "pool": 30.0}
+    assert clamp_timeouts(timeouts) == timeouts
+    with deadline_scope(0.5):
+        clamped = clamp_timeouts(timeouts)
+        assert all(value is not None and 0 < value <= 0.5 for value in clamped.values())
+    with deadline_scope(1e-6):
+        time.sleep(0.001)
+        with pytest.raises(TimeoutError):
+            check_deadline()
+
+
+def test_parse_timeout_header() -> None:
+    """The header carries milliseconds; junk means no client deadline."""
+    assert parse_timeout_header("1500") == 1.5
+    for value in (None, "", "soon", "0", "-5"):
+        assert parse_timeout_header(value) is None
+
+
+@pytest.mark.asyncio
+async def test_upstream_requests_carry_the_remaining_budget() -> None:
+    """Outbound requests get clamped timeouts and the budget header."""
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200)
+
+    transport = _CountingTransport(httpx.MockTransport(handler))
+    async with httpx.AsyncClient(transport=transport, timeout=30.0) as client:
+        await client.get("http://upstream/a")
+        with deadline_scope(2.0):
+            await client.get("http://upstream/b")
+
+    assert "x-request-timeout-ms" not in seen[0].headers
+    assert seen[0].extensions["timeout"]["read"] == 30.0
+    assert 1000 < int(seen[1].headers["x-request-timeout-ms"]) <= 2000
+    assert seen[1].extensions["timeout"]["read"] <= 2.0
+
+
+@pytest.mark.asyncio
+async def test_executor_skips_work_past_its_deadline() -> None:
+    """Queued work whose deadline passed is not started; waiting is bounded."""
+    executor = BlockingIOExecutor(max_workers=1, max_queue=0)
+    started: List[int] = []
+    blocker = asyncio.ensure_future(executor.run(time.sleep, 0.2))
+    await asyncio.sleep(0.01)
+    with deadline_scope(0.05):
+        with pytest.raises(TimeoutError):
+            await executor.run(started.append, 1)
+    await blocker
+
+    with deadline_scope(1e-6):
+        await asyncio.sleep(0.001)
+        with pytest.raises(TimeoutError):
+            await executor.run(started.append, 2)
+    assert not started
+    assert executor.stats()["waiting"] == 0
+    executor.shutdown()
@@ -0,0 +1,107 @@
+"""Tests for the shared upstream client registry."""
+
+import asyncio
+from typing import Any, AsyncIterator, List, Tuple
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from src.utils.http_client import UpstreamClientRegistry, get_upstream_clients
+
+
+@pytest_asyncio.fixture
+async def http_server() -> AsyncIterator[Tuple[str, List[asyncio.StreamWriter]]]:
+    """Minimal keep-alive HTTP/1.1 server recording accepted connections."""
+    connections: List[asyncio.StreamWriter] = []
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connections.append(writer)
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n"
+                    b"Content-Type: application/json\r\n\r\n{}"
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}", connections
+    server.close()
+
+
+def _registry(**kwargs: Any) -> UpstreamClientRegistry:
+    return UpstreamClientRegistry(
+        limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+        timeout=5.0,
+        connect_timeout=1.0,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_connections_are_reused(
+    http_server: Tuple[str, List[asyncio.StreamWriter]],
+) -> None:
+    """Sequential calls to one origin share a single keep-alive connection."""
+    base_url, connections = http_server
+    registry = _registry(http2=False)
+
+    for _ in range(5):
+        response = await registry.client_for(f"{base_url}/a").get(f"{base_url}/a")
+        assert response.status_code == 200
+
+    assert len(connections) == 1
+    stats = registry.stats()[base_url]
+    assert stats["requests"] == 5
+    assert stats["in_flight"] == 0
+    assert stats["connections"] == 1
+    assert stats["idle_connections"] == 1
+    assert stats["max_connections"] == 4
+    await registry.aclose()
+    assert registry.stats() == {}
+
+
+@pytest.mark.asyncio
+async def test_client_per_origin_with_host_timeouts() -> None:
+    """Each origin gets its own client; per-host timeouts override the default."""
+    registry = _registry(host_timeouts={"slow.example": 60.0}, http2=False)
+
+    fast = registry.client_for("https://fast.example/x")
+    slow = registry.client_for("https://slow.example/y")
+
+    assert registry.client_for("https://fast.example/other") is fast
+    assert fast is not slow
+    assert fast.timeout.read == 5.0
+    assert slow.timeout.read == 60.0
+    assert slow.timeout.connect == 1.0
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_transport_errors_are_counted() -> None:
+    """Failed connections show up in the error counter."""
+    registry = _registry(http2=False)
+    client = registry.client_for("http://127.0.0.1:9")
+    with pytest.raises(httpx.TransportError):
+        await client.get("http://127.0.0.1:9/")
+    assert registry.stats()["http://127.0.0.1:9"]["errors"] == 1
+    await registry.aclose()
+
+
+def test_http2_requires_h2(monkeypatch: pytest.MonkeyPatch) -> None:
+    """HTTP/2 is only enabled when the h2 package is importable."""
+    monkeypatch.setattr("src.utils.http_client.importlib.util.find_spec", lambda _: None)
+    assert _registry(http2=True).http2 is False
+
+
+def test_registry_from_settings() -> None:
+    """The application registry is built once from settings."""
+    registry = get_upstream_clients()
+    assert registry is get_upstream_clients()
+    assert registry.timeout == 30.0
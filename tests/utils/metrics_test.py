@@ -0,0 +1,152 @@
+"""Tests for the Prometheus metrics."""
+
+import asyncio
+import inspect
+import os
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import CollectorRegistry, generate_latest
+from prometheus_client.parser import text_string_to_metric_families
+
+from src.utils.metrics import (
+    EventLoopLagMonitor,
+    StatsCollector,
+    instrument_tool,
+    track_tool,
+)
+
+
+def _samples(registry: Any) -> Dict[str, float]:
+    text = generate_latest(registry).decode()
+    samples: Dict[str, float] = {}
+    for family in text_string_to_metric_families(text):
+        for sample in family.samples:
+            labels = ",".join(f"{k}={v}" for k, v in sorted(sample.labels.items()))
+            samples[f"{sample.name}{{{labels}}}"] = sample.value
+    return samples
+
+
+def _value(name: str, **labels: str) -> float:
+    from prometheus_client import REGISTRY  # pylint: disable=import-outside-toplevel
+
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_track_tool_counts_errors_and_latency() -> None:
+    """Calls, errors, latency and in-flight state are recorded per tool."""
+    before_calls = _value("mcp_tool_calls_total", tool="t_metrics")
+    before_errors = _value("mcp_tool_errors_total", tool="t_metrics")
+
+    with track_tool("t_metrics"):
+        assert _value("mcp_tool_in_flight", tool="t_metrics") == 1
+    with pytest.raises(ValueError):
+        with track_tool("t_metrics"):
+            raise ValueError("boom")
+
+    assert _value("mcp_tool_calls_total", tool="t_metrics") == before_calls + 2
+    assert _value("mcp_tool_errors_total", tool="t_metrics") == before_errors + 1
+    assert _value("mcp_tool_in_flight", tool="t_metrics") == 0
+    assert _value("mcp_tool_duration_seconds_count", tool="t_metrics") >= 2
+
+
+@pytest.mark.asyncio
+async def test_instrument_tool_keeps_the_tool_signature() -> None:
+    """Decorated tools keep the signature MCP derives their schema from."""
+
+    async def lookup(item_id: int, verbose: bool = False) -> Dict[str, Any]:
+        """Look an item up."""
+        return {"item_id": item_id, "verbose": verbose}
+
+    wrapped = instrument_tool(lookup)
+    assert inspect.signature(wrapped) == inspect.signature(lookup)
+    assert wrapped.__doc__ == "Look an item up."
+    assert await wrapped(3) == {"item_id": 3, "verbose": False}
+    assert _value("mcp_tool_calls_total", tool="lookup") >= 1
+
+
+def test_stats_collector_exposes_component_stats() -> None:
+    """stats() dictionaries become gauges; nested ones gain a label."""
+    collector = StatsCollector()
+    collector.register("pool", lambda: {"active": 2, "name": "ignored", "ok": True})
+    collector.register(
+        "upstream", lambda: {"http://a": {"requests": 5}, "http://b": {"requests": 7}},
+        label="origin",
+    )
+
+    def broken() -> Dict[str, Any]:
+        raise ZeroDivisionError("division by zero")
+
+    collector.register("broken", broken)
+    registry = CollectorRegistry()
+    registry.register(collector)
+
+    samples = _samples(registry)
+    pid = os.getpid()
+    assert samples[f"pool_active{{pid={pid}}}"] == 2
+    assert samples[f"upstream_requests{{origin=http://a,pid={pid}}}"] == 5
+    assert samples[f"upstream_requests{{origin=http://b,pid={pid}}}"] == 7
+    assert not [name for name in samples if name.startswith(("pool_name", "pool_ok", "broken"))]
+
+
+@pytest.mark.asyncio
+async def test_event_loop_lag_monitor_sees_blocking_calls() -> None:
+    """A blocking call on the loop shows up as lag."""
+    monitor = EventLoopLagMonitor(interval=0.01)
+    monitor.start()
+    await asyncio.sleep(0.02)
+    time.sleep(0.1)  # block the loop
+    await asyncio.sleep(0.03)
+    await monitor.stop()
+    assert monitor.last_lag >= 0.0
+    assert _value("event_loop_lag_seconds_count") > 0
+    assert _value("event_loop_lag_seconds_bucket", le="0.05") < _value(
+        "event_loop_lag_seconds_count"
+    )
+
+
+def test_metrics_endpoint_serves_runtime_stats() -> None:
+    """The app serves /metrics without a token, in the text format."""
+    # pylint: disable=import-outside-toplevel
+    from src.core.config import settings
+    from src.main import app
+
+    assert "/metrics" in settings.skip_paths
+    with TestClient(app) as client:
+        response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "blocking_io_max_workers" in response.text
+    assert "inventory_store_records" in response.text
+    assert "event_loop_lag_seconds" in response.text
+
+
+def test_multiprocess_mode_aggregates_workers(tmp_path: Path) -> None:
+    """With PROMETHEUS_MULTIPROC_DIR, one scrape sums every process."""
+    script = textwrap.dedent(
+        """
+        import os, sys
+        from src.utils.metrics import track_tool, build_registry, render_metrics
+        if sys.argv[1] == "work":
+            for _ in range(3):
+                with track_tool("shared"):
+                    pass
+        else:
+            sys.stdout.write(render_metrics(build_registry()).decode())
+        """
+    )
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", script, "work"], env=env, check=True,
+                       capture_output=True)
+    output = subprocess.run(
+        [sys.executable, "-c", script, "scrape"], env=env, check=True, capture_output=True
+    ).stdout.decode()
+    assert 'mcp_tool_calls_total{tool="shared"} 6.0' in output
+
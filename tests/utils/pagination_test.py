@@ -0,0 +1,107 @@
+"""Tests for cursor pagination and chunked streaming."""
+
+import json
+from typing import Any, Dict, List, Optional
+
+import pytest
+from fastmcp import Client, FastMCP
+
+from src.utils.pagination import (
+    STREAM_LOGGER,
+    StaleCursorError,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+    stream_records,
+)
+
+RECORDS = [{"n": index} for index in range(25)]
+
+
+def fetch(start: int, stop: int) -> List[Dict[str, Any]]:
+    """Slice the sample records."""
+    return RECORDS[start:stop]
+
+
+def test_cursor_round_trip() -> None:
+    """Cursors are opaque but decode back to their offset."""
+    cursor = encode_cursor(40, "inventory_json")
+    assert "40" not in cursor
+    assert decode_cursor(cursor, "inventory_json") == 40
+    assert decode_cursor(None, "inventory_json") == 0
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor(3, "other"), "e30"])
+def test_invalid_cursor(cursor: str) -> None:
+    """Malformed or foreign cursors are rejected."""
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor, "inventory_json")
+
+
+def test_stale_cursor() -> None:
+    """A cursor issued for another version of the collection is rejected."""
+    cursor = paginate(fetch, len(RECORDS), "src", limit=10, version=1)["next_cursor"]
+    assert paginate(fetch, len(RECORDS), "src", cursor=cursor, version=1)["items"]
+    with pytest.raises(StaleCursorError, match="Stale cursor"):
+        paginate(fetch, len(RECORDS), "src", cursor=cursor, version=2)
+
+
+def test_paginate_walks_all_records() -> None:
+    """Following next_cursor visits every record once, in order."""
+    seen: List[Dict[str, Any]] = []
+    cursor = None
+    while True:
+        page = paginate(fetch, len(RECORDS), "src", limit=10, cursor=cursor)
+        seen.extend(page["items"])
+        assert page["total"] == 25
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == RECORDS
+
+
+def test_paginate_clamps_limit() -> None:
+    """Page size falls back to the default and is capped by the maximum."""
+    assert len(paginate(fetch, 25, "src")["items"]) == 25
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr("src.utils.pagination.settings.inventory_max_page_size", 5)
+        assert len(paginate(fetch, 25, "src", limit=500)["items"]) == 5
+
+
+@pytest.mark.asyncio
+async def test_stream_without_context_returns_a_page() -> None:
+    """Outside of an MCP request, streaming degrades to a single page."""
+    page = await stream_records(fetch, 25, "src", limit=10)
+    assert len(page["items"]) == 10
+
+
+@pytest.mark.asyncio
+async def test_stream_emits_chunks_over_mcp() -> None:
+    """Records arrive as log notifications with progress updates."""
+    server: FastMCP[Any] = FastMCP("stream-test")
+
+    @server.tool()
+    async def stream_all() -> Dict[str, Any]:
+        return await stream_records(fetch, len(RECORDS), "src", limit=10)
+
+    chunks: List[Dict[str, Any]] = []
+    reported: List[float] = []
+
+    async def on_log(message: Any) -> None:
+        if message.logger == STREAM_LOGGER:
+            chunks.append(json.loads(message.data))
+
+    async def on_progress(
+        progress: float, total: Optional[float], message: Optional[str]
+    ) -> None:
+        reported.append(progress)
+
+    async with Client(server, log_handler=on_log, progress_handler=on_progress) as client:
+        result = await client.call_tool("stream_all", {})
+
+    summary = json.loads(result[0].text)
+    assert summary["streamed"] == 25
+    assert summary["items"] == []
+    assert [chunk["offset"] for chunk in chunks] == [0, 10, 20]
+    assert [item for chunk in chunks for item in chunk["items"]] == RECORDS
+    assert reported == [10, 20, 25]
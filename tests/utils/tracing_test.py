@@ -0,0 +1,237 @@
+# pylint: disable=redefined-outer-name
+"""Tests for OpenTelemetry tracing."""
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from mcp.server.lowlevel.server import request_ctx
+from mcp.shared.context import RequestContext
+from opentelemetry import context, trace
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import SpanKind
+
+from src.middleware.jwt_bearer import (  # type: ignore[attr-defined]
+    JWTMiddleware,
+    token_cache,
+)
+from src.middleware.tracing import TracingMiddleware
+from src.utils.blocking_io import run_blocking
+from src.utils.http_client import _CountingTransport
+from src.utils.metrics import instrument_tool
+from src.utils.tracing import (
+    JsonLinesSpanExporter,
+    build_tracer_provider,
+    make_exporter,
+    tracer,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+Spans = Callable[[], List[ReadableSpan]]
+
+
+@pytest.fixture(scope="module")
+def provider() -> Iterator[TracerProvider]:
+    """Route the module-level tracer to an in-memory exporter."""
+    exporter = InMemorySpanExporter()
+    provider = build_tracer_provider(exporter, sample_ratio=1.0)
+    provider.exporter = exporter  # type: ignore[attr-defined]
+    # The global provider can be set once per process; tests share this one.
+    trace.set_tracer_provider(provider)
+    yield provider
+
+
+@pytest.fixture
+def spans(provider: TracerProvider) -> Spans:
+    """Return a function listing the spans finished since the test started."""
+    exporter: InMemorySpanExporter = provider.exporter  # type: ignore[attr-defined]
+    provider.force_flush()
+    exporter.clear()
+
+    def finished() -> List[ReadableSpan]:
+        provider.force_flush()
+        return list(exporter.get_finished_spans())
+
+    return finished
+
+
+def _by_name(finished: List[ReadableSpan]) -> Dict[str, ReadableSpan]:
+    return {span.name: span for span in finished}
+
+
+def _parent_id(span: ReadableSpan) -> int:
+    assert span.parent is not None
+    return span.parent.span_id
+
+
+def _attributes(span: ReadableSpan) -> Mapping[str, Any]:
+    assert span.attributes is not None
+    return span.attributes
+
+
+def test_request_trace_is_continued_and_propagated_upstream(spans: Spans) -> None:
+    """Incoming context is extracted and a client span is injected upstream."""
+    sent: List[httpx.Request] = []
+
+    def upstream(request: httpx.Request) -> httpx.Response:
+        sent.append(request)
+        return httpx.Response(200)
+
+    transport = _CountingTransport(
+        httpx.MockTransport(upstream), origin="http://upstream"
+    )
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work() -> Dict[str, str]:
+        async with httpx.AsyncClient(transport=transport) as client:
+            await client.get(
+                "http://upstream/api",
+                headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"},
+            )
+        return {"ok": "yes"}
+
+    app.add_middleware(TracingMiddleware)
+    response = TestClient(app).get(
+        "/work", headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"}
+    )
+    assert response.status_code == 200
+
+    finished = _by_name(spans())
+    server, client = finished["GET /work"], finished["GET"]
+    assert server.kind == SpanKind.SERVER
+    assert format(server.context.trace_id, "032x") == TRACE_ID
+    assert format(_parent_id(server), "016x") == PARENT_ID
+    assert _attributes(server)["http.response.status_code"] == 200
+    assert client.kind == SpanKind.CLIENT
+    assert _parent_id(client) == server.context.span_id
+    # The forwarded header is replaced by the client span's own context.
+    assert sent[0].headers["traceparent"] == (
+        f"00-{TRACE_ID}-{format(client.context.span_id, '016x')}-01"
+    )
+
+
+def test_excluded_paths_are_not_traced(spans: Spans) -> None:
+    """Scrapes of /metrics do not create traces."""
+    app = FastAPI()
+
+    @app.get("/metrics")
+    async def metrics() -> Dict[str, str]:
+        return {}
+
+    app.add_middleware(TracingMiddleware)
+    TestClient(app).get("/metrics")
+    assert spans() == []
+
+
+def test_auth_span_is_a_child_of_the_server_span(spans: Spans) -> None:
+    """JWT verification gets its own span, marked when served from cache."""
+    token_cache.clear()
+    app = FastAPI()
+
+    @app.get("/secure")
+    async def secure() -> Dict[str, str]:
+        return {}
+
+    app.add_middleware(JWTMiddleware)
+    app.add_middleware(TracingMiddleware)
+    client = TestClient(app)
+    with patch("jwt.decode", return_value={"UserInfo": {"id": "u"}}):
+        client.get("/secure", headers={"Authorization": "Bearer a.b.c"})
+        client.get("/secure", headers={"Authorization": "Bearer a.b.c"})
+
+    finished = spans()
+    auth = [span for span in finished if span.name == "auth.jwt"]
+    server = [span for span in finished if span.name == "GET /secure"]
+    assert [_attributes(span)["auth.cached"] for span in auth] == [False, True]
+    assert _parent_id(auth[0]) == server[0].context.span_id
+
+
+@pytest.mark.asyncio
+async def test_tool_span_parent_comes_from_the_mcp_request(spans: Spans) -> None:
+    """Tool spans attach to the request carrying the call, not the session."""
+    with tracer.start_as_current_span("POST /mcp/") as request_span:
+        otel_context = context.get_current()
+
+    @instrument_tool
+    async def lookup() -> str:
+        # Executor work inherits the tool's context.
+        await run_blocking(lambda: tracer.start_span("file.read").end())
+        return "ok"
+
+    token = request_ctx.set(
+        RequestContext(
+            request_id=1,
+            meta=None,
+            session=MagicMock(),
+            lifespan_context=None,
+            request=Request({"type": "http", "state": {"otel_context": otel_context}}),
+        )
+    )
+    try:
+        with tracer.start_as_current_span("session"):
+            assert await lookup() == "ok"
+    finally:
+        request_ctx.reset(token)
+
+    finished = _by_name(spans())
+    tool = finished["tool lookup"]
+    assert _parent_id(tool) == request_span.get_span_context().span_id
+    assert _attributes(tool)["mcp.tool.name"] == "lookup"
+    assert _parent_id(finished["file.read"]) == tool.context.span_id
+
+
+def test_sample_ratio_applies_to_new_traces_only() -> None:
+    """A zero ratio drops new traces but keeps sampled parents."""
+    exporter = InMemorySpanExporter()
+    provider = build_tracer_provider(exporter, sample_ratio=0.0)
+    local_tracer = provider.get_tracer("test")
+
+    local_tracer.start_span("root").end()
+    parent = trace.set_span_in_context(
+        trace.NonRecordingSpan(
+            trace.SpanContext(
+                int(TRACE_ID, 16),
+                int(PARENT_ID, 16),
+                is_remote=True,
+                trace_flags=trace.TraceFlags(trace.TraceFlags.SAMPLED),
+            )
+        )
+    )
+    local_tracer.start_span("child", context=parent).end()
+    provider.force_flush()
+
+    assert [span.name for span in exporter.get_finished_spans()] == ["child"]
+    provider.shutdown()
+
+
+def test_file_exporter_writes_json_lines(tmp_path: Path) -> None:
+    """The offline exporter appends one JSON object per span."""
+    path = tmp_path / "traces" / "spans.jsonl"
+    provider = build_tracer_provider(JsonLinesSpanExporter(str(path)), sample_ratio=1.0)
+    local_tracer = provider.get_tracer("test")
+    with local_tracer.start_as_current_span("outer"):
+        local_tracer.start_span("inner").end()
+    provider.shutdown()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["name"] for line in lines] == ["inner", "outer"]
+    assert lines[0]["parent_id"] == lines[1]["context"]["span_id"]
+
+
+def test_make_exporter(tmp_path: Path) -> None:
+    """Exporters are chosen by name; unknown names are rejected."""
+    assert make_exporter("none") is None
+    with patch("src.utils.tracing.settings.tracing_file", str(tmp_path / "t.jsonl")):
+        assert isinstance(make_exporter("file"), JsonLinesSpanExporter)
+    assert type(make_exporter("otlp")).__name__ == "OTLPSpanExporter"
+    with pytest.raises(ValueError):
+        make_exporter("zipkin")